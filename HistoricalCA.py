@@ -5,6 +5,34 @@ import plotly.graph_objects as go
 from datetime import datetime, timedelta
 import numpy as np
 from pathlib import Path
+import threading
+import time
+import logging
+import functools
+import tracemalloc
+from collections import OrderedDict, deque
+from contextlib import contextmanager, nullcontext
+import hashlib
+import inspect
+import json
+import os
+import sys
+import io
+import tempfile
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from work_calendar import HolidayCalendar, ShiftCalendar, ShiftRule, WorkingTimeIndex
+from sla_engine import (
+    SLA_INPUT_COLUMNS, calculate_sla_working_hours_bulk, round_sla_hours, shift_rule_ids, sla_columns,
+    to_datetime64
+)
+from sla_parallel import apps_id_partitions, map_partitions, resolve_workers
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
 
 st.set_page_config(
     page_title="Analisis Kredit - Dashboard BCA Finance", 
@@ -15,6 +43,53 @@ st.set_page_config(
 
 FILE_NAME = "Historical_CA (1) (1) (1).xlsx"
 
+# Bandingkan hasil SLA columnar dengan loop per-baris saat load (lambat, untuk verifikasi)
+SLA_VERIFY_AGAINST_LOOP = False
+
+# Jumlah proses untuk perhitungan SLA per partisi apps_id (1 = serial, None = jumlah core).
+# Default serial: process pool dipakai bersama semua session server, naikkan hanya jika ada core lebih
+SLA_WORKERS = 1
+# Di bawah jumlah baris ini SLA dihitung serial (overhead process pool lebih besar dari hasilnya)
+SLA_PARALLEL_MIN_ROWS = 500_000
+
+# Export baru di-merge ke snapshot sebelumnya (hanya apps_id terdampak yang dihitung ulang)
+# alih-alih memproses ulang seluruh history
+INCREMENTAL_INGEST = False
+
+# Stage pipeline load bekerja di shallow copy (copy-on-write) alih-alih deep copy seluruh frame,
+# dan frame yang sudah urut per apps_id/action tidak di-sort ulang (peak memory load lebih rendah)
+COPY_FREE_PIPELINE = True
+
+# Kolom dimensi disimpan sebagai categorical dan kolom raw yang sudah di-clean di-drop
+# (hemat memori per session, isin/groupby filter lebih cepat)
+COMPACT_DTYPES = True
+
+# Dataset final dipublikasikan sebagai file Arrow IPC dan di-memory-map: satu frame read-only
+# per proses untuk semua session, halaman kolom yang ter-map dibagi antar proses lewat page cache OS
+# (kode categorical & datetime dengan NaT tetap per proses, lihat open_shared_dataset)
+SHARED_DATASET = True
+
+# Hanya tab yang sedang dibuka yang dihitung & dirender (rerun saat pindah tab)
+LAZY_TABS = True
+
+# Export ditulis per potongan baris ini (peak memory export tidak bergantung jumlah baris)
+EXPORT_CHUNK_ROWS = 50_000
+
+# Jumlah hasil agregat (per versi dataset + kombinasi filter) yang disimpan bersama antar session
+AGGREGATE_CACHE_MAX_ENTRIES = 256
+# Batas total ukuran hasil agregat tersebut (memory_usage deep); hasil per AppID ikut dihitung
+AGGREGATE_CACHE_MAX_MB = 256
+
+# Wall time, rows in/out & memory per stage load dan blok compute tab (panel sidebar + log JSON).
+# Opt-in: aktif hanya jika environment HISTORICAL_CA_PERF=1 (mis. saat profiling/debugging)
+PERF_INSTRUMENTATION = os.environ.get('HISTORICAL_CA_PERF') == '1'
+# Peak memory per stage lewat tracemalloc (lebih akurat, tapi memperlambat alokasi; untuk debugging)
+PERF_TRACE_MEMORY = False
+# File JSON lines untuk log performa (None = stderr)
+PERF_LOG_FILE = None
+# Jumlah record stage yang disimpan per proses untuk panel
+PERF_LOG_MAX_ENTRIES = 500
+
 # BCA Finance Brand Colors
 BCA_BLUE = "#003d7a"
 BCA_LIGHT_BLUE = "#0066b3"
@@ -369,35 +444,203 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
+# ============================================================================
+# PERFORMANCE INSTRUMENTATION
+# ============================================================================
+_perf_state = threading.local()
+
+class PerfLog:
+    """Record stage terakhir per proses (thread-safe), sumber panel instrumentasi"""
+    
+    def __init__(self, max_entries):
+        self._records = deque(maxlen=max_entries)
+        self._lock = threading.Lock()
+    
+    def add(self, record):
+        with self._lock:
+            self._records.append(record)
+    
+    def records(self):
+        with self._lock:
+            return list(self._records)
+
+@st.cache_resource
+def get_perf_log():
+    """Satu PerfLog per proses server"""
+    return PerfLog(PERF_LOG_MAX_ENTRIES)
+
+@st.cache_resource
+def get_perf_logger():
+    """Logger JSON lines untuk record stage (stderr atau PERF_LOG_FILE)"""
+    logger = logging.getLogger('HistoricalCA.perf')
+    if not logger.handlers:
+        handler = logging.FileHandler(PERF_LOG_FILE) if PERF_LOG_FILE else logging.StreamHandler()
+        handler.setFormatter(logging.Formatter('%(message)s'))
+        logger.addHandler(handler)
+        logger.setLevel(logging.INFO)
+        logger.propagate = False
+    return logger
+
+def start_perf_run():
+    """Mulai rerun baru; record stage berikutnya di thread ini memakai run id ini"""
+    _perf_state.run_id = f"{time.time():.6f}-{threading.get_ident()}"
+    if PERF_TRACE_MEMORY and not tracemalloc.is_tracing():
+        tracemalloc.start()
+    return _perf_state.run_id
+
+def _max_rss_mb():
+    """High-water mark RSS proses (MB), None jika tidak tersedia"""
+    if resource is None:
+        return None
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux: KB, macOS: byte
+    return max_rss / (1024 * 1024 if os.uname().sysname == 'Darwin' else 1024)
+
+@contextmanager
+def perf_stage(name, scope='load', rows_in=None):
+    """
+    Ukur satu stage: wall time, rows in/out, peak traced memory (jika PERF_TRACE_MEMORY)
+    dan max RSS proses. Isi record['rows_out'] di dalam blok. Stage boleh bersarang.
+    """
+    if not PERF_INSTRUMENTATION:
+        yield {}
+        return
+    
+    record = {
+        'run': getattr(_perf_state, 'run_id', None),
+        'scope': scope,
+        'stage': name,
+        'rows_in': rows_in,
+        'rows_out': None
+    }
+    if not hasattr(_perf_state, 'stack'):
+        _perf_state.stack = []
+    stack = _perf_state.stack
+    record['depth'] = len(stack)
+    tracing = tracemalloc.is_tracing()
+    frame = {'start': 0, 'peak': 0}
+    if tracing:
+        current, peak = tracemalloc.get_traced_memory()
+        # Peak stage induk sejauh ini disimpan sebelum counter di-reset untuk stage ini
+        if stack:
+            stack[-1]['peak'] = max(stack[-1]['peak'], peak)
+        tracemalloc.reset_peak()
+        frame['start'] = current
+    stack.append(frame)
+    
+    start = time.perf_counter()
+    try:
+        yield record
+    finally:
+        record['seconds'] = round(time.perf_counter() - start, 4)
+        stack.pop()
+        record['peak_mb'] = None
+        if tracing and tracemalloc.is_tracing():
+            peak = max(tracemalloc.get_traced_memory()[1], frame['peak'])
+            record['peak_mb'] = round((peak - frame['start']) / 1e6, 2)
+            if stack:
+                stack[-1]['peak'] = max(stack[-1]['peak'], peak)
+        max_rss = _max_rss_mb()
+        record['max_rss_mb'] = round(max_rss, 1) if max_rss is not None else None
+        record['timestamp'] = datetime.now().isoformat(timespec='seconds')
+        
+        get_perf_log().add(record)
+        get_perf_logger().info(json.dumps(record, default=str))
+
+def instrumented(func):
+    """Decorator stage pipeline: rows in = len(argumen pertama), rows out = len(hasil)"""
+    @functools.wraps(func)
+    def wrapper(df, *args, **kwargs):
+        with perf_stage(func.__name__, rows_in=len(df)) as record:
+            result = func(df, *args, **kwargs)
+            record['rows_out'] = len(result)
+        return result
+    return wrapper
+
+def tab_stage(tab, name, rows_in=None):
+    """perf_stage untuk blok compute tab yang sedang dibuka (tab tertutup tidak dicatat)"""
+    return perf_stage(name, scope='tab', rows_in=rows_in) if tab_is_open(tab) else nullcontext()
+
+def render_perf_panel(run_id):
+    """Panel sidebar: stage load terakhir dan stage rerun ini"""
+    records = get_perf_log().records()
+    load_runs = [r['run'] for r in records if r['scope'] == 'load']
+    last_load = [r for r in records if load_runs and r['run'] == load_runs[-1] and r['scope'] == 'load']
+    this_run = [r for r in records if r['run'] == run_id and r['scope'] != 'load']
+    
+    columns = {
+        'stage': 'Stage', 'rows_in': 'Rows In', 'rows_out': 'Rows Out',
+        'seconds': 'Detik', 'peak_mb': 'Peak Mem (MB)', 'max_rss_mb': 'Max RSS (MB)'
+    }
+    
+    def _table(rows):
+        table = pd.DataFrame(rows, columns=['depth', *columns])
+        table['stage'] = ['  ' * depth + stage for depth, stage in zip(table['depth'], table['stage'])]
+        return table[list(columns)].rename(columns=columns).astype(str)
+    
+    with st.sidebar.expander("Instrumentasi Performa"):
+        if last_load:
+            st.markdown(f"**Load data** ({last_load[-1]['timestamp']})")
+            st.dataframe(_table(last_load), use_container_width=True, hide_index=True)
+        else:
+            st.caption("Data dimuat dari cache proses (tidak ada stage load di log)")
+        st.markdown("**Rerun ini**")
+        st.dataframe(_table(this_run), use_container_width=True, hide_index=True)
+
+
 # ============================================================================
 # TANGGAL MERAH (Holidays)
 # ============================================================================
-TANGGAL_MERAH = [
-    "01-01-2024", "08-02-2024", "10-02-2024", "11-03-2024",
-    "29-03-2024", "31-03-2024", "10-04-2024", "11-04-2024",
-    "01-05-2024", "09-05-2024", "23-05-2024", "01-06-2024",
-    "17-06-2024", "07-07-2024", "17-08-2024", "16-09-2024",
-    "25-12-2024", "09-02-2024", "12-03-2024", "08-04-2024", 
-    "09-04-2024", "12-04-2024", "10-05-2024", "24-05-2024", 
-    "18-06-2024", "26-12-2024", "01-01-2025", "27-01-2025", 
-    "28-01-2025", "29-01-2025", "28-03-2025", "31-03-2025",
-    "01-04-2025", "02-04-2025", "03-04-2025", "04-04-2025", 
-    "07-04-2025", "18-04-2025", "01-05-2025", "12-05-2025", 
-    "29-05-2025", "06-06-2025", "09-06-2025", "27-06-2025",
-    "18-08-2025", "05-09-2025", "25-12-2025", "26-12-2025", 
-    "31-12-2025", "01-01-2026", "02-01-2026", "16-01-2026", 
-    "16-02-2026", "17-02-2026", "18-03-2026", "19-03-2026", 
-    "20-03-2026", "23-03-2026", "24-03-2026", "03-04-2026", 
-    "01-05-2026", "14-05-2026", "27-05-2026", "28-05-2026", 
-    "01-06-2026", "16-06-2026", "17-08-2026", "25-08-2026", 
-    "25-12-2026", "31-12-2026"
-]
-TANGGAL_MERAH_DT = [datetime.strptime(d, "%d-%m-%Y").date() for d in TANGGAL_MERAH]
+# File tanggal merah di folder app (DD-MM-YYYY per baris atau daftar Python), digabung & di-dedup
+HOLIDAY_FILES = ['tanggal_merah.csv', 'tgl merah 2024-2025']
+
+@st.cache_resource
+def get_holiday_calendar():
+    """Kalender tanggal merah (busdaycalendar + set lookup), dikompilasi sekali per proses"""
+    app_dir = Path(__file__).resolve().parent
+    calendar = HolidayCalendar.from_files([app_dir / name for name in HOLIDAY_FILES])
+    if len(calendar) == 0:
+        st.warning("File tanggal merah tidak ditemukan, SLA hanya mengecualikan weekend")
+    return calendar
+
+# Jam kerja untuk perhitungan SLA
+WORK_START = timedelta(hours=8, minutes=30)
+WORK_END = timedelta(hours=15, minutes=30)
+
+# Rule jam kerja khusus per cabang / segmen (cabang didahulukan dari segmen, rule awal menang).
+# Cabang/segmen yang tidak cocok memakai WORK_START-WORK_END Senin-Jumat. Contoh:
+# WORK_SHIFT_RULES = [
+#     {
+#         'name': 'Sabtu setengah hari',
+#         'branch': ['BANDUNG', 'SURABAYA'],
+#         'hours': {'mon-fri': ('08:30', '15:30'), 'sat': ('08:30', '12:00')},
+#         'breaks': [('12:00', '13:00')],
+#         'extra_holidays': ['31-12-2025'],
+#     },
+#     {'name': 'Segmen X', 'segmen': ['X'], 'hours': {'mon-fri': ('08:00', '16:00')}},
+# ]
+WORK_SHIFT_RULES = []
+
+@st.cache_resource
+def get_shift_calendar():
+    """Rule jam kerja default + WORK_SHIFT_RULES, masing-masing dikompilasi sekali per proses"""
+    calendar = get_holiday_calendar()
+    first_year, last_year = calendar.year_range
+    default_rule = ShiftRule('default', {'mon-fri': (WORK_START, WORK_END)})
+    rules = [ShiftRule.from_config(spec) for spec in WORK_SHIFT_RULES]
+    return ShiftCalendar(default_rule, rules, calendar, f"{first_year}-01-01", f"{last_year}-12-31")
 
 # ============================================================================
 # HELPER FUNCTIONS
 # ============================================================================
 
+DATE_FORMATS = [
+    "%Y-%m-%d %H:%M:%S",
+    "%d-%m-%Y %H:%M:%S",
+    "%Y-%m-%d",
+    "%d-%m-%Y"
+]
+
 def parse_date(date_str):
     """Parse date string in various formats"""
     if pd.isna(date_str) or date_str == '-':
@@ -406,14 +649,7 @@ def parse_date(date_str):
         if isinstance(date_str, datetime):
             return date_str
         
-        date_formats = [
-            "%Y-%m-%d %H:%M:%S",
-            "%d-%m-%Y %H:%M:%S",
-            "%Y-%m-%d",
-            "%d-%m-%Y"
-        ]
-        
-        for fmt in date_formats:
+        for fmt in DATE_FORMATS:
             try:
                 return datetime.strptime(str(date_str).split('.')[0], fmt)
             except:
@@ -423,17 +659,56 @@ def parse_date(date_str):
     except:
         return None
 
+def parse_dates_bulk(values):
+    """
+    Versi bulk dari parse_date untuk satu kolom penuh.
+    Setiap format di DATE_FORMATS dicoba sekali untuk semua baris yang belum ter-parse,
+    sisanya lewat fallback pd.to_datetime per baris.
+    Return (Series datetime64, dict jumlah baris per format).
+    """
+    values = pd.Series(values)
+    counts = {}
+    
+    if pd.api.types.is_datetime64_any_dtype(values):
+        counts['datetime'] = int(values.notna().sum())
+        counts['kosong'] = int(values.isna().sum())
+        return values, counts
+    
+    parsed = pd.Series(pd.NaT, index=values.index, dtype='datetime64[us]')
+    is_empty = values.isna() | (values.astype(str) == '-')
+    counts['kosong'] = int(is_empty.sum())
+    
+    # Nilai yang sudah berupa datetime dipakai apa adanya
+    is_datetime = ~is_empty & values.map(lambda v: isinstance(v, datetime))
+    if is_datetime.any():
+        parsed[is_datetime] = pd.to_datetime(values[is_datetime])
+    counts['datetime'] = int(is_datetime.sum())
+    
+    pending = ~is_empty & ~is_datetime
+    text = values[pending].astype(str).str.split('.').str[0]
+    for fmt in DATE_FORMATS:
+        if not pending.any():
+            counts[fmt] = 0
+            continue
+        attempt = pd.to_datetime(text[pending[text.index]], format=fmt, errors='coerce')
+        matched = attempt[attempt.notna()]
+        parsed[matched.index] = matched
+        pending[matched.index] = False
+        counts[fmt] = len(matched)
+    
+    # Format lain: fallback per baris seperti parse_date
+    fallback = values[pending].map(lambda v: pd.to_datetime(v, errors='coerce'))
+    fallback = fallback[fallback.notna()]
+    if len(fallback) > 0:
+        parsed[fallback.index] = pd.to_datetime(fallback)
+    counts['fallback'] = len(fallback)
+    counts['gagal'] = int(pending.sum()) - len(fallback)
+    
+    return parsed, counts
+
 def is_working_day(date):
     """Check if date is a working day"""
-    if pd.isna(date):
-        return False
-    if not isinstance(date, datetime):
-        date = pd.to_datetime(date)
-    
-    is_weekday = date.weekday() < 5
-    is_not_holiday = date.date() not in TANGGAL_MERAH_DT
-    
-    return is_weekday and is_not_holiday
+    return get_holiday_calendar().is_working_day(date)
 
 def convert_hours_to_hm(total_hours):
     """Convert decimal hours to HH:MM format"""
@@ -443,8 +718,12 @@ def convert_hours_to_hm(total_hours):
     minutes = int((total_hours - hours) * 60)
     return f"{hours} jam {minutes} menit"
 
-def calculate_sla_working_hours(start_dt, end_dt):
-    """Calculate SLA in working hours (08:30-15:30)"""
+def get_working_time_index(rule_id=0):
+    """Index jam kerja satu rule (0 = jam kerja default)"""
+    return get_shift_calendar().indexes[rule_id]
+
+def calculate_sla_working_hours(start_dt, end_dt, rule_id=0):
+    """Calculate SLA in working hours (default 08:30-15:30, atau rule jam kerja rule_id)"""
     if not start_dt or not end_dt or pd.isna(start_dt) or pd.isna(end_dt):
         return None
     
@@ -457,99 +736,60 @@ def calculate_sla_working_hours(start_dt, end_dt):
         if end_dt <= start_dt:
             return None
         
-        WORK_START = timedelta(hours=8, minutes=30)
-        WORK_END = timedelta(hours=15, minutes=30)
-        
-        current = start_dt
-        total_seconds = 0
-        
-        while current.date() <= end_dt.date():
-            if not is_working_day(current):
-                current = datetime.combine(current.date() + timedelta(days=1), datetime.min.time())
-                continue
-            
-            day_start = datetime.combine(current.date(), datetime.min.time()) + WORK_START
-            day_end = datetime.combine(current.date(), datetime.min.time()) + WORK_END
-            
-            if current.date() == start_dt.date():
-                if start_dt.time() < day_start.time():
-                    day_actual_start = day_start
-                elif start_dt.time() >= day_end.time():
-                    current = datetime.combine(current.date() + timedelta(days=1), datetime.min.time())
-                    continue
-                else:
-                    day_actual_start = start_dt
-            else:
-                day_actual_start = day_start
-            
-            if current.date() == end_dt.date():
-                if end_dt.time() < day_start.time():
-                    break
-                elif end_dt.time() > day_end.time():
-                    day_actual_end = day_end
-                else:
-                    day_actual_end = end_dt
-            else:
-                day_actual_end = day_end
-            
-            if day_actual_end > day_actual_start:
-                day_seconds = (day_actual_end - day_actual_start).total_seconds()
-                total_seconds += day_seconds
-            
-            current = datetime.combine(current.date() + timedelta(days=1), datetime.min.time())
-        
-        if total_seconds < 0:
-            return None
+        total_us = get_working_time_index(rule_id).working_us_between(
+            np.array([start_dt], dtype='datetime64[us]'),
+            np.array([end_dt], dtype='datetime64[us]')
+        )[0]
         
-        total_hours = total_seconds / 3600
+        total_hours = total_us / 1_000_000 / 3600
         return {
-            'total_hours': round(total_hours, 2),
+            'total_hours': float(round_sla_hours(total_hours)[0]),
             'formatted': convert_hours_to_hm(total_hours)
         }
     except:
         return None
 
-def render_sla_trend_chart(sla_valid, df_filtered):
-    """Render SLA chart dengan approval rate dan jumlah aplikasi per bulan"""
-    if len(sla_valid) == 0 or 'action_on_parsed' not in sla_valid.columns:
-        st.warning("Data untuk chart tidak tersedia")
-        return
-    
-    # ============================================================
-    # PERSIAPAN DATA
-    # ============================================================
-    sla_trend = sla_valid.copy()
-    sla_trend['YearMonth'] = sla_trend['action_on_parsed'].dt.to_period('M').astype(str)
-    
-    # Group by month: Waktu proses
-    monthly_avg = sla_trend.groupby('YearMonth')['SLA_Hours'].agg(['mean', 'count']).reset_index()
-    monthly_avg.columns = ['Bulan', 'Rata-rata Waktu (Jam)', 'Jumlah Data']
-    monthly_avg = monthly_avg.sort_values('Bulan')
-    monthly_avg['Rata-rata Waktu (Teks)'] = monthly_avg['Rata-rata Waktu (Jam)'].apply(convert_hours_to_hm)
-    
-    # ============================================================
-    # HITUNG APPROVAL RATE & JUMLAH APLIKASI PER BULAN
-    # ============================================================
-    df_filtered_copy = df_filtered.copy()
-    df_filtered_copy['action_on_parsed'] = pd.to_datetime(df_filtered_copy['action_on'], errors='coerce')
-    df_filtered_copy['YearMonth'] = df_filtered_copy['action_on_parsed'].dt.to_period('M').astype(str)
-
-    # Approval rate per month - BERDASARKAN STATUS RECOMMENDED CA
-    df_approved = df_filtered_copy.drop_duplicates('apps_id')
-    df_approved['is_approved'] = df_approved['apps_status_clean'].isin(['RECOMMENDED CA', 'RECOMMENDED CA WITH COND']).astype(int)
+def _sla_day_walk(start_dt, end_dt, rule_id=0):
+    """
+    Referensi per-hari (engine SLA lama) untuk verify mode: jalan hari demi hari dari tanggal
+    start sampai tanggal end dan menjumlahkan irisan setiap hari kerja dengan window jam kerja.
+    Tidak memakai WorkingTimeIndex, jadi bisa dipakai untuk memeriksa index tersebut.
+    """
+    if not start_dt or not end_dt or pd.isna(start_dt) or pd.isna(end_dt):
+        return None
     
-    monthly_approval = df_approved.groupby('YearMonth').agg({
-        'is_approved': 'sum',
-        'apps_id': 'count'
-    }).reset_index()
-    monthly_approval.columns = ['Bulan', 'Approved_Count', 'Total_Count']
-    monthly_approval['Approval_Rate'] = (monthly_approval['Approved_Count'] / monthly_approval['Total_Count'] * 100).round(1)
-    monthly_approval = monthly_approval.sort_values('Bulan')
+    start_dt = pd.Timestamp(start_dt).to_pydatetime()
+    end_dt = pd.Timestamp(end_dt).to_pydatetime()
+    if end_dt <= start_dt:
+        return None
     
-    # Merge semua data
-    monthly_data = monthly_avg.merge(monthly_apps, on='Bulan', how='left')
-    monthly_data = monthly_data.merge(monthly_approval[['Bulan', 'Approval_Rate']], on='Bulan', how='left')
+    shift_calendar = get_shift_calendar()
+    rule = shift_calendar.rules[rule_id]
+    holidays = set(shift_calendar.indexes[rule_id].holidays.tolist())
+    
+    current = start_dt.date()
+    total = timedelta(0)
+    while current <= end_dt.date():
+        if current not in holidays:
+            midnight = datetime.combine(current, datetime.min.time())
+            for window_start, window_end in zip(rule.starts[current.weekday()], rule.ends[current.weekday()]):
+                day_actual_start = max(midnight + timedelta(microseconds=int(window_start)), start_dt)
+                day_actual_end = min(midnight + timedelta(microseconds=int(window_end)), end_dt)
+                if day_actual_end > day_actual_start:
+                    total += day_actual_end - day_actual_start
+        current += timedelta(days=1)
+    
+    total_hours = total // timedelta(microseconds=1) / 1_000_000 / 3600
+    return {
+        'total_hours': round(total_hours, 2),
+        'formatted': convert_hours_to_hm(total_hours)
+    }
 
+def render_sla_trend_chart(monthly_data):
+    """Render SLA chart dengan approval rate dan jumlah aplikasi per bulan (dari build_monthly_rollup)"""
+    if len(monthly_data) == 0:
+        st.warning("Data untuk chart tidak tersedia")
+        return
     
     # ============================================================
     # TAMPILKAN TABEL
@@ -705,14 +945,36 @@ def get_osph_category(osph_value):
     except:
         return "Tidak Tersedia"
 
+def _stage_frame(df):
+    """Frame kerja satu stage: shallow copy di mode copy-free (kolom baru tidak mengubah input), selain itu deep copy"""
+    return df.copy(deep=not COPY_FREE_PIPELINE)
+
+def _is_action_sorted(df):
+    """True jika frame sudah urut per (apps_id, action_on_parsed) tanpa NaT"""
+    apps_id = df['apps_id'].to_numpy()
+    action = df['action_on_parsed'].to_numpy()
+    if pd.isna(action).any():
+        return False
+    same_app = apps_id[1:] == apps_id[:-1]
+    return bool((apps_id[1:] >= apps_id[:-1]).all() and (action[1:][same_app] >= action[:-1][same_app]).all())
+
+def sort_by_action(df):
+    """Urutkan per apps_id lalu action_on_parsed; di mode copy-free frame yang sudah urut tidak di-sort ulang"""
+    if COPY_FREE_PIPELINE and _is_action_sorted(df):
+        return df.reset_index(drop=True)
+    return df.sort_values(['apps_id', 'action_on_parsed']).reset_index(drop=True)
+
+@instrumented
 def preprocess_data(df):
     """Clean and prepare data"""
-    df = df.copy()
+    df = _stage_frame(df)
     
-    # Parse dates
+    # Parse dates (bulk per format, jumlah per format disimpan untuk memantau format baru)
+    date_format_counts = {}
     for col in ['action_on', 'Recommendation']:
         if col in df.columns:
-            df[f'{col}_parsed'] = df[col].apply(parse_date)
+            df[f'{col}_parsed'], date_format_counts[col] = parse_dates_bulk(df[col])
+    df.attrs['date_format_counts'] = date_format_counts
     
     # Clean status
     if 'apps_status' in df.columns:
@@ -774,16 +1036,48 @@ def preprocess_data(df):
     return df
 
 
-def calculate_sla_per_status(df):
+@instrumented
+def calculate_sla_per_status(df, verify=None):
     """
     Calculate SLA correctly based on progression:
     - If only 1 row for an apps_id: Recommendation to action_on (same row)
     - If multiple rows: From previous row's action_on to current row's action_on
+    
+    Versi columnar: previous action diambil dengan shift per apps_id dan semua kolom
+    SLA diisi sekaligus. verify=True membandingkan hasilnya dengan loop per-baris.
+    
+    Frame besar (>= SLA_PARALLEL_MIN_ROWS) dipotong per apps_id dan dihitung di
+    SLA_WORKERS proses (forkserver/spawn, lihat sla_parallel), hasilnya digabung kembali sesuai urutan baris.
     """
+    if verify is None:
+        verify = SLA_VERIFY_AGAINST_LOOP
+    
+    # Sort by apps_id and action_on
+    df_with_sla = sort_by_action(_stage_frame(df))
+    
+    # Partisi tidak membelah apps_id, jadi shift per apps_id tidak pernah melintasi batas partisi
+    n_partitions = resolve_workers(SLA_WORKERS) if len(df_with_sla) >= SLA_PARALLEL_MIN_ROWS else 1
+    partitions = apps_id_partitions(df_with_sla['apps_id'].to_numpy(), n_partitions)
+    inputs = df_with_sla[[col for col in SLA_INPUT_COLUMNS if col in df_with_sla.columns]]
+    sla_result = pd.concat(map_partitions(
+        sla_columns, inputs, partitions, SLA_WORKERS, get_shift_calendar()
+    ))
+    for col in sla_result.columns:
+        df_with_sla[col] = sla_result[col]
+    
+    if verify:
+        verify_sla_per_status(df_with_sla, _calculate_sla_per_status_loop(df))
+    
+    return df_with_sla
+
+
+def _calculate_sla_per_status_loop(df):
+    """Referensi per-baris + per-hari (implementasi lama) untuk verifikasi calculate_sla_per_status"""
     df_with_sla = df.copy()
     
     # Sort by apps_id and action_on
     df_with_sla = df_with_sla.sort_values(['apps_id', 'action_on_parsed']).reset_index(drop=True)
+    rule_ids = shift_rule_ids(df_with_sla, get_shift_calendar())
     
     # Initialize columns
     df_with_sla['SLA_Hours'] = None
@@ -796,32 +1090,26 @@ def calculate_sla_per_status(df):
         indices = group.index.tolist()
         
         for i, idx in enumerate(indices):
-            if len(indices) == 1:
-                # Single row: Recommendation to action_on
+            if i == 0:
+                # First row: Recommendation to action_on
                 recommendation_time = df_with_sla.loc[idx, 'Recommendation_parsed']
                 action_time = df_with_sla.loc[idx, 'action_on_parsed']
                 from_label = 'Recommendation'
                 to_label = 'Action'
             else:
-                # Multiple rows
-                if i == 0:
-                    # First row: Recommendation to action_on
-                    recommendation_time = df_with_sla.loc[idx, 'Recommendation_parsed']
-                    action_time = df_with_sla.loc[idx, 'action_on_parsed']
-                    from_label = 'Recommendation'
-                    to_label = 'Action'
-                else:
-                    # Subsequent rows: Previous action_on to current action_on
-                    prev_idx = indices[i - 1]
-                    recommendation_time = df_with_sla.loc[prev_idx, 'action_on_parsed']
-                    action_time = df_with_sla.loc[idx, 'action_on_parsed']
-                    prev_status = df_with_sla.loc[prev_idx, 'apps_status_clean']
-                    curr_status = df_with_sla.loc[idx, 'apps_status_clean']
-                    from_label = f"{prev_status}"
-                    to_label = f"{curr_status}"
+                # Subsequent rows: Previous action_on to current action_on
+                prev_idx = indices[i - 1]
+                recommendation_time = df_with_sla.loc[prev_idx, 'action_on_parsed']
+                action_time = df_with_sla.loc[idx, 'action_on_parsed']
+                prev_status = df_with_sla.loc[prev_idx, 'apps_status_clean']
+                curr_status = df_with_sla.loc[idx, 'apps_status_clean']
+                from_label = f"{prev_status}"
+                to_label = f"{curr_status}"
             
             if pd.notna(recommendation_time) and pd.notna(action_time):
-                sla_result = calculate_sla_working_hours(recommendation_time, action_time)
+                sla_result = _sla_day_walk(
+                    recommendation_time, action_time, 0 if rule_ids is None else rule_ids[idx]
+                )
                 if sla_result:
                     df_with_sla.loc[idx, 'SLA_Hours'] = sla_result['total_hours']
                     df_with_sla.loc[idx, 'SLA_Formatted'] = sla_result['formatted']
@@ -832,6 +1120,19 @@ def calculate_sla_per_status(df):
     return df_with_sla
 
 
+def verify_sla_per_status(result, reference):
+    """Raise ValueError jika kolom SLA hasil columnar berbeda dengan referensi loop"""
+    sla_cols = ['apps_id', 'action_on_parsed', 'SLA_Hours', 'SLA_Formatted', 'SLA_From', 'SLA_To']
+    expected = reference[sla_cols].copy()
+    expected['SLA_Hours'] = pd.to_numeric(expected['SLA_Hours'])
+    
+    try:
+        pd.testing.assert_frame_equal(result[sla_cols], expected, check_dtype=False)
+    except AssertionError as e:
+        raise ValueError(f"Hasil SLA columnar berbeda dengan loop per-baris: {e}")
+
+
+@instrumented
 def remove_duplicate_status(df):
     """
     Remove duplicate status HANYA untuk RECOMMENDED CA dan RECOMMENDED CA WITH COND.
@@ -841,10 +1142,8 @@ def remove_duplicate_status(df):
     - For RECOMMENDED CA: Keep hanya first occurrence (delete duplicates)
     - For other status: Keep all (allow duplicates)
     """
-    df_dedup = df.copy()
-    
     # Step 1: Sort untuk consistency
-    df_dedup = df_dedup.sort_values(['apps_id', 'action_on_parsed']).reset_index(drop=True)
+    df_dedup = sort_by_action(_stage_frame(df))
     
     # Step 2: Define target status untuk deduplication
     status_to_deduplicate = [
@@ -853,26 +1152,388 @@ def remove_duplicate_status(df):
         'RECOMMENDED CA WITH CONDITION'
     ]
     
-    # Step 3: Mark duplikasi dan target status
-    df_dedup['_dup_count'] = df_dedup.groupby(['apps_id', 'apps_status_clean']).cumcount()
-    df_dedup['_is_target'] = df_dedup['apps_status_clean'].isin(status_to_deduplicate)
+    # Step 3: Mark duplikasi dan target status (sebagai Series terpisah, bukan kolom sementara di frame)
+    dup_count = df_dedup.groupby(['apps_id', 'apps_status_clean']).cumcount()
+    is_target = df_dedup['apps_status_clean'].isin(status_to_deduplicate)
     
-    # Step 4: Filter dengan logic: Keep jika first (_dup_count==0) ATAU bukan target status
-    keep_mask = (df_dedup['_dup_count'] == 0) | (~df_dedup['_is_target'])
-    df_dedup = df_dedup[keep_mask].drop(['_dup_count', '_is_target'], axis=1).reset_index(drop=True)
+    # Step 4: Filter dengan logic: Keep jika first (dup_count==0) ATAU bukan target status
+    keep_mask = (dup_count == 0) | (~is_target)
+    if keep_mask.all():
+        return df_dedup
+    df_dedup = df_dedup[keep_mask].reset_index(drop=True)
     
     return df_dedup
 
 
-@st.cache_data
+# ============================================================================
+# COMPACT DTYPES
+# ============================================================================
+# Kolom raw yang sudah punya versi cleaned -> di-drop dalam mode compact
+CLEANED_FROM_RAW = {
+    'apps_status': 'apps_status_clean',
+    'Outstanding_PH': 'OSPH_clean',
+    'LastOD': 'LastOD_clean',
+    'max_OD': 'max_OD_clean',
+    'Hasil_Scoring': 'Scoring_Detail',
+    'Segmen': 'Segmen_clean',
+    'JenisKendaraan': 'JenisKendaraan_clean',
+    'Pekerjaan': 'Pekerjaan_clean',
+    'desc_status_apps': 'desc_status_apps_clean',
+    'Jabatan': 'Jabatan_clean',
+    'branch_name': 'branch_name_clean',
+    'Tujuan_Kredit': 'Tujuan_Kredit_clean',
+    'user_name': 'user_name_clean',
+    'position_name': 'position_name_clean'
+}
+
+# Kolom dimensi (low cardinality) yang disimpan sebagai categorical
+CATEGORY_COLUMNS = [
+    'apps_status_clean', 'Scoring_Detail', 'Segmen_clean', 'JenisKendaraan_clean',
+    'Pekerjaan_clean', 'OSPH_Category', 'YearMonth', 'DayName', 'Jabatan_clean',
+    'branch_name_clean', 'Tujuan_Kredit_clean', 'user_name_clean', 'position_name_clean',
+    'position_code', 'SLA_Formatted', 'SLA_From', 'SLA_To'
+]
+
+# Urutan kategori tetap; kolom lain diurutkan alfabetis supaya stabil antar load
+CATEGORY_ORDERS = {
+    'OSPH_Category': ['0 - 250 Juta', '250 - 500 Juta', 'Lebih dari 500 Juta', 'Tidak Tersedia'],
+    'DayName': ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
+}
+
+SMALL_INT_COLUMNS = ['Hour', 'DayOfWeek', 'Month', 'Quarter']
+
+@instrumented
+def compact_dtypes(df):
+    """
+    Mode compact: kolom dimensi jadi categorical dengan urutan kategori stabil,
+    integer kecil di-downcast, dan kolom raw yang sudah punya versi cleaned di-drop.
+    Aman dipanggil ulang (mis. setelah merge incremental dengan kategori berbeda).
+    """
+    raw_cols = [raw for raw, clean in CLEANED_FROM_RAW.items() if raw in df.columns and clean in df.columns]
+    df = df.drop(columns=raw_cols)
+    
+    for col in CATEGORY_COLUMNS:
+        if col not in df.columns:
+            continue
+        values = df[col].astype(object)
+        observed = values.dropna().unique().tolist()
+        order = CATEGORY_ORDERS.get(col, [])
+        categories = [c for c in order] + sorted(c for c in observed if c not in order)
+        df[col] = pd.Categorical(values, categories=categories)
+    
+    for col in SMALL_INT_COLUMNS:
+        if col in df.columns and pd.api.types.is_integer_dtype(df[col]):
+            df[col] = pd.to_numeric(df[col], downcast='integer')
+    
+    return df
+
+
+# ============================================================================
+# SNAPSHOT CACHE (PARQUET)
+# ============================================================================
+# Naikkan jika ada perubahan pipeline yang tidak terlihat dari source function di bawah
+PIPELINE_VERSION = 1
+
+def _pipeline_stages():
+    """Function dan konstanta yang menentukan isi frame hasil load_data"""
+    return [
+        parse_dates_bulk, get_osph_category, preprocess_data, remove_duplicate_status,
+        HolidayCalendar, ShiftRule, WorkingTimeIndex, ShiftCalendar, shift_rule_ids,
+        calculate_sla_working_hours_bulk, round_sla_hours, to_datetime64, calculate_sla_per_status,
+        sla_columns, apps_id_partitions, _normalize_mixed_columns, ingest_export, _merge_date_format_counts,
+        compact_dtypes, _mappable_table, publish_arrow, open_shared_dataset
+    ]
+
+def _pipeline_fingerprint():
+    """
+    Hash versi pipeline + source code setiap stage + konstanta konfigurasi yang dibaca stage
+    (konstanta module tidak ikut di source function), berubah otomatis jika salah satunya berubah
+    """
+    digest = hashlib.sha256(f"v{PIPELINE_VERSION}".encode())
+    for stage in _pipeline_stages():
+        try:
+            digest.update(inspect.getsource(stage).encode())
+        except (OSError, TypeError):
+            digest.update(stage.__qualname__.encode())
+    digest.update(repr((
+        get_holiday_calendar().fingerprint(), get_shift_calendar().fingerprint(), COMPACT_DTYPES,
+        DATE_FORMATS, CATEGORY_COLUMNS, CATEGORY_ORDERS, CLEANED_FROM_RAW, SMALL_INT_COLUMNS
+    )).encode())
+    return digest.hexdigest()
+
+def _file_sha256(path):
+    """Content hash dari file sumber"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def _snapshot_path(source_path):
+    """Lokasi snapshot Parquet di sebelah workbook sumber"""
+    source_path = Path(source_path)
+    return source_path.with_name(f"{source_path.stem}.snapshot.parquet")
+
+def _normalize_mixed_columns(df):
+    """Kolom object dengan tipe campuran (mis. datetime & '-') dijadikan string agar bisa disimpan"""
+    for col in df.columns:
+        if df[col].dtype != object:
+            continue
+        value_types = df[col].dropna().map(type).unique()
+        if len(value_types) > 1:
+            df[col] = df[col].where(df[col].isna(), df[col].astype(str))
+    return df
+
+def read_snapshot(source_path, source_hash=None):
+    """
+    Baca snapshot jika fingerprint pipeline masih sama (dan hash workbook sama jika
+    source_hash diberikan), selain itu None.
+    """
+    snapshot_path = _snapshot_path(source_path)
+    if not snapshot_path.exists():
+        return None
+    try:
+        metadata = pq.read_schema(snapshot_path).metadata or {}
+        if source_hash is not None and metadata.get(b'source_sha256', b'').decode() != source_hash:
+            return None
+        if metadata.get(b'pipeline', b'').decode() != _pipeline_fingerprint():
+            return None
+        df = pq.read_table(snapshot_path).to_pandas()
+        df.attrs.update(json.loads(metadata.get(b'attrs', b'{}')))
+        return df
+    except Exception:
+        return None
+
+def write_snapshot(df, source_path, source_hash):
+    """Simpan frame final sebagai Parquet, ditulis atomik (temp file lalu replace)"""
+    snapshot_path = _snapshot_path(source_path)
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    table = table.replace_schema_metadata({
+        **(table.schema.metadata or {}),
+        b'source_sha256': source_hash.encode(),
+        b'pipeline': _pipeline_fingerprint().encode(),
+        b'attrs': json.dumps(df.attrs).encode()
+    })
+    tmp_path = snapshot_path.with_name(f"{snapshot_path.name}.{os.getpid()}.tmp")
+    try:
+        pq.write_table(table, tmp_path)
+        os.replace(tmp_path, snapshot_path)
+    finally:
+        if tmp_path.exists():
+            tmp_path.unlink()
+
+
+# ============================================================================
+# INCREMENTAL INGESTION
+# ============================================================================
+SLA_COLUMNS = ['SLA_Hours', 'SLA_Formatted', 'SLA_From', 'SLA_To']
+
+def _ingest_keys(apps_id, action_on, apps_status):
+    """Key baris untuk membandingkan export: (apps_id, action_on, apps_status)"""
+    return pd.MultiIndex.from_arrays([
+        pd.Series(apps_id).to_numpy(),
+        pd.Series(action_on).to_numpy(dtype='datetime64[us]'),
+        pd.Series(apps_status).astype(str).to_numpy()
+    ])
+
+def _merge_date_format_counts(base, extra):
+    """Gabungan date_format_counts dua batch input (dijumlah per kolom & per format)"""
+    merged = {col: dict(counts) for col, counts in base.items()}
+    for col, counts in extra.items():
+        col_counts = merged.setdefault(col, {})
+        for fmt, count in counts.items():
+            col_counts[fmt] = col_counts.get(fmt, 0) + count
+    return merged
+
+@instrumented
+def ingest_export(df_cached, df_export):
+    """
+    Merge export Historical_CA baru ke dataset yang sudah diproses.
+    
+    Baris baru/berubah dikenali dari key (apps_id, action_on, apps_status). Hanya apps_id
+    yang terdampak yang menjalani ulang preprocess, remove_duplicate_status dan SLA;
+    riwayat lama yang sudah tidak ada di export tetap dipertahankan.
+    """
+    # Key export setelah dedup, supaya duplikat RECOMMENDED CA tidak selalu terbaca sebagai baris baru
+    export_key_frame = pd.DataFrame({
+        'apps_id': df_export['apps_id'],
+        'action_on_parsed': parse_dates_bulk(df_export['action_on'])[0],
+        'apps_status_clean': df_export['apps_status'].fillna('Tidak Diketahui').astype(str).str.strip()
+    })
+    export_key_frame = remove_duplicate_status(export_key_frame)
+    export_keys = _ingest_keys(
+        export_key_frame['apps_id'], export_key_frame['action_on_parsed'], export_key_frame['apps_status_clean']
+    )
+    cached_keys = _ingest_keys(
+        df_cached['apps_id'], df_cached['action_on_parsed'], df_cached['apps_status_clean']
+    )
+    
+    is_new = ~export_keys.isin(cached_keys)
+    affected_apps = export_key_frame.loc[is_new, 'apps_id'].unique()
+    
+    ingest_info = {'new_rows': int(is_new.sum()), 'affected_apps': len(affected_apps)}
+    if len(affected_apps) == 0:
+        df_cached.attrs['last_ingest'] = ingest_info
+        return df_cached
+    
+    cached_affected = df_cached['apps_id'].isin(affected_apps).to_numpy()
+    
+    # Export terbaru untuk apps terdampak + riwayat cache yang tidak ada lagi di export
+    df_new = preprocess_data(df_export[df_export['apps_id'].isin(affected_apps)])
+    df_old = df_cached[cached_affected & ~cached_keys.isin(export_keys)].drop(columns=SLA_COLUMNS)
+    
+    df_recalc = remove_duplicate_status(pd.concat([df_old, df_new], ignore_index=True))
+    df_recalc = calculate_sla_per_status(df_recalc)
+    
+    df_merged = pd.concat([df_cached[~cached_affected], df_recalc], ignore_index=True)
+    df_merged = df_merged.sort_values(['apps_id', 'action_on_parsed'], kind='stable').reset_index(drop=True)
+    df_merged = _normalize_mixed_columns(df_merged)
+    
+    # Statistik format tanggal: baris export yang key-nya belum ada di cache ditambahkan ke hitungan lama
+    # (baris yang sudah ada tidak dihitung dua kali)
+    appended = ~_ingest_keys(df_new['apps_id'], df_new['action_on_parsed'], df_new['apps_status_clean']).isin(cached_keys)
+    date_format_counts = _merge_date_format_counts(df_cached.attrs.get('date_format_counts', {}), {
+        col: parse_dates_bulk(df_new.loc[appended, col])[1]
+        for col in df_new.attrs.get('date_format_counts', {})
+    })
+    
+    df_merged.attrs = {**df_cached.attrs, 'date_format_counts': date_format_counts, 'last_ingest': ingest_info}
+    return df_merged
+
+
+# ============================================================================
+# SHARED DATASET (ARROW IPC, MEMORY-MAPPED)
+# ============================================================================
+def _arrow_path(source_path, dataset_version):
+    """Lokasi file Arrow per versi dataset, di sebelah workbook sumber"""
+    source_path = Path(source_path)
+    return source_path.with_name(f"{source_path.stem}.{dataset_version}.arrow")
+
+def _mappable_table(df):
+    """
+    Table Arrow dengan layout yang bisa dibaca to_pandas tanpa copy: string sebagai large_string
+    (layout ArrowStringArray pandas) dan float dengan NaN sebagai nilai, bukan null bitmap.
+    """
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    for i, field in enumerate(table.schema):
+        if pa.types.is_string(field.type):
+            column = table.column(i).cast(pa.large_string())
+        elif pa.types.is_floating(field.type) and table.column(i).null_count:
+            column = pa.array(df[field.name].to_numpy(), from_pandas=False)
+        else:
+            continue
+        table = table.set_column(i, field.with_type(column.type), column)
+    return table
+
+def publish_arrow(df, arrow_path):
+    """
+    Tulis frame final sebagai Arrow IPC file tanpa kompresi (syarat mmap tanpa copy),
+    atomik lewat temp file.
+    """
+    arrow_path = Path(arrow_path)
+    table = _mappable_table(df)
+    table = table.replace_schema_metadata({
+        **(table.schema.metadata or {}),
+        b'attrs': json.dumps(df.attrs).encode()
+    })
+    tmp_path = arrow_path.with_name(f"{arrow_path.name}.{os.getpid()}.tmp")
+    try:
+        with pa.OSFile(str(tmp_path), 'wb') as sink:
+            with pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+        os.replace(tmp_path, arrow_path)
+    finally:
+        if tmp_path.exists():
+            tmp_path.unlink()
+
+def open_shared_dataset(arrow_path):
+    """
+    Buka file Arrow lewat memory map. Sharing-nya parsial: kolom numerik, string dan float
+    (lihat _mappable_table) serta datetime tanpa NaT menunjuk langsung ke halaman file (read-only).
+    Kode categorical dan datetime yang punya NaT tetap dikonversi ke memory proses
+    (pada workbook bawaan ~92% ukuran frame ter-map).
+    """
+    source = pa.memory_map(str(arrow_path), 'r')
+    table = pa.ipc.open_file(source).read_all()
+    df = table.to_pandas(split_blocks=True)
+    df.attrs.update(json.loads((table.schema.metadata or {}).get(b'attrs', b'{}')))
+    return df
+
+def share_dataset(df, source_path):
+    """
+    Publikasikan frame final lalu kembalikan versi memory-mapped-nya (fallback: frame asli).
+    File Arrow versi lama dari workbook yang sama dihapus jika bisa; di Windows file yang masih
+    di-map proses lain tidak bisa dihapus dan dibiarkan sampai load berikutnya.
+    """
+    arrow_path = _arrow_path(source_path, df.attrs['dataset_version'])
+    try:
+        if not arrow_path.exists():
+            with perf_stage('publish_arrow', rows_in=len(df)):
+                publish_arrow(df, arrow_path)
+            prefix = f"{Path(source_path).stem}."
+            for stale in arrow_path.parent.iterdir():
+                if stale.name.startswith(prefix) and stale.suffix == '.arrow' and stale != arrow_path:
+                    try:
+                        stale.unlink(missing_ok=True)
+                    except OSError:
+                        pass
+        return open_shared_dataset(arrow_path)
+    except Exception as e:
+        st.warning(f"Dataset bersama (Arrow) tidak dapat dibuat: {str(e)}")
+        return df
+
+
+@st.cache_resource
 def load_data():
-    """Load and preprocess data"""
+    """
+    Load and preprocess data.
+    Satu frame per proses (cache_resource) yang sama untuk semua session: kode tab tidak boleh
+    mengubahnya (assign kolom, attrs, inplace), turunan dibuat lewat iloc/assign/copy.
+    Buffer yang di-map dari file Arrow juga read-only.
+    """
+    with perf_stage('load_data') as record:
+        df = _load_data()
+        record['rows_out'] = len(df) if df is not None else None
+    return df
+
+def _load_data():
+    """Isi load_data: arrow bersama -> snapshot -> workbook (full atau incremental)"""
     try:
         if not Path(FILE_NAME).exists():
             st.error(f"File tidak ditemukan: {FILE_NAME}")
             return None
         
-        df = pd.read_excel(FILE_NAME)
+        # Snapshot Parquet valid -> tidak perlu read_excel + preprocess + SLA lagi
+        with perf_stage('file_sha256'):
+            source_hash = _file_sha256(FILE_NAME)
+        # Identitas dataset (workbook + pipeline) untuk index & cache turunan per dataset
+        dataset_version = f"{source_hash[:12]}-{_pipeline_fingerprint()[:12]}"
+        
+        # Proses lain sudah mempublikasikan versi ini -> langsung map, tanpa baca snapshot
+        if SHARED_DATASET:
+            arrow_path = _arrow_path(FILE_NAME, dataset_version)
+            if arrow_path.exists():
+                try:
+                    with perf_stage('open_shared_dataset') as record:
+                        df_shared = open_shared_dataset(arrow_path)
+                        record['rows_out'] = len(df_shared)
+                    return df_shared
+                except Exception:
+                    pass
+        
+        with perf_stage('read_snapshot') as record:
+            df_snapshot = read_snapshot(FILE_NAME, source_hash)
+            record['rows_out'] = len(df_snapshot) if df_snapshot is not None else 0
+        if df_snapshot is not None:
+            df_snapshot.attrs['dataset_version'] = dataset_version
+            return share_dataset(df_snapshot, FILE_NAME) if SHARED_DATASET else df_snapshot
+        
+        # Mode incremental: workbook berubah, snapshot lama dipakai sebagai basis merge
+        df_base = read_snapshot(FILE_NAME) if INCREMENTAL_INGEST else None
+        
+        with perf_stage('read_excel') as record:
+            df = pd.read_excel(FILE_NAME)
+            record['rows_out'] = len(df)
         
         required_cols = [
             'apps_id', 'position_name', 'user_name', 'apps_status', 'desc_status_apps',
@@ -887,76 +1548,877 @@ def load_data():
             st.error(f"Kolom yang hilang: {', '.join(missing)}")
             return None
         
-        df_clean = preprocess_data(df)
-        df_clean = calculate_sla_per_status(df_clean)
-        
-        return df_clean
+        if df_base is not None:
+            df_clean = ingest_export(df_base, df)
+        else:
+            df_clean = preprocess_data(df)
+            df_clean = calculate_sla_per_status(df_clean)
+        # Raw export tidak dipakai lagi; dilepas supaya tidak ikut tertahan di stage berikutnya
+        del df
+        
+        # Compact dulu: kolom raw yang di-drop tidak perlu dinormalisasi
+        if COMPACT_DTYPES:
+            df_clean = compact_dtypes(df_clean)
+        with perf_stage('normalize_mixed_columns', rows_in=len(df_clean)):
+            df_clean = _normalize_mixed_columns(df_clean)
+        
+        df_clean.attrs['dataset_version'] = dataset_version
+        
+        try:
+            with perf_stage('write_snapshot', rows_in=len(df_clean)):
+                write_snapshot(df_clean, FILE_NAME, source_hash)
+        except Exception as e:
+            st.warning(f"Snapshot data tidak dapat disimpan: {str(e)}")
+        
+        return share_dataset(df_clean, FILE_NAME) if SHARED_DATASET else df_clean
     except Exception as e:
         st.error(f"Error saat memuat data: {str(e)}")
         return None
 # ============================================================================
-# MAIN APPLICATION
+# FILTER & LOOKUP INDEX
 # ============================================================================
+FILTER_DIMENSIONS = ['apps_status_clean', 'Scoring_Detail', 'Segmen_clean', 'branch_name_clean']
 
-def main():
-    """Main Streamlit application"""
-    
-    # BCA Finance Header - Simple Text Only
-    st.markdown("""
-    <div class="header-container">
-        <div style="text-align: center;">
-            <h1 style="margin: 0; font-size: 42px; letter-spacing: 1px; color: white !important;">Dashboard Analisis CA</h1>
-            <p style="color: #e3f2fd !important; margin-top: 12px; font-size: 17px;">BCA Finance - Monitoring & Evaluasi Kinerja Credit Analyst</p>
-        </div>
-    </div>
-    """, unsafe_allow_html=True)
-    
-    st.markdown("---")
-    
-    with st.spinner("Memuat data..."):
-        df = load_data()
-    
-    if df is None or df.empty:
-        st.error("Tidak dapat memuat data")
-        st.stop()
-    
-    # TOP METRICS
-    st.markdown("### Ringkasan Utama")
-    
-    total_records = len(df)
-    unique_apps = df['apps_id'].nunique()
-    sla_with_data = df['SLA_Hours'].notna().sum()
-    
-    col1, col2, col3, col4 = st.columns(4)
-    
-    with col1:
-        st.markdown('<div class="metric-box">', unsafe_allow_html=True)
-        st.metric("Total Data", f"{total_records:,}")
-        st.markdown('<p style="color: #90a4ae; font-size: 14px; margin-top: 5px;">Total semua transaksi dalam sistem</p>', unsafe_allow_html=True)
-        st.markdown('</div>', unsafe_allow_html=True)
-    
-    with col2:
-        st.markdown('<div class="metric-box-success">', unsafe_allow_html=True)
-        st.metric("Total AppID", f"{unique_apps:,}")
-        st.markdown('<p style="color: #90a4ae; font-size: 14px; margin-top: 5px;">Jumlah AppID Distinct</p>', unsafe_allow_html=True)
-        st.markdown('</div>', unsafe_allow_html=True)
-    
-    with col3:
-        st.markdown('<div class="metric-box-warning">', unsafe_allow_html=True)
-        sla_pct = f"{sla_with_data/total_records*100:.1f}%"
-        st.metric("Data SLA Lengkap", f"{sla_with_data:,}")
-        st.markdown(f'<p style="color: #90a4ae; font-size: 14px; margin-top: 5px;">Cakupan: {sla_pct} dari total data</p>', unsafe_allow_html=True)
-        st.markdown('</div>', unsafe_allow_html=True)
+class FilterIndex:
+    """
+    Bitmap (packed boolean mask) per nilai untuk setiap dimensi filter sidebar.
+    Kombinasi filter = OR dalam satu dimensi, AND antar dimensi, hasilnya posisi baris.
+    """
     
-    with col4:
-        sla_valid = df[df['SLA_Hours'].notna()]
-        if len(sla_valid) > 0:
-            avg_hours = sla_valid['SLA_Hours'].mean()
-            avg_formatted = convert_hours_to_hm(avg_hours)
-            st.markdown('<div class="metric-box-danger">', unsafe_allow_html=True)
-            st.metric("Rata-rata Waktu Proses", avg_formatted)
-            st.markdown('<p style="color: #90a4ae; font-size: 14px; margin-top: 5px;">Per History</p>', unsafe_allow_html=True)
-            st.markdown('</div>', unsafe_allow_html=True)
+    def __init__(self, df, dimensions=FILTER_DIMENSIONS):
+        self.n_rows = len(df)
+        self.bitmaps = {}
+        self.missing = {}
+        
+        for dim in dimensions:
+            if dim not in df.columns:
+                continue
+            codes, uniques = pd.factorize(df[dim], sort=True)
+            self.bitmaps[dim] = {
+                value: np.packbits(codes == code) for code, value in enumerate(uniques)
+            }
+            self.missing[dim] = np.packbits(codes == -1)
+    
+    def _dimension_mask(self, dim, values):
+        values = set(values)
+        bitmaps = self.bitmaps[dim]
+        selected = [bitmap for value, bitmap in bitmaps.items() if value in values]
+        unselected = [bitmap for value, bitmap in bitmaps.items() if value not in values]
+        
+        if not selected:
+            return np.zeros_like(self.missing[dim])
+        # Jika hampir semua nilai dipilih, lebih murah NOT(OR nilai yang tidak dipilih)
+        if len(unselected) < len(selected):
+            return ~np.bitwise_or.reduce(unselected + [self.missing[dim]])
+        return np.bitwise_or.reduce(selected)
+    
+    def select(self, selections):
+        """
+        selections: {dimensi: list nilai}; list kosong berarti dimensi tidak difilter.
+        Return array posisi baris, atau None jika tidak ada filter yang membatasi.
+        """
+        mask = None
+        for dim, values in selections.items():
+            if not values or dim not in self.bitmaps:
+                continue
+            dim_mask = self._dimension_mask(dim, values)
+            mask = dim_mask if mask is None else mask & dim_mask
+        
+        if mask is None:
+            return None
+        positions = np.flatnonzero(np.unpackbits(mask, count=self.n_rows))
+        return None if len(positions) == self.n_rows else positions
+
+@st.cache_resource(max_entries=4)
+def get_filter_index(dataset_version, _df):
+    """FilterIndex dibangun sekali per versi dataset dan dipakai bersama semua session"""
+    return FilterIndex(_df)
+
+
+class AppIndex:
+    """Index apps_id -> range posisi baris, sehingga riwayat satu AppID didapat tanpa scan frame"""
+    
+    def __init__(self, df):
+        apps_id = df['apps_id'].to_numpy()
+        self.positions = np.argsort(apps_id, kind='stable')
+        sorted_ids = apps_id[self.positions]
+        self.app_ids, self.starts = np.unique(sorted_ids, return_index=True)
+        self.ends = np.append(self.starts[1:], len(sorted_ids))
+    
+    def lookup(self, app_id):
+        """Posisi baris untuk app_id (array kosong jika tidak ada)"""
+        i = np.searchsorted(self.app_ids, app_id)
+        if i >= len(self.app_ids) or self.app_ids[i] != app_id:
+            return self.positions[:0]
+        return self.positions[self.starts[i]:self.ends[i]]
+
+@st.cache_resource(max_entries=4)
+def get_app_index(dataset_version, _df):
+    """AppIndex dibangun sekali per versi dataset"""
+    return AppIndex(_df)
+
+
+# ============================================================================
+# AGGREGATE CACHE
+# ============================================================================
+def _cache_nbytes(value):
+    """Perkiraan ukuran memory hasil agregat (frame: memory_usage deep; dict/list/objek: jumlah isinya)"""
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(deep=True).sum())
+    if isinstance(value, (pd.Series, pd.Index)):
+        return int(value.memory_usage(deep=True))
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, dict):
+        return sum(_cache_nbytes(item) for item in value.values())
+    if isinstance(value, (list, tuple)):
+        return sum(_cache_nbytes(item) for item in value)
+    if hasattr(value, '__dict__'):
+        return _cache_nbytes(vars(value))
+    return sys.getsizeof(value)
+
+class AggregateCache:
+    """
+    LRU cache hasil agregat, dipakai bersama oleh semua session.
+    Dibatasi jumlah entri dan total ukuran (hasil per AppID bisa sebesar fact table); hasil yang
+    sendirian melebihi batas ukuran tidak disimpan.
+    Hasil yang dikembalikan shared -> jangan dimodifikasi in-place.
+    """
+    def __init__(self, max_entries, max_bytes):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._sizes = {}
+        self.total_bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get_or_compute(self, key, compute):
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+            self.misses += 1
+
+        # Dihitung di luar lock supaya session lain tidak menunggu
+        value = compute()
+        size = _cache_nbytes(value)
+        if size > self.max_bytes:
+            return value
+
+        with self._lock:
+            if key in self._entries:
+                self.total_bytes -= self._sizes[key]
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            self._sizes[key] = size
+            self.total_bytes += size
+            while len(self._entries) > self.max_entries or self.total_bytes > self.max_bytes:
+                evicted, _ = self._entries.popitem(last=False)
+                self.total_bytes -= self._sizes.pop(evicted)
+                self.evictions += 1
+        return value
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'Entri': len(self._entries),
+                'Ukuran (MB)': f"{self.total_bytes / 1024**2:.1f}",
+                'Hit': self.hits,
+                'Miss': self.misses,
+                'Eviction': self.evictions,
+                'Hit Rate': f"{self.hits/lookups*100:.1f}%" if lookups else "-"
+            }
+
+@st.cache_resource
+def get_aggregate_cache():
+    """Satu AggregateCache per proses server"""
+    return AggregateCache(AGGREGATE_CACHE_MAX_ENTRIES, AGGREGATE_CACHE_MAX_MB * 1024**2)
+
+def cached_aggregate(dataset_version, filter_key, build, df, *args):
+    """build(df, *args) lewat cache, key = (versi dataset, state filter, nama builder, args)"""
+    key = (dataset_version, filter_key, build.__name__, args)
+    return get_aggregate_cache().get_or_compute(key, lambda: build(df, *args))
+
+
+# ============================================================================
+# APP FACTS
+# ============================================================================
+APPROVED_STATUSES = ['RECOMMENDED CA', 'RECOMMENDED CA WITH COND']
+
+# Atribut yang sama di semua catatan satu AppID (diambil dari catatan terakhir)
+APP_ATTRIBUTE_COLUMNS = [
+    'Segmen_clean', 'branch_name_clean', 'Scoring_Detail', 'OSPH_clean', 'OSPH_Category',
+    'Pekerjaan_clean', 'JenisKendaraan_clean', 'LastOD_clean', 'max_OD_clean'
+]
+
+def _action_order(df):
+    """Catatan diurutkan per AppID lalu waktu aksi (NaT di depan: catatan terakhir = aksi valid terbaru)"""
+    return df.sort_values(['apps_id', 'action_on_parsed'], na_position='first', kind='stable')
+
+def build_app_facts(df):
+    """
+    Fact table satu baris per AppID (index apps_id): status awal/akhir, keputusan akhir,
+    jumlah langkah, total & rata-rata SLA per langkah, atribut aplikasi, CA awal/akhir.
+    """
+    ordered = _action_order(df)
+    first = ordered.drop_duplicates('apps_id', keep='first').set_index('apps_id')
+    last = ordered.drop_duplicates('apps_id', keep='last').set_index('apps_id')
+    steps = ordered.groupby('apps_id', sort=True).agg(
+        steps=('apps_id', 'size'),
+        sla_total=('SLA_Hours', 'sum'),
+        sla_steps=('SLA_Hours', 'count')
+    ).reindex(last.index)
+    
+    facts = pd.DataFrame({
+        'first_status': first['apps_status_clean'],
+        'last_status': last['apps_status_clean'],
+        'approved': last['apps_status_clean'].isin(APPROVED_STATUSES),
+        'steps': steps['steps'],
+        'sla_total': steps['sla_total'].where(steps['sla_steps'] > 0),
+        'sla_per_step': steps['sla_total'] / steps['sla_steps'].replace(0, np.nan),
+        'first_action': first['action_on_parsed'],
+        'last_action': last['action_on_parsed'],
+        'first_ca': first['user_name_clean'],
+        'last_ca': last['user_name_clean']
+    }, index=last.index)
+    for col in APP_ATTRIBUTE_COLUMNS:
+        if col in last.columns:
+            facts[col] = last[col]
+    
+    # Dimensi yang konstan per AppID -> fact table bisa langsung di-slice saat difilter
+    per_app = ordered.groupby('apps_id', sort=False)[CUBE_DIMENSIONS].nunique(dropna=False)
+    facts.attrs['app_level_dims'] = [col for col in CUBE_DIMENSIONS if (per_app[col] <= 1).all()]
+    return facts
+
+@st.cache_resource(max_entries=4)
+def get_app_facts(dataset_version, _df):
+    """Fact table per AppID untuk dataset penuh, dibangun sekali per versi dataset"""
+    return build_app_facts(_df)
+
+
+# ============================================================================
+# AGGREGATE CUBE
+# ============================================================================
+# Dimensi per catatan yang dibawa cube: dimensi tab + dimensi filter sidebar
+CUBE_DIMENSIONS = [
+    'Segmen_clean', 'branch_name_clean', 'user_name_clean', 'apps_status_clean', 'Scoring_Detail',
+    'OSPH_Category', 'YearMonth', 'Pekerjaan_clean', 'JenisKendaraan_clean'
+]
+
+# Kategori keterlambatan: kolom OD -> (dimensi cube, batas bin, label)
+OD_BINS = {
+    'LastOD_clean': ('LastOD_Category', [-np.inf, 0, 10, 30, np.inf], ['Tidak Ada', '1-10 Hari', '11-30 Hari', 'Lebih dari 30 Hari']),
+    'max_OD_clean': ('maxOD_Category', [-np.inf, 0, 15, 45, np.inf], ['Tidak Ada', '1-15 Hari', '16-45 Hari', 'Lebih dari 45 Hari'])
+}
+
+# Scope distinct AppID selain global: suffix measure -> kolom tambahan selain apps_id.
+# AppID dihitung di catatan terakhirnya per scope, jadi apps/approved tetap additive saat roll-up
+CUBE_APP_SCOPES = {
+    '_ca': ['user_name_clean'],
+    '_month': ['YearMonth']
+}
+
+# Cube per keluarga tab, dimensi = kolom yang di-group oleh tab tersebut (grain terkecil yang dibutuhkan)
+CUBE_FAMILIES = {
+    'branch': ['branch_name_clean'],
+    'ca': ['user_name_clean', 'branch_name_clean'],
+    'osph': ['Segmen_clean', 'OSPH_Category', 'Pekerjaan_clean', 'JenisKendaraan_clean', 'apps_status_clean', 'Scoring_Detail'],
+    'status_scoring': ['apps_status_clean', 'Scoring_Detail'],
+    'od': ['LastOD_Category', 'maxOD_Category'],
+    'monthly': ['YearMonth']
+}
+
+# Dimensi filter berkardinalitas tinggi: cube di-index per nilainya (filter = ambil posisi cube nilai
+# tersebut), tanpa filter ini dipakai cube yang sudah di-roll-up tanpa dimensi ini
+CUBE_INDEX_DIMENSION = 'branch_name_clean'
+
+# Measure catatan yang disimpan di cube (measure AppID diturunkan saat roll-up)
+CUBE_MEASURES = ['records', 'sla_sum', 'sla_count', 'osph']
+
+class AggregateCube:
+    """
+    Cube per keluarga tab dengan key = dimensi keluarga + dimensi filter sidebar, sehingga state
+    filter apa pun cukup slice + roll-up cube tanpa kembali ke catatan.
+    Status berubah sepanjang history AppID: setiap catatan membawa bitmask status catatan-catatan
+    sesudahnya (per AppID dan per scope CUBE_APP_SCOPES). Dengan filter status S, catatan adalah
+    catatan terakhir AppID di dalam filter (AppID dihitung di sini) jika bitmask-nya tidak beririsan
+    dengan S. Dimensi filter lain harus konstan per AppID (lihat slices).
+    """
+    
+    def __init__(self, df):
+        ordered = _action_order(df)
+        codes, statuses = pd.factorize(ordered['apps_status_clean'], sort=True, use_na_sentinel=False)
+        if len(statuses) > 63:
+            raise ValueError(f"Terlalu banyak nilai status untuk bitmask cube: {len(statuses)}")
+        self.status_bits = {value: 1 << code for code, value in enumerate(statuses)}
+        self.all_status_bits = (1 << len(statuses)) - 1
+        
+        rows = ordered[CUBE_DIMENSIONS].copy()
+        for od_col, (category_col, bins, labels) in OD_BINS.items():
+            rows[category_col] = pd.cut(ordered[od_col], bins=bins, labels=labels)
+        rows['records'] = np.ones(len(ordered), dtype='int64')
+        rows['sla_sum'] = ordered['SLA_Hours'].fillna(0).to_numpy()
+        rows['sla_count'] = ordered['SLA_Hours'].notna().to_numpy().astype('int64')
+        rows['osph'] = ordered['OSPH_clean'].fillna(0).to_numpy()
+        
+        # Bitmask status catatan sesudahnya: cumsum one-hot status dari belakang per AppID (+ scope)
+        onehot = np.zeros((len(ordered), len(statuses)), dtype='int32')
+        onehot[np.arange(len(ordered)), codes] = 1
+        weights = np.left_shift(1, np.arange(len(statuses), dtype='int64'))
+        for suffix, scope in {'': [], **CUBE_APP_SCOPES}.items():
+            keys = [ordered[col].to_numpy()[::-1] for col in ['apps_id'] + scope]
+            from_here = pd.DataFrame(onehot[::-1]).groupby(keys, dropna=False, sort=False).cumsum().to_numpy()[::-1]
+            rows['later' + suffix] = (((from_here - onehot) > 0) @ weights).astype(np.min_scalar_type(self.all_status_bits))
+        
+        # Dimensi filter yang konstan per AppID: filter pada dimensi ini = slice cube yang exact
+        self.filter_dims = [dim for dim in FILTER_DIMENSIONS if dim in rows.columns]
+        per_app = ordered.groupby('apps_id', sort=False)[self.filter_dims].nunique(dropna=False)
+        self.app_level_dims = [dim for dim in self.filter_dims if (per_app[dim] <= 1).all()]
+        # Nilai per dimensi filter (termasuk NaN: memilih semua nilai tetap membuang catatan kosong)
+        self.values = {dim: set(rows[dim].unique()) for dim in self.filter_dims}
+        self.index_dim = CUBE_INDEX_DIMENSION if CUBE_INDEX_DIMENSION in self.filter_dims else None
+        
+        self.cubes = {}
+        self.index = {}
+        self.unindexed = {}
+        self.scopes = {}
+        built = {}  # keluarga dengan key yang sama memakai frame & index yang sama
+        for family, dims in CUBE_FAMILIES.items():
+            self.scopes[family] = [
+                suffix for suffix, scope in CUBE_APP_SCOPES.items() if set(scope) <= set(dims)
+            ]
+            keys = list(dict.fromkeys(dims + self.filter_dims)) + [
+                'later' + suffix for suffix in ['', *self.scopes[family]]
+            ]
+            key_set = frozenset(keys)
+            if key_set not in built:
+                cube = rows.groupby(keys, observed=True, dropna=False, sort=False)[CUBE_MEASURES].sum().reset_index()
+                index = None
+                if self.index_dim is not None:
+                    index = cube.groupby(self.index_dim, observed=True, dropna=False, sort=False).indices
+                built[key_set] = (cube, index)
+            self.cubes[family], self.index[family] = built[key_set]
+            if self.index_dim is not None and self.index_dim not in dims:
+                unindexed_keys = [key for key in keys if key != self.index_dim]
+                self.unindexed[family] = self.cubes[family].groupby(
+                    unindexed_keys, observed=True, dropna=False, sort=False
+                )[CUBE_MEASURES].sum().reset_index()
+    
+    def slices(self, selections):
+        """True jika state filter bisa dijawab dengan slice cube (dimensi non-status yang mempersempit konstan per AppID)"""
+        return all(
+            dim in self.app_level_dims or self.values[dim] <= set(values)
+            for dim, values in selections.items()
+            if values and dim in self.values and dim != 'apps_status_clean'
+        )
+    
+    def rollup(self, selections, family):
+        """
+        Cube keluarga tab (grain dimensi keluarga) untuk state filter selections:
+        records, sla_sum, sla_count, apps, approved (keputusan akhir), osph_sum, apps_<scope>, approved_<scope>.
+        AppID dihitung di catatan terakhirnya di dalam filter.
+        """
+        selected_status = selections.get('apps_status_clean')
+        status_mask = self.all_status_bits
+        if selected_status:
+            status_mask = 0
+            for value in selected_status:
+                status_mask |= self.status_bits.get(value, 0)
+        
+        indexed_values = selections.get(self.index_dim) if self.index_dim else None
+        if indexed_values:
+            positions = [self.index[family][value] for value in indexed_values if value in self.index[family]]
+            cube = self.cubes[family].iloc[np.concatenate(positions) if positions else []]
+        else:
+            cube = self.unindexed.get(family, self.cubes[family])
+        
+        keep = np.ones(len(cube), dtype=bool)
+        for dim, values in selections.items():
+            if values and dim in self.filter_dims and dim != self.index_dim:
+                keep &= cube[dim].isin(values).to_numpy()
+        sliced = cube[keep]
+        records = sliced['records'].to_numpy()
+        approved_status = sliced['apps_status_clean'].isin(APPROVED_STATUSES).to_numpy()
+        
+        measures = {
+            'records': records,
+            'sla_sum': sliced['sla_sum'].to_numpy(),
+            'sla_count': sliced['sla_count'].to_numpy()
+        }
+        for suffix in ['', *self.scopes[family]]:
+            counted = (sliced['later' + suffix].to_numpy() & status_mask) == 0
+            apps = np.where(counted, records, 0)
+            measures['apps' + suffix] = apps
+            measures['approved' + suffix] = np.where(approved_status, apps, 0)
+            if not suffix:
+                measures['osph_sum'] = np.where(counted, sliced['osph'].to_numpy(), 0)
+        
+        return pd.DataFrame(measures, index=sliced.index).groupby(
+            [sliced[dim] for dim in CUBE_FAMILIES[family]], observed=True, dropna=False, sort=False
+        ).sum().reset_index()
+
+@st.cache_resource(max_entries=4)
+def get_aggregate_cube(dataset_version, _df):
+    """AggregateCube untuk dataset penuh, dibangun sekali per versi dataset"""
+    return AggregateCube(_df)
+
+def get_filtered_cube(dataset_version, filter_key, selections, df, df_filtered, family):
+    """
+    Cube keluarga tab untuk state filter sidebar: slice + roll-up cube dataset penuh, dihitung saat
+    tab yang memakainya dibuka. Hanya jika filter mempersempit dimensi non-status yang tidak konstan
+    per AppID, cube dibangun dari catatan terfilter.
+    """
+    def build():
+        cube = get_aggregate_cube(dataset_version, df)
+        if not cube.slices(selections):
+            cube = get_aggregate_cache().get_or_compute(
+                (dataset_version, filter_key, 'AggregateCube'), lambda: AggregateCube(df_filtered)
+            )
+            return cube.rollup({}, family)
+        with perf_stage('rollup_cube', scope='rerun') as record:
+            result = cube.rollup(selections, family)
+            record['rows_out'] = len(result)
+        return result
+    
+    return get_aggregate_cache().get_or_compute((dataset_version, filter_key, 'cube', family), build)
+
+@st.cache_resource(max_entries=4)
+def get_default_facts(dataset_version, status_options, _df):
+    """Fact table untuk pilihan status bawaan sidebar (semua status_options), dibangun sekali per versi dataset"""
+    positions = get_filter_index(dataset_version, _df).select({'apps_status_clean': list(status_options)})
+    if positions is None:
+        return get_app_facts(dataset_version, _df)
+    return build_app_facts(_df.iloc[positions])
+
+def get_filtered_facts(dataset_version, filter_key, selections, df, df_filtered, status_options=()):
+    """
+    Fact table per AppID untuk state filter sidebar, dibangun hanya saat tab yang memakainya dibuka.
+    Titik awalnya fact table dataset penuh, atau pilihan status bawaan jika semua status_options
+    dipilih. Filter pada dimensi yang konstan per AppID cukup slice; jika user mempersempit dimensi
+    yang berubah sepanjang history AppID (mis. status), fact table dibangun ulang dari catatan
+    terfilter supaya AppID tetap dihitung di catatan terakhirnya di dalam hasil filter.
+    """
+    selections = dict(selections)
+    if status_options and sorted(selections.get('apps_status_clean') or []) == sorted(status_options):
+        facts = get_default_facts(dataset_version, tuple(sorted(status_options)), df)
+        del selections['apps_status_clean']
+    else:
+        facts = get_app_facts(dataset_version, df)
+    if df_filtered is df:
+        return facts
+    
+    def build():
+        present = get_aggregate_cube(dataset_version, df).values
+        facts_mask = np.ones(len(facts), dtype=bool)
+        for dim, values in selections.items():
+            if not values or dim not in present:
+                continue
+            if dim in facts.attrs['app_level_dims']:
+                facts_mask &= facts[dim].isin(values).to_numpy()
+            elif not present[dim] <= set(values):
+                return build_app_facts(df_filtered)
+        if facts_mask.all():
+            return facts
+        return facts[facts_mask]
+    
+    return get_aggregate_cache().get_or_compute((dataset_version, filter_key, 'facts'), build)
+
+
+# ============================================================================
+# AGGREGATION ENGINE
+# ============================================================================
+# Builder tab (kecuali yang butuh baris: median SLA, ringkasan per AppID) menerima cube keluarganya
+
+def aggregate_performance(cube, group_col, app_scope=''):
+    """
+    Kinerja per group (cabang / CA) dari roll-up cube:
+    distinct apps, records, approval, rata-rata SLA dan total OSPH.
+    AppID dihitung di catatan terakhirnya (sama dengan fact table); app_scope memilih measure
+    AppID ('_ca' untuk CA: AppID dihitung sekali per CA, di catatan terakhirnya pada CA tersebut).
+    """
+    perf = cube.groupby(group_col, observed=True, sort=True)[
+        ['apps' + app_scope, 'records', 'approved' + app_scope, 'sla_sum', 'sla_count', 'osph_sum']
+    ].sum()
+    
+    return pd.DataFrame({
+        'apps': perf['apps' + app_scope],
+        'records': perf['records'],
+        'approved': perf['approved' + app_scope],
+        'sla_mean': perf['sla_sum'] / perf['sla_count'].replace(0, np.nan),
+        'osph_sum': perf['osph_sum']
+    }, index=perf.index)
+
+def build_apps_summary(facts):
+    """Ringkasan per AppID (Tab 2): proyeksi fact table, status & CA dari catatan terakhir"""
+    def fact_col(col, default='N/A'):
+        return facts[col].to_numpy() if col in facts.columns else default
+    
+    return pd.DataFrame({
+        'AppID': facts.index,
+        'Jumlah Catatan': facts['steps'].to_numpy(),
+        'Status Terakhir': fact_col('last_status'),
+        'Aksi Terakhir': fact_col('last_action', pd.NaT),
+        'Segmen': fact_col('Segmen_clean'),
+        'Kategori Plafon': fact_col('OSPH_Category'),
+        'Cabang': fact_col('branch_name_clean'),
+        'Credit Analyst': fact_col('last_ca')  # CA TERAKHIR dari history
+    })
+
+def modal_value(cube, group_col, value_col):
+    """Nilai value_col dengan catatan terbanyak untuk setiap group (seri: urutan alfabetis pertama)"""
+    counts = cube.groupby([group_col, value_col], observed=True, sort=True)['records'].sum().reset_index(name='n')
+    counts = counts[counts['n'] > 0]
+    counts = counts.sort_values([group_col, 'n'], ascending=[True, False], kind='stable')
+    return counts.drop_duplicates(group_col).set_index(group_col)[value_col]
+
+OSPH_ORDER = ['0 - 250 Juta', '250 - 500 Juta', 'Lebih dari 500 Juta']
+SEGMENTS = ['-', 'KKB', 'CS NEW', 'CS USED']
+
+def build_osph_pivots(cube, dim_col, label, top_n=10):
+    """
+    Pivot Kategori Plafon x dimensi untuk setiap segmen dari satu roll-up cube.
+    Hitungan per AppID distinct (status = status terakhir AppID).
+    Return dict segmen -> {total_apps, total_records, pivot (wide + TOTAL), plot (long untuk px.bar)}.
+    """
+    top_values = cube.groupby(dim_col, observed=True, sort=True)['apps'].sum()
+    top_values = top_values[top_values > 0].sort_values(ascending=False, kind='stable').head(top_n).index.tolist()
+
+    counts = cube.groupby(['Segmen_clean', 'OSPH_Category', dim_col], observed=True, dropna=False)['apps'].sum()
+    counts = counts[counts > 0]
+    records = cube.groupby('Segmen_clean', observed=True)['records'].sum()
+
+    pivots = {}
+    for segmen in SEGMENTS:
+        if segmen in counts.index.get_level_values(0):
+            seg_counts = counts.xs(segmen, level=0).unstack(dim_col, fill_value=0)
+        else:
+            seg_counts = pd.DataFrame(dtype='int64')
+        total_apps = int(seg_counts.to_numpy().sum())
+
+        wide = seg_counts.reindex(index=OSPH_ORDER, columns=top_values, fill_value=0).astype('int64')
+        wide.index = pd.Index(OSPH_ORDER, dtype=object)
+        wide.columns = pd.Index(top_values, dtype=object)
+        wide['TOTAL'] = seg_counts.sum(axis=1).reindex(OSPH_ORDER, fill_value=0).to_numpy()
+        # TOTAL SEMUA termasuk AppID dengan kategori plafon 'Tidak Tersedia'
+        wide.loc['TOTAL SEMUA'] = list(seg_counts.sum(axis=0).reindex(top_values, fill_value=0)) + [total_apps]
+
+        plot = wide.loc[OSPH_ORDER, top_values].stack()
+        plot = plot[plot > 0].rename('Jumlah').rename_axis(['Kategori Plafon', label]).reset_index()
+
+        pivots[segmen] = {
+            'total_apps': total_apps,
+            'total_records': int(records.get(segmen, 0)),
+            'pivot': wide.rename_axis('Kategori Plafon').reset_index(),
+            'plot': plot
+        }
+
+    return pivots
+
+def build_status_scoring_crosstab(cube):
+    """Tabel silang Status x Hasil Penilaian per AppID distinct, status = status terakhir AppID (dengan margin TOTAL)"""
+    counts = cube.groupby(['apps_status_clean', 'Scoring_Detail'], observed=True, sort=True)['apps'].sum()
+    cross_tab = counts[counts > 0].unstack('Scoring_Detail', fill_value=0)
+    cross_tab.index = pd.Index(list(cross_tab.index), dtype=object)
+    cross_tab.columns = pd.Index(list(cross_tab.columns), dtype=object)
+    cross_tab['TOTAL'] = cross_tab.sum(axis=1)
+    cross_tab.loc['TOTAL'] = cross_tab.sum(axis=0)
+    cross_tab.index.name = 'Status Aplikasi'
+    cross_tab.columns.name = 'Hasil Penilaian'
+    return cross_tab
+
+def build_od_approval(cube, od_col):
+    """Tingkat persetujuan (keputusan akhir) per kategori OD, AppID distinct di catatan terakhirnya (kategori kosong tidak ditampilkan)"""
+    category_col = OD_BINS[od_col][0]
+    od = cube.groupby(category_col, observed=True, sort=True)[['apps', 'approved']].sum()
+    od = od[od['apps'] > 0]
+    return pd.DataFrame({
+        'Kategori': od.index.astype(str),
+        'Total Aplikasi': od['apps'].to_numpy(),
+        'Disetujui': od['approved'].to_numpy(),
+        'Tingkat Persetujuan': [f"{a/t*100:.1f}%" for a, t in zip(od['approved'], od['apps'])]
+    })
+
+def _format_performance(perf):
+    """Kolom tampilan yang sama untuk tabel kinerja cabang & CA"""
+    return pd.DataFrame({
+        'Total AppID': perf['apps'].astype(int),
+        'Total Catatan': perf['records'].astype(int),
+        'Disetujui': perf['approved'].astype(int),
+        'Tingkat Persetujuan': (perf['approved'] / perf['apps'] * 100).map(lambda v: f"{v:.1f}%"),
+        'Waktu Proses Rata-rata': perf['sla_mean'].map(lambda h: convert_hours_to_hm(h) if pd.notna(h) else "-")
+    }, index=perf.index)
+
+def build_branch_performance(cube):
+    """Tabel kinerja seluruh cabang (Tab 4)"""
+    branch_perf = aggregate_performance(cube, 'branch_name_clean')
+    branch_perf = branch_perf[branch_perf.index != 'Tidak Diketahui']
+    
+    branch_df = _format_performance(branch_perf)
+    branch_df['Total Plafon'] = branch_perf['osph_sum'].map(lambda v: f"Rp {v:,.0f}")
+    branch_df = branch_df.rename_axis('Cabang').reset_index()
+    return branch_df.sort_values('Total AppID', ascending=False)
+
+def build_ca_performance(cube):
+    """Tabel kinerja seluruh Credit Analyst (Tab 4)"""
+    ca_perf = aggregate_performance(cube, 'user_name_clean', app_scope='_ca')
+    ca_perf = ca_perf[ca_perf.index != 'Tidak Diketahui']
+    
+    # Cabang utama CA = cabang dengan catatan terbanyak
+    main_branch = modal_value(cube, 'user_name_clean', 'branch_name_clean')
+    
+    ca_df = _format_performance(ca_perf)
+    ca_df.insert(0, 'Cabang', main_branch.reindex(ca_perf.index).fillna('Tidak Diketahui'))
+    ca_df = ca_df.rename_axis('Nama Credit Analyst').reset_index()
+    return ca_df.sort_values('Total AppID', ascending=False)
+
+def build_monthly_rollup(cube):
+    """
+    Rollup bulanan untuk tren Tab 1 (bulan dengan data SLA saja):
+    rata-rata SLA, AppID distinct per bulan, approval rate keputusan akhir per bulan keputusan.
+    """
+    monthly = cube.groupby('YearMonth', observed=True)[
+        ['sla_sum', 'sla_count', 'apps_month', 'apps', 'approved']
+    ].sum()
+    monthly = monthly[(monthly['sla_count'] > 0) & (monthly.index != 'NaT')]
+    
+    avg_hours = monthly['sla_sum'] / monthly['sla_count']
+    monthly_data = pd.DataFrame({
+        'Bulan': monthly.index.astype(str),
+        'Rata-rata Waktu (Jam)': avg_hours.to_numpy(),
+        'Jumlah Data': monthly['sla_count'].to_numpy(),
+        'Rata-rata Waktu (Teks)': avg_hours.map(convert_hours_to_hm).to_numpy(),
+        'Jumlah_Aplikasi': monthly['apps_month'].to_numpy(),
+        'Approval_Rate': (monthly['approved'] / monthly['apps'].replace(0, np.nan) * 100).round(1).to_numpy()
+    })
+    return monthly_data.sort_values('Bulan').reset_index(drop=True)
+
+def build_status_sla(df):
+    """
+    Statistik waktu proses per status aplikasi (Tab 1), status tanpa data SLA dilewati.
+    Dihitung dari baris (median tidak bisa di-roll-up dari cube).
+    """
+    stats = df.groupby('apps_status_clean', observed=True, sort=True)['SLA_Hours'].agg(
+        ['size', 'count', 'mean', 'median', 'min', 'max']
+    )
+    stats = stats[(stats.index != 'Tidak Diketahui') & (stats['count'] > 0)]
+    
+    return pd.DataFrame({
+        'Status Aplikasi': list(stats.index),
+        'Total Data': stats['size'].to_numpy(),
+        'Data Lengkap': stats['count'].to_numpy(),
+        'Cakupan': [f"{c/n*100:.1f}%" for c, n in zip(stats['count'], stats['size'])],
+        'Rata-rata': stats['mean'].map(convert_hours_to_hm).to_numpy(),
+        'Nilai Tengah': stats['median'].map(convert_hours_to_hm).to_numpy(),
+        'Tercepat': stats['min'].map(convert_hours_to_hm).to_numpy(),
+        'Terlama': stats['max'].map(convert_hours_to_hm).to_numpy()
+    })
+
+
+# ============================================================================
+# EXPORT
+# ============================================================================
+# Batas baris per sheet Excel (1.048.576 termasuk header)
+XLSX_MAX_ROWS = 1_048_575
+
+def iter_export_chunks(df, columns, chunk_rows=EXPORT_CHUNK_ROWS):
+    """Potongan baris df[columns], tanpa menyalin seluruh frame sekaligus"""
+    for start in range(0, len(df), chunk_rows):
+        yield df.iloc[start:start + chunk_rows][columns]
+
+def _read_back(out):
+    """Isi temporary file sebagai bytes untuk download_button (file ditutup oleh pemanggil)"""
+    out.seek(0)
+    return out.read()
+
+def export_csv(df, columns):
+    """CSV ditulis per potongan ke temporary file; return bytes untuk download_button"""
+    with tempfile.TemporaryFile() as out:
+        text = io.TextIOWrapper(out, encoding='utf-8', newline='')
+        header = True
+        for chunk in iter_export_chunks(df, columns):
+            chunk.to_csv(text, index=False, header=header)
+            header = False
+        if header:
+            pd.DataFrame(columns=columns).to_csv(text, index=False)
+        text.flush()
+        text.detach()
+        return _read_back(out)
+
+def _export_schema(df, columns):
+    """
+    Schema Arrow dari dtype seluruh frame, bukan potongan pertama (potongan yang kolom object-nya
+    kosong semua akan jadi tipe null). Kolom object bertipe campuran jadi string
+    (sama seperti _normalize_mixed_columns); return (schema, kolom campuran).
+    """
+    frame = df[columns]
+    schema = pa.Schema.from_pandas(frame.head(0), preserve_index=False)
+    mixed = []
+    for i, col in enumerate(columns):
+        if frame[col].dtype != object:
+            continue
+        values = frame[col].dropna()
+        if len(values) == 0:
+            continue
+        if values.map(type).nunique() > 1:
+            mixed.append(col)
+            field_type = pa.string()
+        else:
+            field_type = pa.array(values.iloc[:1]).type
+        schema = schema.set(i, schema.field(i).with_type(field_type))
+    return schema, mixed
+
+def export_parquet(df, columns):
+    """Parquet ke temporary file, satu row group per potongan; return bytes untuk download_button"""
+    schema, mixed = _export_schema(df, columns)
+    with tempfile.TemporaryFile() as out:
+        with pq.ParquetWriter(out, schema) as writer:
+            for chunk in iter_export_chunks(df, columns):
+                for col in mixed:
+                    chunk[col] = chunk[col].where(chunk[col].isna(), chunk[col].astype(str))
+                writer.write_table(pa.Table.from_pandas(chunk, schema=schema, preserve_index=False))
+        return _read_back(out)
+
+def _xlsx_rows(frame):
+    """Baris frame sebagai list nilai Python (NaN/NaT -> sel kosong)"""
+    values = frame.astype(object).where(frame.notna(), None)
+    for row in values.itertuples(index=False, name=None):
+        yield [v.to_pydatetime() if isinstance(v, pd.Timestamp) else v for v in row]
+
+def export_xlsx(df, columns, sheets):
+    """
+    XLSX multi-sheet (openpyxl write-only, baris di-stream ke disk); return bytes untuk download_button.
+    Sheet 'Data' berisi df[columns] per potongan, dilanjutkan ke 'Data 2', ... jika melebihi batas Excel.
+    sheets: {nama sheet: DataFrame kecil} ditambahkan setelah data.
+    """
+    from openpyxl import Workbook
+    
+    workbook = Workbook(write_only=True)
+    sheet, sheet_rows, sheet_no = None, 0, 0
+    for chunk in iter_export_chunks(df, columns):
+        for row in _xlsx_rows(chunk):
+            if sheet is None or sheet_rows >= XLSX_MAX_ROWS:
+                sheet_no += 1
+                sheet = workbook.create_sheet('Data' if sheet_no == 1 else f'Data {sheet_no}')
+                sheet.append(list(columns))
+                sheet_rows = 0
+            sheet.append(row)
+            sheet_rows += 1
+    if sheet is None:
+        workbook.create_sheet('Data').append(list(columns))
+    
+    for name, frame in sheets.items():
+        sheet = workbook.create_sheet(name)
+        sheet.append([str(c) for c in frame.columns])
+        for row in _xlsx_rows(frame):
+            sheet.append(row)
+    
+    with tempfile.TemporaryFile() as out:
+        workbook.save(out)
+        return _read_back(out)
+
+def build_export_summary(cube):
+    """Metrik utama untuk 'Ringkasan Statistik' (CSV & sheet XLSX)"""
+    scoring_apps = cube.groupby('Scoring_Detail', observed=True)['apps'].sum()
+    approve_count = scoring_apps[scoring_apps.index.isin(['APPROVE', 'APPROVE 1', 'APPROVE 2'])].sum()
+    total_scored = scoring_apps[scoring_apps.index != '(Semua)'].sum()
+    sla_count = int(cube['sla_count'].sum())
+    
+    return pd.DataFrame({
+        'Metrik': [
+            'Total Catatan',
+            'Total AppID',
+            'Data SLA Lengkap',
+            'Rata-rata Waktu Proses (jam)',
+            'Tingkat Persetujuan'
+        ],
+        'Nilai': [
+            f"{int(cube['records'].sum()):,}",
+            f"{int(cube['apps'].sum()):,}",
+            f"{sla_count:,}",
+            f"{cube['sla_sum'].sum() / sla_count:.2f}" if sla_count > 0 else "0",
+            f"{approve_count / total_scored * 100:.1f}%" if total_scored > 0 else "0%"
+        ]
+    })
+
+
+# ============================================================================
+# MAIN APPLICATION
+# ============================================================================
+
+def tab_is_open(tab):
+    """
+    True jika isi tab perlu dihitung (selalu True jika LAZY_TABS nonaktif).
+    tab.open dan st.tabs(on_change=...) butuh Streamlit >= 1.55 (lihat requirements.txt).
+    """
+    return not LAZY_TABS or bool(tab.open)
+
+def main():
+    """Main Streamlit application"""
+    
+    # BCA Finance Header - Simple Text Only
+    st.markdown("""
+    <div class="header-container">
+        <div style="text-align: center;">
+            <h1 style="margin: 0; font-size: 42px; letter-spacing: 1px; color: white !important;">Dashboard Analisis CA</h1>
+            <p style="color: #e3f2fd !important; margin-top: 12px; font-size: 17px;">BCA Finance - Monitoring & Evaluasi Kinerja Credit Analyst</p>
+        </div>
+    </div>
+    """, unsafe_allow_html=True)
+    
+    st.markdown("---")
+    
+    perf_run = start_perf_run()
+    
+    with st.spinner("Memuat data..."):
+        # Frame bersama antar session (read-only), lihat load_data
+        df = load_data()
+    
+    if df is None or df.empty:
+        st.error("Tidak dapat memuat data")
+        st.stop()
+    
+    # TOP METRICS
+    st.markdown("### Ringkasan Utama")
+    
+    total_records = len(df)
+    unique_apps = df['apps_id'].nunique()
+    sla_with_data = df['SLA_Hours'].notna().sum()
+    
+    col1, col2, col3, col4 = st.columns(4)
+    
+    with col1:
+        st.markdown('<div class="metric-box">', unsafe_allow_html=True)
+        st.metric("Total Data", f"{total_records:,}")
+        st.markdown('<p style="color: #90a4ae; font-size: 14px; margin-top: 5px;">Total semua transaksi dalam sistem</p>', unsafe_allow_html=True)
+        st.markdown('</div>', unsafe_allow_html=True)
+    
+    with col2:
+        st.markdown('<div class="metric-box-success">', unsafe_allow_html=True)
+        st.metric("Total AppID", f"{unique_apps:,}")
+        st.markdown('<p style="color: #90a4ae; font-size: 14px; margin-top: 5px;">Jumlah AppID Distinct</p>', unsafe_allow_html=True)
+        st.markdown('</div>', unsafe_allow_html=True)
+    
+    with col3:
+        st.markdown('<div class="metric-box-warning">', unsafe_allow_html=True)
+        sla_pct = f"{sla_with_data/total_records*100:.1f}%"
+        st.metric("Data SLA Lengkap", f"{sla_with_data:,}")
+        st.markdown(f'<p style="color: #90a4ae; font-size: 14px; margin-top: 5px;">Cakupan: {sla_pct} dari total data</p>', unsafe_allow_html=True)
+        st.markdown('</div>', unsafe_allow_html=True)
+    
+    with col4:
+        sla_valid = df[df['SLA_Hours'].notna()]
+        if len(sla_valid) > 0:
+            avg_hours = sla_valid['SLA_Hours'].mean()
+            avg_formatted = convert_hours_to_hm(avg_hours)
+            st.markdown('<div class="metric-box-danger">', unsafe_allow_html=True)
+            st.metric("Rata-rata Waktu Proses", avg_formatted)
+            st.markdown('<p style="color: #90a4ae; font-size: 14px; margin-top: 5px;">Per History</p>', unsafe_allow_html=True)
+            st.markdown('</div>', unsafe_allow_html=True)
     
     st.markdown("---")
     
@@ -1006,26 +2468,50 @@ def main():
     else:
         selected_branch = 'Semua Cabang'
     
-    # Apply filters
-    df_filtered = df.copy()
-    
-    if selected_status:
-        df_filtered = df_filtered[df_filtered['apps_status_clean'].isin(selected_status)]
-    
-    if selected_scoring:
-        df_filtered = df_filtered[df_filtered['Scoring_Detail'].isin(selected_scoring)]
-    
-    if selected_segmen != 'Semua Segmen':
-        df_filtered = df_filtered[df_filtered['Segmen_clean'] == selected_segmen]
+    # Apply filters (bitmap index, tanpa copy/scan seluruh frame)
+    dataset_version = df.attrs.get('dataset_version')
+    filter_index = get_filter_index(dataset_version, df)
+    selections = {
+        'apps_status_clean': selected_status,
+        'Scoring_Detail': selected_scoring,
+        'Segmen_clean': [selected_segmen] if selected_segmen != 'Semua Segmen' else [],
+        'branch_name_clean': [selected_branch] if selected_branch != 'Semua Cabang' else []
+    }
+    with perf_stage('filter', scope='rerun', rows_in=len(df)) as record:
+        filtered_positions = filter_index.select(selections)
+        df_filtered = df if filtered_positions is None else df.iloc[filtered_positions]
+        record['rows_out'] = len(df_filtered)
+    
+    # State filter ternormalisasi, dipakai sebagai key cache agregat
+    filter_key = (
+        tuple(sorted(selected_status)),
+        tuple(sorted(selected_scoring)),
+        selected_segmen,
+        selected_branch
+    )
     
-    if selected_branch != 'Semua Cabang':
-        df_filtered = df_filtered[df_filtered['branch_name_clean'] == selected_branch]
+    # Cube per keluarga tab (slice + roll-up) & fact table per AppID untuk state filter ini, sumber
+    # tabel & grafik per tab; keduanya baru dihitung saat tab yang memakainya dibuka
+    filtered_cube = functools.partial(get_filtered_cube, dataset_version, filter_key, selections, df, df_filtered)
+    status_options = all_status if 'apps_status_clean' in df.columns else ()
     
     st.sidebar.markdown("---")
     st.sidebar.markdown("### Hasil Filter")
     st.sidebar.success(f"**{len(df_filtered):,}** catatan ({len(df_filtered)/len(df)*100:.1f}%)")
     st.sidebar.info(f"**{df_filtered['apps_id'].nunique():,}** AppID")
     
+    # Jumlah baris per format tanggal, untuk memantau perubahan format di export baru
+    date_format_counts = df.attrs.get('date_format_counts', {})
+    if date_format_counts:
+        with st.sidebar.expander("Format Tanggal Sumber"):
+            for col, counts in date_format_counts.items():
+                st.markdown(f"**{col}**")
+                st.dataframe(
+                    pd.DataFrame(list(counts.items()), columns=['Format', 'Jumlah Baris']),
+                    use_container_width=True,
+                    hide_index=True
+                )
+    
     # TABS
     tab1, tab2, tab3, tab4, tab5, tab6, tab7, tab8 = st.tabs([
         " Waktu Proses",
@@ -1036,1305 +2522,794 @@ def main():
         " Dampak Keterlambatan",
         " Insights",
         " Unduh Data"
-    ])
+    ], key="main_tab", on_change="rerun" if LAZY_TABS else "ignore")
 
     # ====== TAB 1: SLA ANALYSIS ======
-    with tab1:
-        st.markdown("## Analisis Waktu Proses Aplikasi")
-        
-        st.markdown("""
-        <div class="info-box">
-        <h4>Penjelasan Waktu Proses (SLA)</h4>
-        <p><strong>SLA (Service Level Agreement)</strong> adalah target waktu yang ditetapkan untuk menyelesaikan proses kredit.</p>
-        <ul>
-            <li><strong>Perhitungan</strong>: Historical berdasarkan waktu recommendation hingga action</li>
-            <li><strong>Jam Kerja</strong>: 08:30 - 15:30 (tidak termasuk weekend & libur nasional)</li>
-        </ul>
-        </div>
-        """, unsafe_allow_html=True)
-        
-        # Overall SLA stats
-        sla_valid = df_filtered[df_filtered['SLA_Hours'].notna()]
-        
-        st.markdown("### Statistik Waktu Proses ")
-        st.caption("*Perhitungan berdasarkan jam kerja 08:30 - 15:30, exclude weekend dan hari libur*")
-        
-        col1, col2, col3, col4 = st.columns(4)
-        
-        with col1:
-            if len(sla_valid) > 0:
-                avg_hours = sla_valid['SLA_Hours'].mean()
-                avg_formatted = convert_hours_to_hm(avg_hours)
-                st.markdown('<div class="metric-box" style="text-align: center;">', unsafe_allow_html=True)
-                st.markdown(f'<h3 style="color: #003d7a; margin-bottom: 10px;">Rata-rata</h3>', unsafe_allow_html=True)
-                st.markdown(f'<h2 style="color: #0066b3; margin: 0;">{avg_formatted}</h2>', unsafe_allow_html=True)
-                st.markdown('</div>', unsafe_allow_html=True)
-        
-        with col2:
-            if len(sla_valid) > 0:
-                median_hours = sla_valid['SLA_Hours'].median()
-                median_formatted = convert_hours_to_hm(median_hours)
-                st.markdown('<div class="metric-box-success" style="text-align: center;">', unsafe_allow_html=True)
-                st.markdown(f'<h3 style="color: #003d7a; margin-bottom: 10px;">Nilai Tengah</h3>', unsafe_allow_html=True)
-                st.markdown(f'<h2 style="color: #1e88e5; margin: 0;">{median_formatted}</h2>', unsafe_allow_html=True)
-                st.markdown('<p style="color: #90a4ae; font-size: 14px; margin-top: 5px;">50% data di bawah nilai ini</p>', unsafe_allow_html=True)
-                st.markdown('</div>', unsafe_allow_html=True)
-        
-        with col3:
-            if len(sla_valid) > 0:
-                min_hours = sla_valid['SLA_Hours'].min()
-                min_formatted = convert_hours_to_hm(min_hours)
-                st.markdown('<div class="metric-box-success" style="text-align: center;">', unsafe_allow_html=True)
-                st.markdown(f'<h3 style="color: #003d7a; margin-bottom: 10px;">Tercepat</h3>', unsafe_allow_html=True)
-                st.markdown(f'<h2 style="color: #1e88e5; margin: 0;">{min_formatted}</h2>', unsafe_allow_html=True)
-                st.markdown('</div>', unsafe_allow_html=True)
-        
-        with col4:
-            if len(sla_valid) > 0:
-                max_hours = sla_valid['SLA_Hours'].max()
-                max_formatted = convert_hours_to_hm(max_hours)
-                st.markdown('<div class="metric-box-danger" style="text-align: center;">', unsafe_allow_html=True)
-                st.markdown(f'<h3 style="color: #003d7a; margin-bottom: 10px;">Terlama</h3>', unsafe_allow_html=True)
-                st.markdown(f'<h2 style="color: #f44336; margin: 0;">{max_formatted}</h2>', unsafe_allow_html=True)
-                st.markdown('</div>', unsafe_allow_html=True)
-        
-        st.markdown("---")
-        
-        # SLA TREND
-        st.markdown("### Tren Waktu Proses Bulanan")
-        st.caption("*Grafik menunjukkan rata-rata waktu proses per bulan dengan detail jam dan menit*")
+    with tab1, tab_stage(tab1, "Waktu Proses", rows_in=len(df_filtered)):
+        if tab_is_open(tab1):
+            st.markdown("## Analisis Waktu Proses Aplikasi")
 
-        render_sla_trend_chart(sla_valid, df_filtered)
-        
-        st.markdown("---")
-        
-        # SLA by Status
-        st.markdown("### Waktu Proses Berdasarkan Status Aplikasi")
-        st.caption("*Tabel menunjukkan perbandingan waktu proses untuk setiap status aplikasi*")
-        
-        if 'apps_status_clean' in df_filtered.columns:
-            status_sla = []
-            
-            for status in sorted(df_filtered['apps_status_clean'].unique()):
-                if status == 'Tidak Diketahui':
-                    continue
-                
-                df_status = df_filtered[df_filtered['apps_status_clean'] == status]
-                sla_status = df_status[df_status['SLA_Hours'].notna()]
-                
-                if len(sla_status) > 0:
-                    avg_sla = sla_status['SLA_Hours'].mean()
-                    median_sla = sla_status['SLA_Hours'].median()
-                    max_sla = sla_status['SLA_Hours'].max()
-                    min_sla = sla_status['SLA_Hours'].min()
-                    
-                    status_sla.append({
-                        'Status Aplikasi': status,
-                        'Total Data': len(df_status),
-                        'Data Lengkap': len(sla_status),
-                        'Cakupan': f"{len(sla_status)/len(df_status)*100:.1f}%",
-                        'Rata-rata': convert_hours_to_hm(avg_sla),
-                        'Nilai Tengah': convert_hours_to_hm(median_sla),
-                        'Tercepat': convert_hours_to_hm(min_sla),
-                        'Terlama': convert_hours_to_hm(max_sla),
-                    })
-            
-            if status_sla:
-                status_sla_df = pd.DataFrame(status_sla)
-                st.dataframe(status_sla_df, use_container_width=True, hide_index=True, height=400)
-    
-    # ====== TAB 2: DETAIL RAW DATA ======
-    with tab2:
-        st.markdown("## Data Detail AppID")
-        
-        st.markdown("""
-        <div class="info-box">
-        <h4>Cara Menggunakan</h4>
-        <p>Tab ini menampilkan daftar lengkap semua AppID yang ada dalam sistem.</p>
-        <ul>
-            <li>Lihat ringkasan semua aplikasi dalam tabel di bawah</li>
-            <li>Gunakan kolom pencarian untuk menemukan aplikasi tertentu berdasarkan ID</li>
-            <li>Klik untuk melihat detail lengkap setiap aplikasi</li>
-        </ul>
-        </div>
-        """, unsafe_allow_html=True)
-        
-        # Get all unique apps with their summary info
-        apps_summary = []
-        
-        for app_id in sorted(df_filtered['apps_id'].unique()):
-            app_data = df_filtered[df_filtered['apps_id'] == app_id]
-            latest_record = app_data.sort_values('action_on_parsed', ascending=False).iloc[0]
-            
-            apps_summary.append({
-                'AppID': app_id,
-                'Jumlah Catatan': len(app_data),
-                'Status Terakhir': latest_record.get('apps_status_clean', 'N/A'),
-                'Aksi Terakhir': latest_record.get('action_on_parsed', pd.NaT),
-                'Segmen': latest_record.get('Segmen_clean', 'N/A'),
-                'Kategori Plafon': latest_record.get('OSPH_Category', 'N/A'),
-                'Cabang': latest_record.get('branch_name_clean', 'N/A'),
-                'Credit Analyst': latest_record.get('user_name_clean', 'N/A')  # CA TERAKHIR dari history
-            })
-        
-        apps_df = pd.DataFrame(apps_summary)
-        apps_df = apps_df.sort_values('Aksi Terakhir', ascending=False)
-        
-        col1, col2 = st.columns(2)
-        with col1:
-            st.markdown(f"""
-            <div class="metric-box-success" style="text-align: center; padding: 25px;">
-            <h3 style="color: #003d7a; margin-bottom: 10px;">Total No Kontrak</h3>
-            <h1 style="color: #1e88e5; margin: 10px 0; font-size: 48px;">{len(apps_df):,}</h1>
-            <p style="color: #90a4ae; font-size: 14px;">Jumlah AppID</p>
+            st.markdown("""
+            <div class="info-box">
+            <h4>Penjelasan Waktu Proses (SLA)</h4>
+            <p><strong>SLA (Service Level Agreement)</strong> adalah target waktu yang ditetapkan untuk menyelesaikan proses kredit.</p>
+            <ul>
+                <li><strong>Perhitungan</strong>: Historical berdasarkan waktu recommendation hingga action</li>
+                <li><strong>Jam Kerja</strong>: 08:30 - 15:30 (tidak termasuk weekend & libur nasional)</li>
+            </ul>
             </div>
             """, unsafe_allow_html=True)
-        
-        with col2:
-            total_catatan = apps_df['Jumlah Catatan'].sum()
-            st.markdown(f"""
-            <div class="metric-box" style="text-align: center; padding: 25px;">
-            <h3 style="color: #003d7a; margin-bottom: 10px;">Total Catatan</h3>
-            <h1 style="color: #0066b3; margin: 10px 0; font-size: 48px;">{total_catatan:,}</h1>
-            <p style="color: #90a4ae; font-size: 14px;">Total transaksi dalam sistem</p>
+
+            # Overall SLA stats
+            sla_valid = df_filtered[df_filtered['SLA_Hours'].notna()]
+
+            st.markdown("### Statistik Waktu Proses ")
+            st.caption("*Perhitungan berdasarkan jam kerja 08:30 - 15:30, exclude weekend dan hari libur*")
+
+            col1, col2, col3, col4 = st.columns(4)
+
+            with col1:
+                if len(sla_valid) > 0:
+                    avg_hours = sla_valid['SLA_Hours'].mean()
+                    avg_formatted = convert_hours_to_hm(avg_hours)
+                    st.markdown('<div class="metric-box" style="text-align: center;">', unsafe_allow_html=True)
+                    st.markdown(f'<h3 style="color: #003d7a; margin-bottom: 10px;">Rata-rata</h3>', unsafe_allow_html=True)
+                    st.markdown(f'<h2 style="color: #0066b3; margin: 0;">{avg_formatted}</h2>', unsafe_allow_html=True)
+                    st.markdown('</div>', unsafe_allow_html=True)
+
+            with col2:
+                if len(sla_valid) > 0:
+                    median_hours = sla_valid['SLA_Hours'].median()
+                    median_formatted = convert_hours_to_hm(median_hours)
+                    st.markdown('<div class="metric-box-success" style="text-align: center;">', unsafe_allow_html=True)
+                    st.markdown(f'<h3 style="color: #003d7a; margin-bottom: 10px;">Nilai Tengah</h3>', unsafe_allow_html=True)
+                    st.markdown(f'<h2 style="color: #1e88e5; margin: 0;">{median_formatted}</h2>', unsafe_allow_html=True)
+                    st.markdown('<p style="color: #90a4ae; font-size: 14px; margin-top: 5px;">50% data di bawah nilai ini</p>', unsafe_allow_html=True)
+                    st.markdown('</div>', unsafe_allow_html=True)
+
+            with col3:
+                if len(sla_valid) > 0:
+                    min_hours = sla_valid['SLA_Hours'].min()
+                    min_formatted = convert_hours_to_hm(min_hours)
+                    st.markdown('<div class="metric-box-success" style="text-align: center;">', unsafe_allow_html=True)
+                    st.markdown(f'<h3 style="color: #003d7a; margin-bottom: 10px;">Tercepat</h3>', unsafe_allow_html=True)
+                    st.markdown(f'<h2 style="color: #1e88e5; margin: 0;">{min_formatted}</h2>', unsafe_allow_html=True)
+                    st.markdown('</div>', unsafe_allow_html=True)
+
+            with col4:
+                if len(sla_valid) > 0:
+                    max_hours = sla_valid['SLA_Hours'].max()
+                    max_formatted = convert_hours_to_hm(max_hours)
+                    st.markdown('<div class="metric-box-danger" style="text-align: center;">', unsafe_allow_html=True)
+                    st.markdown(f'<h3 style="color: #003d7a; margin-bottom: 10px;">Terlama</h3>', unsafe_allow_html=True)
+                    st.markdown(f'<h2 style="color: #f44336; margin: 0;">{max_formatted}</h2>', unsafe_allow_html=True)
+                    st.markdown('</div>', unsafe_allow_html=True)
+
+            st.markdown("---")
+
+            # SLA TREND
+            st.markdown("### Tren Waktu Proses Bulanan")
+            st.caption("*Grafik menunjukkan rata-rata waktu proses per bulan dengan detail jam dan menit*")
+
+            monthly_data = cached_aggregate(dataset_version, filter_key, build_monthly_rollup, filtered_cube('monthly'))
+            render_sla_trend_chart(monthly_data)
+
+            st.markdown("---")
+
+            # SLA by Status
+            st.markdown("### Waktu Proses Berdasarkan Status Aplikasi")
+            st.caption("*Tabel menunjukkan perbandingan waktu proses untuk setiap status aplikasi*")
+
+            if 'apps_status_clean' in df_filtered.columns:
+                status_sla_df = cached_aggregate(dataset_version, filter_key, build_status_sla, df_filtered)
+
+                if len(status_sla_df) > 0:
+                    st.dataframe(status_sla_df, use_container_width=True, hide_index=True, height=400)
+
+    # ====== TAB 2: DETAIL RAW DATA ======
+    with tab2, tab_stage(tab2, "Data Detail", rows_in=len(df_filtered)):
+        if tab_is_open(tab2):
+            st.markdown("## Data Detail AppID")
+
+            st.markdown("""
+            <div class="info-box">
+            <h4>Cara Menggunakan</h4>
+            <p>Tab ini menampilkan daftar lengkap semua AppID yang ada dalam sistem.</p>
+            <ul>
+                <li>Lihat ringkasan semua aplikasi dalam tabel di bawah</li>
+                <li>Gunakan kolom pencarian untuk menemukan aplikasi tertentu berdasarkan ID</li>
+                <li>Klik untuk melihat detail lengkap setiap aplikasi</li>
+            </ul>
             </div>
             """, unsafe_allow_html=True)
-        
-        st.markdown("---")
-        st.markdown("### Daftar Semua Aplikasi")
-        
-        # Display all apps in a table
-        st.dataframe(
-            apps_df.style.format({'Aksi Terakhir': lambda x: x.strftime('%d-%m-%Y %H:%M') if pd.notna(x) else 'N/A'}),
-            use_container_width=True,
-            hide_index=True,
-            height=400
-        )
-        
-        st.markdown("---")
-        
-        # Search and detail view
-        st.markdown("### Cari Detail Aplikasi")
-        
-        col_search, col_empty = st.columns([2, 2])
-        
-        with col_search:
-            search_input = st.text_input(
-                "Masukkan AppID:", 
-                placeholder="Contoh: 5259031",
-                help="Ketik AppID untuk melihat detail lengkap"
-            )
-        
-        if search_input:
-            try:
-                search_id = int(search_input)
-                app_records = df[df['apps_id'] == search_id].sort_values('action_on_parsed')
-                
-                if len(app_records) > 0:
-                    st.success(f"Ditemukan **{len(app_records)}** catatan untuk AppID: **{search_id}**")
-                    
-                    # Summary
-                    st.markdown("#### Ringkasan Aplikasi")
-                    col1, col2, col3, col4 = st.columns(4)
-                    
-                    with col1:
-                        segmen = app_records['Segmen_clean'].iloc[0] if 'Segmen_clean' in app_records.columns else 'N/A'
-                        st.markdown(f"""
-                        <div class="metric-box" style="text-align: center; padding: 20px;">
-                        <h4 style="color: #003d7a; margin-bottom: 10px;">Segmen</h4>
-                        <h3 style="color: #0066b3; margin: 0;">{segmen}</h3>
-                        </div>
-                        """, unsafe_allow_html=True)
-                    
-                    with col2:
-                        osph = app_records['OSPH_Category'].iloc[0] if 'OSPH_Category' in app_records.columns else 'N/A'
-                        st.markdown(f"""
-                        <div class="metric-box-warning" style="text-align: center; padding: 20px;">
-                        <h4 style="color: #003d7a; margin-bottom: 10px;">Plafon</h4>
-                        <h3 style="color: #d4af37; margin: 0;">{osph}</h3>
-                        </div>
-                        """, unsafe_allow_html=True)
-                    
-                    with col3:
-                        branch = app_records['branch_name_clean'].iloc[0] if 'branch_name_clean' in app_records.columns else 'N/A'
-                        st.markdown(f"""
-                        <div class="metric-box-success" style="text-align: center; padding: 20px;">
-                        <h4 style="color: #003d7a; margin-bottom: 10px;">Cabang</h4>
-                        <h3 style="color: #1e88e5; margin: 0;">{branch}</h3>
-                        </div>
-                        """, unsafe_allow_html=True)
-                    
-                    with col4:
-                        ca = app_records['user_name_clean'].iloc[-1] if 'user_name_clean' in app_records.columns else 'N/A'
-                        st.markdown(f"""
-                        <div class="metric-box" style="text-align: center; padding: 20px;">
-                        <h4 style="color: #003d7a; margin-bottom: 10px;">CA</h4>
-                        <h3 style="color: #0066b3; margin: 0;">{ca}</h3>
-                        </div>
-                        """, unsafe_allow_html=True)
-                    
-                    st.markdown("---")
-                    
-                    # Display ALL records
-                    st.markdown("#### Riwayat Lengkap Aplikasi")
-                    
-                    display_cols = [
-                        'apps_status_clean', 'action_on_parsed', 'Recommendation_parsed',
-                        'SLA_Hours', 'SLA_Formatted',
-                        'Scoring_Detail', 'OSPH_clean', 'LastOD_clean',
-                        'user_name_clean', 'Pekerjaan_clean', 'JenisKendaraan_clean'
-                    ]
-                    
-                    col_rename = {
-                        'apps_status_clean': 'Status',
-                        'action_on_parsed': 'Waktu Aksi',
-                        'Recommendation_parsed': 'Waktu Rekomendasi',
-                        'SLA_Hours': 'SLA (Jam)',
-                        'SLA_Formatted': 'SLA',
-                        'Scoring_Detail': 'Hasil Penilaian',
-                        'OSPH_clean': 'Plafon (Rp)',
-                        'LastOD_clean': 'Tunggakan Terakhir (Hari)',
-                        'user_name_clean': 'Credit Analyst',
-                        'Pekerjaan_clean': 'Pekerjaan',
-                        'JenisKendaraan_clean': 'Jenis Kendaraan'
-                    }
-                    
-                    available_cols = [c for c in display_cols if c in app_records.columns]
-                    display_df = app_records[available_cols].rename(columns=col_rename)
-                    
-                    st.dataframe(display_df.reset_index(drop=True), use_container_width=True, height=400)
-                    
-                else:
-                    st.warning(f"Tidak ditemukan data untuk AppID: {search_id}")
-            
-            except ValueError:
-                st.error("Mohon masukkan AppID yang valid (angka)")
-    
-    # ====== TAB 3: OSPH ANALYSIS ======
-    with tab3:
-        st.markdown("## Analisis Plafon Kredit (OSPH)")
-        
-        st.markdown("""
-        <div class="info-box">
-        <h4>Penjelasan Analisis</h4>
-        <p><strong>OSPH (Outstanding Plafon Hutang)</strong> adalah total plafon kredit yang tersedia untuk nasabah.</p>
-        <p>Analisis ini mengelompokkan aplikasi berdasarkan:</p>
-        <ul>
-            <li><strong>Kategori Plafon</strong>: 0-250 Juta, 250-500 Juta, dan >500 Juta</li>
-            <li><strong>Dimensi Analisis</strong>: Pekerjaan, Status Aplikasi, Jenis Kendaraan, dan Hasil Scoring</li>
-        </ul>
-        <p><strong>Catatan:</strong> Perhitungan Berdasarkan Total AppID</p>
-        </div>
-        """, unsafe_allow_html=True)
-        
-        st.markdown("---")
-        
-        # Define OSPH ranges order
-        osph_order = ['0 - 250 Juta', '250 - 500 Juta', 'Lebih dari 500 Juta']
-        
-        # Create subtabs for different analyses
-        subtab1, subtab2, subtab3, subtab4 = st.tabs([
-            " Berdasarkan Pekerjaan",
-            " Berdasarkan Status",
-            " Berdasarkan Jenis Kendaraan",
-            " Berdasarkan Hasil Scoring"
-        ])
-        
-        # SUBTAB 1: BY PEKERJAAN
-        with subtab1:
-            st.markdown("### Analisis Plafon Berdasarkan Pekerjaan")
-            
-            # Get top pekerjaan
-            top_pekerjaan = df_filtered.drop_duplicates('apps_id')['Pekerjaan_clean'].value_counts().head(10).index.tolist()
-            
-            # Create pivot tables for each segment
-            for idx, segmen in enumerate(['-', 'KKB', 'CS NEW', 'CS USED']):
-                # Color coding for different segments
-                if idx == 0:
-                    header_color = "metric-box"
-                elif idx == 1:
-                    header_color = "metric-box-success"
-                elif idx == 2:
-                    header_color = "metric-box-warning"
-                else:
-                    header_color = "metric-box-danger"
-                
-                st.markdown(f"""
-                <div class="{header_color}">
-                <h3>Segmen: {segmen if segmen != '-' else 'DS'}</h3>
-                </div>
-                """, unsafe_allow_html=True)
-                
-                df_segmen = df_filtered[df_filtered['Segmen_clean'] == segmen].drop_duplicates('apps_id')
-                
-                total_apps = len(df_segmen)
-                total_records = len(df_filtered[df_filtered['Segmen_clean'] == segmen])
-                
-                col1, col2 = st.columns(2)
-                with col1:
-                    st.metric("Total AppID", f"{total_apps:,}")
-                with col2:
-                    st.metric("Total Catatan", f"{total_records:,}")
-                
-                if len(df_segmen) > 0:
-                    # Create pivot: OSPH Range x Pekerjaan
-                    pivot_data = []
-                    
-                    for osph_range in osph_order:
-                        df_osph = df_segmen[df_segmen['OSPH_Category'] == osph_range]
-                        
-                        row = {'Kategori Plafon': osph_range}
-                        
-                        for pekerjaan in top_pekerjaan:
-                            count = len(df_osph[df_osph['Pekerjaan_clean'] == pekerjaan])
-                            row[pekerjaan] = count if count > 0 else 0
-                        
-                        # Add total
-                        row['TOTAL'] = len(df_osph)
-                        
-                        pivot_data.append(row)
-                    
-                    # Add TOTAL row
-                    total_row = {'Kategori Plafon': 'TOTAL SEMUA'}
-                    for pekerjaan in top_pekerjaan:
-                        count = len(df_segmen[df_segmen['Pekerjaan_clean'] == pekerjaan])
-                        total_row[pekerjaan] = count if count > 0 else 0
-                    total_row['TOTAL'] = len(df_segmen)
-                    pivot_data.append(total_row)
-                    
-                    pivot_df = pd.DataFrame(pivot_data)
-                    
-                    st.dataframe(pivot_df, use_container_width=True, hide_index=True, height=300)
-                    
-                    # Visualization
-                    pivot_plot = pivot_df[pivot_df['Kategori Plafon'] != 'TOTAL SEMUA'].copy()
-                    
-                    if len(pivot_plot) > 0:
-                        plot_data = []
-                        for _, row in pivot_plot.iterrows():
-                            osph = row['Kategori Plafon']
-                            for col in pivot_plot.columns:
-                                if col not in ['Kategori Plafon', 'TOTAL'] and row[col] > 0:
-                                    plot_data.append({
-                                        'Kategori Plafon': osph,
-                                        'Pekerjaan': col,
-                                        'Jumlah': row[col]
-                                    })
-                        
-                        if plot_data:
-                            plot_df = pd.DataFrame(plot_data)
-                            fig = px.bar(
-                                plot_df,
-                                x='Kategori Plafon',
-                                y='Jumlah',
-                                color='Pekerjaan',
-                                title=f"Distribusi Plafon untuk Segmen {segmen if segmen != '-' else 'DS'}",
-                                barmode='group',
-                                color_discrete_sequence=px.colors.qualitative.Set3,
-                                text='Jumlah'
-                            )
-                            fig.update_traces(textposition='outside', textfont_size=11)
-                            fig.update_layout(
-                                height=400,
-                                plot_bgcolor='#ffffff',
-                                paper_bgcolor='#ffffff',
-                                font=dict(family='Arial', size=12, color='#1e2129')
-                            )
-                            st.plotly_chart(fig, use_container_width=True)
-                else:
-                    st.info(f"Tidak ada data untuk Segmen {segmen}")
-                
-                st.markdown("---")
-        
-        # SUBTAB 2: BY STATUS
-        with subtab2:
-            st.markdown("### Analisis Plafon Berdasarkan Status Aplikasi")
-            
-            # Get top status
-            top_status = df_filtered.drop_duplicates('apps_id')['apps_status_clean'].value_counts().head(10).index.tolist()
-            
-            # Create pivot tables for each segment
-            for idx, segmen in enumerate(['-', 'KKB', 'CS NEW', 'CS USED']):
-                if idx == 0:
-                    header_color = "metric-box"
-                elif idx == 1:
-                    header_color = "metric-box-success"
-                elif idx == 2:
-                    header_color = "metric-box-warning"
-                else:
-                    header_color = "metric-box-danger"
-                
-                st.markdown(f"""
-                <div class="{header_color}">
-                <h3>Segmen: {segmen if segmen != '-' else 'DS'}</h3>
-                </div>
-                """, unsafe_allow_html=True)
-                
-                df_segmen = df_filtered[df_filtered['Segmen_clean'] == segmen].drop_duplicates('apps_id')
-                
-                total_apps = len(df_segmen)
-                total_records = len(df_filtered[df_filtered['Segmen_clean'] == segmen])
-                
-                col1, col2 = st.columns(2)
-                with col1:
-                    st.metric("Total AppID", f"{total_apps:,}")
-                with col2:
-                    st.metric("Total Catatan", f"{total_records:,}")
-                
-                if len(df_segmen) > 0:
-                    # Create pivot: OSPH Range x Status
-                    pivot_data = []
-                    
-                    for osph_range in osph_order:
-                        df_osph = df_segmen[df_segmen['OSPH_Category'] == osph_range]
-                        
-                        row = {'Kategori Plafon': osph_range}
-                        
-                        for status in top_status:
-                            count = len(df_osph[df_osph['apps_status_clean'] == status])
-                            row[status] = count if count > 0 else 0
-                        
-                        row['TOTAL'] = len(df_osph)
-                        
-                        pivot_data.append(row)
-                    
-                    # Add TOTAL row
-                    total_row = {'Kategori Plafon': 'TOTAL SEMUA'}
-                    for status in top_status:
-                        count = len(df_segmen[df_segmen['apps_status_clean'] == status])
-                        total_row[status] = count if count > 0 else 0
-                    total_row['TOTAL'] = len(df_segmen)
-                    pivot_data.append(total_row)
-                    
-                    pivot_df = pd.DataFrame(pivot_data)
-                    
-                    st.dataframe(pivot_df, use_container_width=True, hide_index=True, height=300)
-                    
-                    # Visualization
-                    pivot_plot = pivot_df[pivot_df['Kategori Plafon'] != 'TOTAL SEMUA'].copy()
-                    
-                    if len(pivot_plot) > 0:
-                        plot_data = []
-                        for _, row in pivot_plot.iterrows():
-                            osph = row['Kategori Plafon']
-                            for col in pivot_plot.columns:
-                                if col not in ['Kategori Plafon', 'TOTAL'] and row[col] > 0:
-                                    plot_data.append({
-                                        'Kategori Plafon': osph,
-                                        'Status': col,
-                                        'Jumlah': row[col]
-                                    })
-                        
-                        if plot_data:
-                            plot_df = pd.DataFrame(plot_data)
-                            fig = px.bar(
-                                plot_df,
-                                x='Kategori Plafon',
-                                y='Jumlah',
-                                color='Status',
-                                title=f"Distribusi Plafon untuk Segmen {segmen if segmen != '-' else 'DS'}",
-                                barmode='group',
-                                color_discrete_sequence=px.colors.qualitative.Pastel,
-                                text='Jumlah'
-                            )
-                            fig.update_traces(textposition='outside', textfont_size=11)
-                            fig.update_layout(
-                                height=400,
-                                plot_bgcolor='#ffffff',
-                                paper_bgcolor='#ffffff',
-                                font=dict(family='Arial', size=12, color='#1e2129')
-                            )
-                            st.plotly_chart(fig, use_container_width=True)
-                else:
-                    st.info(f"Tidak ada data untuk Segmen {segmen}")
-                
-                st.markdown("---")
-        
-        # SUBTAB 3: BY JENIS KENDARAAN
-        with subtab3:
-            st.markdown("### Analisis Plafon Berdasarkan Jenis Kendaraan")
-            
-            # Get top jenis kendaraan
-            top_kendaraan = df_filtered.drop_duplicates('apps_id')['JenisKendaraan_clean'].value_counts().head(10).index.tolist()
-            
-            # Create pivot tables for each segment
-            for idx, segmen in enumerate(['-', 'KKB', 'CS NEW', 'CS USED']):
-                if idx == 0:
-                    header_color = "metric-box"
-                elif idx == 1:
-                    header_color = "metric-box-success"
-                elif idx == 2:
-                    header_color = "metric-box-warning"
-                else:
-                    header_color = "metric-box-danger"
-                
+
+            # Get all unique apps with their summary info
+            facts = get_filtered_facts(dataset_version, filter_key, selections, df, df_filtered, status_options)
+            apps_df = cached_aggregate(dataset_version, filter_key, build_apps_summary, facts)
+            apps_df = apps_df.sort_values('Aksi Terakhir', ascending=False)
+
+            col1, col2 = st.columns(2)
+            with col1:
                 st.markdown(f"""
-                <div class="{header_color}">
-                <h3>Segmen: {segmen if segmen != '-' else 'DS'}</h3>
+                <div class="metric-box-success" style="text-align: center; padding: 25px;">
+                <h3 style="color: #003d7a; margin-bottom: 10px;">Total No Kontrak</h3>
+                <h1 style="color: #1e88e5; margin: 10px 0; font-size: 48px;">{len(apps_df):,}</h1>
+                <p style="color: #90a4ae; font-size: 14px;">Jumlah AppID</p>
                 </div>
                 """, unsafe_allow_html=True)
-                
-                df_segmen = df_filtered[df_filtered['Segmen_clean'] == segmen].drop_duplicates('apps_id')
-                
-                total_apps = len(df_segmen)
-                total_records = len(df_filtered[df_filtered['Segmen_clean'] == segmen])
-                
-                col1, col2 = st.columns(2)
-                with col1:
-                    st.metric("Total AppID", f"{total_apps:,}")
-                with col2:
-                    st.metric("Total Catatan", f"{total_records:,}")
-                
-                if len(df_segmen) > 0:
-                    # Create pivot: OSPH Range x Jenis Kendaraan
-                    pivot_data = []
-                    
-                    for osph_range in osph_order:
-                        df_osph = df_segmen[df_segmen['OSPH_Category'] == osph_range]
-                        
-                        row = {'Kategori Plafon': osph_range}
-                        
-                        for kendaraan in top_kendaraan:
-                            count = len(df_osph[df_osph['JenisKendaraan_clean'] == kendaraan])
-                            row[kendaraan] = count if count > 0 else 0
-                        
-                        row['TOTAL'] = len(df_osph)
-                        
-                        pivot_data.append(row)
-                    
-                    # Add TOTAL row
-                    total_row = {'Kategori Plafon': 'TOTAL SEMUA'}
-                    for kendaraan in top_kendaraan:
-                        count = len(df_segmen[df_segmen['JenisKendaraan_clean'] == kendaraan])
-                        total_row[kendaraan] = count if count > 0 else 0
-                    total_row['TOTAL'] = len(df_segmen)
-                    pivot_data.append(total_row)
-                    
-                    pivot_df = pd.DataFrame(pivot_data)
-                    
-                    st.dataframe(pivot_df, use_container_width=True, hide_index=True, height=300)
-                    
-                    # Visualization
-                    pivot_plot = pivot_df[pivot_df['Kategori Plafon'] != 'TOTAL SEMUA'].copy()
-                    
-                    if len(pivot_plot) > 0:
-                        plot_data = []
-                        for _, row in pivot_plot.iterrows():
-                            osph = row['Kategori Plafon']
-                            for col in pivot_plot.columns:
-                                if col not in ['Kategori Plafon', 'TOTAL'] and row[col] > 0:
-                                    plot_data.append({
-                                        'Kategori Plafon': osph,
-                                        'Jenis Kendaraan': col,
-                                        'Jumlah': row[col]
-                                    })
-                        
-                        if plot_data:
-                            plot_df = pd.DataFrame(plot_data)
-                            fig = px.bar(
-                                plot_df,
-                                x='Kategori Plafon',
-                                y='Jumlah',
-                                color='Jenis Kendaraan',
-                                title=f"Distribusi Plafon untuk Segmen {segmen if segmen != '-' else 'DS'}",
-                                barmode='group',
-                                color_discrete_sequence=px.colors.qualitative.Safe,
-                                text='Jumlah'
-                            )
-                            fig.update_traces(textposition='outside', textfont_size=11)
-                            fig.update_layout(
-                                height=450,
-                                plot_bgcolor='#ffffff',
-                                paper_bgcolor='#ffffff',
-                                showlegend=True,
-                                font=dict(family='Arial', size=13, color='#1e2129'),
-                                title_font_size=16,
-                                title_font_color='#ffffff',
-                                xaxis=dict(
-                                    showgrid=False,
-                                    title_font_size=14,
-                                    tickangle=-45
-                                ),
-                                yaxis=dict(
-                                    showgrid=True,
-                                    gridcolor='#2d3139',
-                                    title_font_size=14
-                                )
-                            )
-                            st.plotly_chart(fig, use_container_width=True)
-                else:
-                    st.info(f"Tidak ada data untuk Segmen {segmen}")
-                
-                st.markdown("---")
-        
-        # SUBTAB 4: BY HASIL SCORING (NEW)
-        with subtab4:
-            st.markdown("### Analisis Plafon Berdasarkan Hasil Scoring")
-            
-            # Get top scoring results
-            top_scoring = df_filtered.drop_duplicates('apps_id')['Scoring_Detail'].value_counts().head(10).index.tolist()
-            
-            # Create pivot tables for each segment
-            for idx, segmen in enumerate(['-', 'KKB', 'CS NEW', 'CS USED']):
-                if idx == 0:
-                    header_color = "metric-box"
-                elif idx == 1:
-                    header_color = "metric-box-success"
-                elif idx == 2:
-                    header_color = "metric-box-warning"
-                else:
-                    header_color = "metric-box-danger"
-                
+
+            with col2:
+                total_catatan = apps_df['Jumlah Catatan'].sum()
                 st.markdown(f"""
-                <div class="{header_color}">
-                <h3>Segmen: {segmen if segmen != '-' else 'DS'}</h3>
+                <div class="metric-box" style="text-align: center; padding: 25px;">
+                <h3 style="color: #003d7a; margin-bottom: 10px;">Total Catatan</h3>
+                <h1 style="color: #0066b3; margin: 10px 0; font-size: 48px;">{total_catatan:,}</h1>
+                <p style="color: #90a4ae; font-size: 14px;">Total transaksi dalam sistem</p>
                 </div>
                 """, unsafe_allow_html=True)
-                
-                df_segmen = df_filtered[df_filtered['Segmen_clean'] == segmen].drop_duplicates('apps_id')
-                
-                total_apps = len(df_segmen)
-                total_records = len(df_filtered[df_filtered['Segmen_clean'] == segmen])
-                
-                col1, col2 = st.columns(2)
-                with col1:
-                    st.metric("Total AppID", f"{total_apps:,}")
-                with col2:
-                    st.metric("Total Catatan", f"{total_records:,}")
-                
-                if len(df_segmen) > 0:
-                    # Create pivot: OSPH Range x Hasil Scoring
-                    pivot_data = []
-                    
-                    for osph_range in osph_order:
-                        df_osph = df_segmen[df_segmen['OSPH_Category'] == osph_range]
-                        
-                        row = {'Kategori Plafon': osph_range}
-                        
-                        for scoring in top_scoring:
-                            count = len(df_osph[df_osph['Scoring_Detail'] == scoring])
-                            row[scoring] = count if count > 0 else 0
-                        
-                        row['TOTAL'] = len(df_osph)
-                        
-                        pivot_data.append(row)
-                    
-                    # Add TOTAL row
-                    total_row = {'Kategori Plafon': 'TOTAL SEMUA'}
-                    for scoring in top_scoring:
-                        count = len(df_segmen[df_segmen['Scoring_Detail'] == scoring])
-                        total_row[scoring] = count if count > 0 else 0
-                    total_row['TOTAL'] = len(df_segmen)
-                    pivot_data.append(total_row)
-                    
-                    pivot_df = pd.DataFrame(pivot_data)
-                    
-                    st.dataframe(pivot_df, use_container_width=True, hide_index=True, height=300)
-                    
-                    # Visualization
-                    pivot_plot = pivot_df[pivot_df['Kategori Plafon'] != 'TOTAL SEMUA'].copy()
-                    
-                    if len(pivot_plot) > 0:
-                        plot_data = []
-                        for _, row in pivot_plot.iterrows():
-                            osph = row['Kategori Plafon']
-                            for col in pivot_plot.columns:
-                                if col not in ['Kategori Plafon', 'TOTAL'] and row[col] > 0:
-                                    plot_data.append({
-                                        'Kategori Plafon': osph,
-                                        'Hasil Scoring': col,
-                                        'Jumlah': row[col]
-                                    })
-                        
-                        if plot_data:
-                            plot_df = pd.DataFrame(plot_data)
-                            fig = px.bar(
-                                plot_df,
-                                x='Kategori Plafon',
-                                y='Jumlah',
-                                color='Hasil Scoring',
-                                title=f"Distribusi Plafon untuk Segmen {segmen if segmen != '-' else 'DS'}",
-                                barmode='group',
-                                color_discrete_sequence=px.colors.qualitative.Vivid,
-                                text='Jumlah'
-                            )
-                            fig.update_traces(textposition='outside', textfont_size=11)
-                            fig.update_layout(
-                                height=450,
-                                plot_bgcolor='#ffffff',
-                                paper_bgcolor='#ffffff',
-                                showlegend=True,
-                                font=dict(family='Arial', size=13, color='#1e2129'),
-                                title_font_size=16,
-                                title_font_color='#ffffff',
-                                xaxis=dict(
-                                    showgrid=False,
-                                    title_font_size=14,
-                                    tickangle=-45
-                                ),
-                                yaxis=dict(
-                                    showgrid=True,
-                                    gridcolor='#2d3139',
-                                    title_font_size=14
-                                )
-                            )
-                            st.plotly_chart(fig, use_container_width=True)
-                else:
-                    st.info(f"Tidak ada data untuk Segmen {segmen}")
-                
-                st.markdown("---")
 
-    
-    # ====== TAB 4: BRANCH & CA PERFORMANCE ======
-    with tab4:
-        st.markdown("## Analisis Kinerja Cabang & Credit Analyst")
-        
-        subtab1, subtab2 = st.tabs([" Kinerja Cabang", " Kinerja Credit Analyst"])
-        
-        # Branch Performance
-        with subtab1:
+            st.markdown("---")
+            st.markdown("### Daftar Semua Aplikasi")
+
+            # Display all apps in a table
+            st.dataframe(
+                apps_df.style.format({'Aksi Terakhir': lambda x: x.strftime('%d-%m-%Y %H:%M') if pd.notna(x) else 'N/A'}),
+                use_container_width=True,
+                hide_index=True,
+                height=400
+            )
+
+            st.markdown("---")
+
+            # Search and detail view
+            st.markdown("### Cari Detail Aplikasi")
+
+            col_search, col_empty = st.columns([2, 2])
+
+            with col_search:
+                search_input = st.text_input(
+                    "Masukkan AppID:", 
+                    placeholder="Contoh: 5259031",
+                    help="Ketik AppID untuk melihat detail lengkap"
+                )
+
+            if search_input:
+                try:
+                    search_id = int(search_input)
+                    app_index = get_app_index(dataset_version, df)
+                    app_records = df.iloc[app_index.lookup(search_id)].sort_values('action_on_parsed', kind='stable')
+
+                    if len(app_records) > 0:
+                        st.success(f"Ditemukan **{len(app_records)}** catatan untuk AppID: **{search_id}**")
+
+                        # Summary
+                        st.markdown("#### Ringkasan Aplikasi")
+                        col1, col2, col3, col4 = st.columns(4)
+
+                        with col1:
+                            segmen = app_records['Segmen_clean'].iloc[0] if 'Segmen_clean' in app_records.columns else 'N/A'
+                            st.markdown(f"""
+                            <div class="metric-box" style="text-align: center; padding: 20px;">
+                            <h4 style="color: #003d7a; margin-bottom: 10px;">Segmen</h4>
+                            <h3 style="color: #0066b3; margin: 0;">{segmen}</h3>
+                            </div>
+                            """, unsafe_allow_html=True)
+
+                        with col2:
+                            osph = app_records['OSPH_Category'].iloc[0] if 'OSPH_Category' in app_records.columns else 'N/A'
+                            st.markdown(f"""
+                            <div class="metric-box-warning" style="text-align: center; padding: 20px;">
+                            <h4 style="color: #003d7a; margin-bottom: 10px;">Plafon</h4>
+                            <h3 style="color: #d4af37; margin: 0;">{osph}</h3>
+                            </div>
+                            """, unsafe_allow_html=True)
+
+                        with col3:
+                            branch = app_records['branch_name_clean'].iloc[0] if 'branch_name_clean' in app_records.columns else 'N/A'
+                            st.markdown(f"""
+                            <div class="metric-box-success" style="text-align: center; padding: 20px;">
+                            <h4 style="color: #003d7a; margin-bottom: 10px;">Cabang</h4>
+                            <h3 style="color: #1e88e5; margin: 0;">{branch}</h3>
+                            </div>
+                            """, unsafe_allow_html=True)
+
+                        with col4:
+                            ca = app_records['user_name_clean'].iloc[-1] if 'user_name_clean' in app_records.columns else 'N/A'
+                            st.markdown(f"""
+                            <div class="metric-box" style="text-align: center; padding: 20px;">
+                            <h4 style="color: #003d7a; margin-bottom: 10px;">CA</h4>
+                            <h3 style="color: #0066b3; margin: 0;">{ca}</h3>
+                            </div>
+                            """, unsafe_allow_html=True)
+
+                        st.markdown("---")
+
+                        # Display ALL records
+                        st.markdown("#### Riwayat Lengkap Aplikasi")
+
+                        display_cols = [
+                            'apps_status_clean', 'action_on_parsed', 'Recommendation_parsed',
+                            'SLA_Hours', 'SLA_Formatted',
+                            'Scoring_Detail', 'OSPH_clean', 'LastOD_clean',
+                            'user_name_clean', 'Pekerjaan_clean', 'JenisKendaraan_clean'
+                        ]
+
+                        col_rename = {
+                            'apps_status_clean': 'Status',
+                            'action_on_parsed': 'Waktu Aksi',
+                            'Recommendation_parsed': 'Waktu Rekomendasi',
+                            'SLA_Hours': 'SLA (Jam)',
+                            'SLA_Formatted': 'SLA',
+                            'Scoring_Detail': 'Hasil Penilaian',
+                            'OSPH_clean': 'Plafon (Rp)',
+                            'LastOD_clean': 'Tunggakan Terakhir (Hari)',
+                            'user_name_clean': 'Credit Analyst',
+                            'Pekerjaan_clean': 'Pekerjaan',
+                            'JenisKendaraan_clean': 'Jenis Kendaraan'
+                        }
+
+                        available_cols = [c for c in display_cols if c in app_records.columns]
+                        display_df = app_records[available_cols].rename(columns=col_rename)
+
+                        st.dataframe(display_df.reset_index(drop=True), use_container_width=True, height=400)
+
+                    else:
+                        st.warning(f"Tidak ditemukan data untuk AppID: {search_id}")
+
+                except ValueError:
+                    st.error("Mohon masukkan AppID yang valid (angka)")
+
+    # ====== TAB 3: OSPH ANALYSIS ======
+    with tab3, tab_stage(tab3, "Analisis Plafon", rows_in=len(df_filtered)):
+        if tab_is_open(tab3):
+            st.markdown("## Analisis Plafon Kredit (OSPH)")
+
             st.markdown("""
             <div class="info-box">
-            <h4>Penjelasan Metrik Kinerja Cabang</h4>
+            <h4>Penjelasan Analisis</h4>
+            <p><strong>OSPH (Outstanding Plafon Hutang)</strong> adalah total plafon kredit yang tersedia untuk nasabah.</p>
+            <p>Analisis ini mengelompokkan aplikasi berdasarkan:</p>
             <ul>
-                <li><strong>Total AppID</strong>: Jumlah pengajuan kredit berbeda (tanpa duplikasi)</li>
-                <li><strong>Tingkat Persetujuan</strong>: Persentase aplikasi yang disetujui</li>
-                <li><strong>Waktu Proses Rata-rata</strong>: Durasi proses kredit dalam jam kerja</li>
-                <li><strong>Total Plafon</strong>: Akumulasi nilai plafon kredit</li>
+                <li><strong>Kategori Plafon</strong>: 0-250 Juta, 250-500 Juta, dan >500 Juta</li>
+                <li><strong>Dimensi Analisis</strong>: Pekerjaan, Status Aplikasi, Jenis Kendaraan, dan Hasil Scoring</li>
             </ul>
+            <p><strong>Catatan:</strong> Perhitungan Berdasarkan Total AppID</p>
             </div>
             """, unsafe_allow_html=True)
-            
-            if 'branch_name_clean' in df_filtered.columns:
-                branch_perf = []
-                
-                for branch in sorted(df_filtered['branch_name_clean'].unique()):
-                    if branch == 'Tidak Diketahui':
-                        continue
-                    
-                    df_branch = df_filtered[df_filtered['branch_name_clean'] == branch]
-                    df_branch_distinct = df_branch.drop_duplicates('apps_id')
-                    
-                    total_apps = len(df_branch_distinct)
-                    total_records = len(df_branch)
-
-                    approve = df_branch_distinct['apps_status_clean'].isin(['RECOMMENDED CA', 'RECOMMENDED CA WITH COND']).sum()
-                    total_scored = len(df_branch_distinct)
-                    approval_pct = f"{approve/total_scored*100:.1f}%" if total_scored > 0 else "0%"
-                    
-                    branch_sla = df_branch[df_branch['SLA_Hours'].notna()]
-                    avg_sla = convert_hours_to_hm(branch_sla['SLA_Hours'].mean()) if len(branch_sla) > 0 else "-"
-                    
-                    total_osph = df_branch_distinct['OSPH_clean'].sum()
-                    
-                    branch_perf.append({
-                        'Cabang': branch,
-                        'Total AppID': total_apps,
-                        'Total Catatan': total_records,
-                        'Disetujui': approve,
-                        'Tingkat Persetujuan': approval_pct,
-                        'Waktu Proses Rata-rata': avg_sla,
-                        'Total Plafon': f"Rp {total_osph:,.0f}"
-                    })
-                
-                branch_df = pd.DataFrame(branch_perf).sort_values('Total AppID', ascending=False)
-                
-                st.markdown("### Tabel Kinerja Seluruh Cabang")
-                st.dataframe(branch_df, use_container_width=True, hide_index=True, height=400)
-                
-        
-        # CA Performance
-        with subtab2:
+
+            st.markdown("---")
+
+            # Dimensi analisis: (judul, kolom, label grafik, palet warna, layout grafik detail)
+            osph_dimensions = [
+                ("Pekerjaan", 'Pekerjaan_clean', 'Pekerjaan', px.colors.qualitative.Set3, False),
+                ("Status Aplikasi", 'apps_status_clean', 'Status', px.colors.qualitative.Pastel, False),
+                ("Jenis Kendaraan", 'JenisKendaraan_clean', 'Jenis Kendaraan', px.colors.qualitative.Safe, True),
+                ("Hasil Scoring", 'Scoring_Detail', 'Hasil Scoring', px.colors.qualitative.Vivid, True)
+            ]
+            header_colors = ["metric-box", "metric-box-success", "metric-box-warning", "metric-box-danger"]
+
+            # Create subtabs for different analyses
+            subtabs = st.tabs([
+                " Berdasarkan Pekerjaan",
+                " Berdasarkan Status",
+                " Berdasarkan Jenis Kendaraan",
+                " Berdasarkan Hasil Scoring"
+            ])
+
+            for subtab, (title, dim_col, label, palette, detailed_layout) in zip(subtabs, osph_dimensions):
+                with subtab:
+                    st.markdown(f"### Analisis Plafon Berdasarkan {title}")
+
+                    # Semua segmen x kategori plafon x top-10 nilai dari satu grouped count
+                    pivots = cached_aggregate(dataset_version, filter_key, build_osph_pivots, filtered_cube('osph'), dim_col, label)
+
+                    for segmen, header_color in zip(SEGMENTS, header_colors):
+                        segmen_label = segmen if segmen != '-' else 'DS'
+
+                        st.markdown(f"""
+                        <div class="{header_color}">
+                        <h3>Segmen: {segmen_label}</h3>
+                        </div>
+                        """, unsafe_allow_html=True)
+
+                        seg_pivot = pivots[segmen]
+
+                        col1, col2 = st.columns(2)
+                        with col1:
+                            st.metric("Total AppID", f"{seg_pivot['total_apps']:,}")
+                        with col2:
+                            st.metric("Total Catatan", f"{seg_pivot['total_records']:,}")
+
+                        if seg_pivot['total_apps'] > 0:
+                            st.dataframe(seg_pivot['pivot'], use_container_width=True, hide_index=True, height=300)
+
+                            # Visualization
+                            plot_df = seg_pivot['plot']
+                            if len(plot_df) > 0:
+                                fig = px.bar(
+                                    plot_df,
+                                    x='Kategori Plafon',
+                                    y='Jumlah',
+                                    color=label,
+                                    title=f"Distribusi Plafon untuk Segmen {segmen_label}",
+                                    barmode='group',
+                                    color_discrete_sequence=palette,
+                                    text='Jumlah'
+                                )
+                                fig.update_traces(textposition='outside', textfont_size=11)
+                                if detailed_layout:
+                                    fig.update_layout(
+                                        height=450,
+                                        plot_bgcolor='#ffffff',
+                                        paper_bgcolor='#ffffff',
+                                        showlegend=True,
+                                        font=dict(family='Arial', size=13, color='#1e2129'),
+                                        title_font_size=16,
+                                        title_font_color='#ffffff',
+                                        xaxis=dict(
+                                            showgrid=False,
+                                            title_font_size=14,
+                                            tickangle=-45
+                                        ),
+                                        yaxis=dict(
+                                            showgrid=True,
+                                            gridcolor='#2d3139',
+                                            title_font_size=14
+                                        )
+                                    )
+                                else:
+                                    fig.update_layout(
+                                        height=400,
+                                        plot_bgcolor='#ffffff',
+                                        paper_bgcolor='#ffffff',
+                                        font=dict(family='Arial', size=12, color='#1e2129')
+                                    )
+                                st.plotly_chart(fig, use_container_width=True)
+                        else:
+                            st.info(f"Tidak ada data untuk Segmen {segmen}")
+
+                        st.markdown("---")
+
+
+    # ====== TAB 4: BRANCH & CA PERFORMANCE ======
+    with tab4, tab_stage(tab4, "Kinerja Cabang & CA", rows_in=len(df_filtered)):
+        if tab_is_open(tab4):
+            st.markdown("## Analisis Kinerja Cabang & Credit Analyst")
+
+            subtab1, subtab2 = st.tabs([" Kinerja Cabang", " Kinerja Credit Analyst"])
+
+            # Branch Performance
+            with subtab1:
+                st.markdown("""
+                <div class="info-box">
+                <h4>Penjelasan Metrik Kinerja Cabang</h4>
+                <ul>
+                    <li><strong>Total AppID</strong>: Jumlah pengajuan kredit berbeda (tanpa duplikasi)</li>
+                    <li><strong>Tingkat Persetujuan</strong>: Persentase aplikasi yang disetujui</li>
+                    <li><strong>Waktu Proses Rata-rata</strong>: Durasi proses kredit dalam jam kerja</li>
+                    <li><strong>Total Plafon</strong>: Akumulasi nilai plafon kredit</li>
+                </ul>
+                </div>
+                """, unsafe_allow_html=True)
+
+                if 'branch_name_clean' in df_filtered.columns:
+                    branch_df = cached_aggregate(dataset_version, filter_key, build_branch_performance, filtered_cube('branch'))
+
+                    st.markdown("### Tabel Kinerja Seluruh Cabang")
+                    st.dataframe(branch_df, use_container_width=True, hide_index=True, height=400)
+
+
+            # CA Performance
+            with subtab2:
+                st.markdown("""
+                <div class="info-box">
+                <h4>Penjelasan Metrik Kinerja Credit Analyst</h4>
+                <ul>
+                    <li><strong>Total AppID</strong>: Jumlah pengajuan kredit yang ditangani</li>
+                    <li><strong>Tingkat Persetujuan</strong>: Persentase aplikasi yang berhasil disetujui</li>
+                    <li><strong>Waktu Proses Rata-rata</strong>: Efisiensi waktu dalam memproses aplikasi</li>
+                </ul>
+                </div>
+                """, unsafe_allow_html=True)
+
+                if 'user_name_clean' in df_filtered.columns:
+                    ca_df = cached_aggregate(dataset_version, filter_key, build_ca_performance, filtered_cube('ca'))
+
+                    st.markdown("### Tabel Kinerja Seluruh Credit Analyst")
+                    st.dataframe(ca_df, use_container_width=True, hide_index=True, height=400)
+
+
+    # ====== TAB 5: STATUS & SCORING ======
+    with tab5, tab_stage(tab5, "Status & Penilaian", rows_in=len(df_filtered)):
+        if tab_is_open(tab5):
+            st.markdown("## Analisis Status Aplikasi & Hasil Penilaian")
+
             st.markdown("""
             <div class="info-box">
-            <h4>Penjelasan Metrik Kinerja Credit Analyst</h4>
+            <h4>Penjelasan Tabel</h4>
+            <p>Tabel ini menunjukkan hubungan antara <strong>Status Aplikasi</strong> dan <strong>Hasil Penilaian (Scoring)</strong>.</p>
             <ul>
-                <li><strong>Total AppID</strong>: Jumlah pengajuan kredit yang ditangani</li>
-                <li><strong>Tingkat Persetujuan</strong>: Persentase aplikasi yang berhasil disetujui</li>
-                <li><strong>Waktu Proses Rata-rata</strong>: Efisiensi waktu dalam memproses aplikasi</li>
+                <li><strong>Baris</strong>: Menunjukkan status aplikasi (Approved, Rejected, dll)</li>
+                <li><strong>Kolom</strong>: Menunjukkan hasil penilaian dari sistem scoring</li>
+                <li><strong>Nilai</strong>: Jumlah AppID untuk setiap kombinasi</li>
             </ul>
+            <p><strong>Catatan:</strong> Perhitungan berdasarkan total AppID</p>
             </div>
             """, unsafe_allow_html=True)
-            
-            if 'user_name_clean' in df_filtered.columns:
-                ca_perf = []
-                
-                for ca in sorted(df_filtered['user_name_clean'].unique()):
-                    if ca == 'Tidak Diketahui':
-                        continue
-                    
-                    df_ca = df_filtered[df_filtered['user_name_clean'] == ca]
-                    df_ca_distinct = df_ca.drop_duplicates('apps_id')
-                    
-                    total_apps = len(df_ca_distinct)
-                    total_records = len(df_ca)
-
-                    approve = df_branch_distinct['apps_status_clean'].isin(['RECOMMENDED CA', 'RECOMMENDED CA WITH COND']).sum()
-                    total_scored = len(df_branch_distinct)
-                    approval_pct = f"{approve/total_scored*100:.1f}%" if total_scored > 0 else "0%"
-                    
-                    ca_sla = df_ca[df_ca['SLA_Hours'].notna()]
-                    avg_sla = convert_hours_to_hm(ca_sla['SLA_Hours'].mean()) if len(ca_sla) > 0 else "-"
-                    
-                    branches = df_ca['branch_name_clean'].unique()
-                    main_branch = branches[0] if len(branches) > 0 else "Tidak Diketahui"
-                    
-                    ca_perf.append({
-                        'Nama Credit Analyst': ca,
-                        'Cabang': main_branch,
-                        'Total AppID': total_apps,
-                        'Total Catatan': total_records,
-                        'Disetujui': approve,
-                        'Tingkat Persetujuan': approval_pct,
-                        'Waktu Proses Rata-rata': avg_sla
-                    })
-                
-                ca_df = pd.DataFrame(ca_perf).sort_values('Total AppID', ascending=False)
-                
-                st.markdown("### Tabel Kinerja Seluruh Credit Analyst")
-                st.dataframe(ca_df, use_container_width=True, hide_index=True, height=400)
-                
-    
-    # ====== TAB 5: STATUS & SCORING ======
-    with tab5:
-        st.markdown("## Analisis Status Aplikasi & Hasil Penilaian")
-        
-        st.markdown("""
-        <div class="info-box">
-        <h4>Penjelasan Tabel</h4>
-        <p>Tabel ini menunjukkan hubungan antara <strong>Status Aplikasi</strong> dan <strong>Hasil Penilaian (Scoring)</strong>.</p>
-        <ul>
-            <li><strong>Baris</strong>: Menunjukkan status aplikasi (Approved, Rejected, dll)</li>
-            <li><strong>Kolom</strong>: Menunjukkan hasil penilaian dari sistem scoring</li>
-            <li><strong>Nilai</strong>: Jumlah AppID untuk setiap kombinasi</li>
-        </ul>
-        <p><strong>Catatan:</strong> Perhitungan berdasarkan total AppID</p>
-        </div>
-        """, unsafe_allow_html=True)
-        
-        df_distinct = df_filtered.drop_duplicates('apps_id')
-        total_apps_distinct = len(df_distinct)
-        total_records = len(df_filtered)
-        
-        col1, col2 = st.columns(2)
-        with col1:
-            st.markdown(f"""
-            <div class="metric-box-success" style="text-align: center; padding: 25px;">
-            <h3 style="color: #003d7a; margin-bottom: 10px;">Total AppID</h3>
-            <h1 style="color: #1e88e5; margin: 10px 0; font-size: 48px;">{total_apps_distinct:,}</h1>
-            </div>
-            """, unsafe_allow_html=True)
-        
-        with col2:
-            st.markdown(f"""
-            <div class="metric-box" style="text-align: center; padding: 25px;">
-            <h3 style="color: #003d7a; margin-bottom: 10px;">Total Catatan</h3>
-            <h1 style="color: #0066b3; margin: 10px 0; font-size: 48px;">{total_records:,}</h1>
-            </div>
-            """, unsafe_allow_html=True)
-        
-        st.markdown("---")
-        st.markdown("### Tabel Silang: Status × Hasil Penilaian")
-        
-        if 'apps_status_clean' in df_distinct.columns and 'Scoring_Detail' in df_distinct.columns:
-            cross_tab = pd.crosstab(
-                df_distinct['apps_status_clean'],
-                df_distinct['Scoring_Detail'],
-                margins=True,
-                margins_name='TOTAL'
-            )
-            
-            cross_tab.index.name = 'Status Aplikasi'
-            cross_tab.columns.name = 'Hasil Penilaian'
-            
-            st.dataframe(cross_tab, use_container_width=True, height=400)
-            
+
+            total_apps_distinct = int(filtered_cube('status_scoring')['apps'].sum())
+            total_records = len(df_filtered)
+
+            col1, col2 = st.columns(2)
+            with col1:
+                st.markdown(f"""
+                <div class="metric-box-success" style="text-align: center; padding: 25px;">
+                <h3 style="color: #003d7a; margin-bottom: 10px;">Total AppID</h3>
+                <h1 style="color: #1e88e5; margin: 10px 0; font-size: 48px;">{total_apps_distinct:,}</h1>
+                </div>
+                """, unsafe_allow_html=True)
+
+            with col2:
+                st.markdown(f"""
+                <div class="metric-box" style="text-align: center; padding: 25px;">
+                <h3 style="color: #003d7a; margin-bottom: 10px;">Total Catatan</h3>
+                <h1 style="color: #0066b3; margin: 10px 0; font-size: 48px;">{total_records:,}</h1>
+                </div>
+                """, unsafe_allow_html=True)
+
             st.markdown("---")
-            st.markdown("### Visualisasi Heatmap")
-            
-            cross_tab_no_total = cross_tab.drop('TOTAL', errors='ignore').drop('TOTAL', axis=1, errors='ignore')
-            
-            if len(cross_tab_no_total) > 0:
-                fig = px.imshow(
-                    cross_tab_no_total,
-                    text_auto=True,
-                    title="Distribusi Status × Hasil Penilaian",
-                    color_continuous_scale="Blues",
-                    aspect="auto"
-                )
-                fig.update_layout(
-                    height=550,
-                    xaxis_title="Hasil Penilaian",
-                    yaxis_title="Status Aplikasi",
-                    font=dict(family='Arial', size=13, color='#e0e0e0'),
-                    title_font_size=16,
-                    title_font_color='#ffffff'
-                )
-                fig.update_xaxes(side="bottom")
-                st.plotly_chart(fig, use_container_width=True)
-    
-    # ====== TAB 6: OD IMPACT ======
-    with tab6:
-        st.markdown("## Analisis Dampak Keterlambatan Pembayaran")
-        
-        st.markdown("""
-        <div class="info-box">
-        <h4>Penjelasan Overdue Days (OD)</h4>
-        <p><strong>Overdue Days</strong> adalah jumlah hari keterlambatan pembayaran kredit sebelumnya.</p>
-        <ul>
-            <li><strong>Last OD</strong>: Keterlambatan terakhir yang tercatat</li>
-            <li><strong>Max OD</strong>: Keterlambatan terlama yang pernah terjadi</li>
-        </ul>
-        <p>Analisis ini menunjukkan bagaimana riwayat keterlambatan mempengaruhi persetujuan kredit baru.</p>
-        </div>
-        """, unsafe_allow_html=True)
-        
-        df_distinct = df_filtered.drop_duplicates('apps_id')
-        total_apps_distinct = len(df_distinct)
-        total_records = len(df_filtered)
-        
-        col1, col2 = st.columns(2)
-        with col1:
-            st.markdown(f"""
-            <div class="metric-box-success" style="text-align: center; padding: 25px;">
-            <h3 style="color: #003d7a; margin-bottom: 10px;">Total AppID</h3>
-            <h1 style="color: #1e88e5; margin: 10px 0; font-size: 48px;">{total_apps_distinct:,}</h1>
-            </div>
-            """, unsafe_allow_html=True)
-        
-        with col2:
-            st.markdown(f"""
-            <div class="metric-box" style="text-align: center; padding: 25px;">
-            <h3 style="color: #003d7a; margin-bottom: 10px;">Total Catatan</h3>
-            <h1 style="color: #0066b3; margin: 10px 0; font-size: 48px;">{total_records:,}</h1>
-            </div>
-            """, unsafe_allow_html=True)
-        
-        st.markdown("---")
-        
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            st.markdown("### Keterlambatan Terakhir (Last OD)")
-            
-            if 'LastOD_clean' in df_distinct.columns:
-                df_distinct_copy = df_distinct.copy()
-                df_distinct_copy['LastOD_Category'] = pd.cut(
-                    df_distinct_copy['LastOD_clean'],
-                    bins=[-np.inf, 0, 10, 30, np.inf],
-                    labels=['Tidak Ada', '1-10 Hari', '11-30 Hari', 'Lebih dari 30 Hari']
-                )
-                
-                lastod_analysis = []
-                
-                for cat in ['Tidak Ada', '1-10 Hari', '11-30 Hari', 'Lebih dari 30 Hari']:
-                    df_od = df_distinct_copy[df_distinct_copy['LastOD_Category'] == cat]
-                    
-                    if len(df_od) > 0:
-                        approve = df_od['apps_status_clean'].isin(['RECOMMENDED CA', 'RECOMMENDED CA WITH COND']).sum()
-                        total = len(df_od)
-                        
-                        approval_pct = f"{approve/total*100:.1f}%" if total > 0 else "0%"
-                        
-                        lastod_analysis.append({
-                            'Kategori': cat,
-                            'Total Aplikasi': len(df_od),
-                            'Disetujui': approve,
-                            'Tingkat Persetujuan': approval_pct
-                        })
-                
-                lastod_df = pd.DataFrame(lastod_analysis)
-                st.dataframe(lastod_df, use_container_width=True, hide_index=True)
-                
-                if len(lastod_df) > 0:
-                    lastod_df['Approval_Numeric'] = lastod_df['Tingkat Persetujuan'].str.rstrip('%').astype(float)
-                    fig = px.bar(
-                        lastod_df,
-                        x='Kategori',
-                        y='Approval_Numeric',
-                        title="Tingkat Persetujuan Berdasarkan Last OD",
-                        color='Approval_Numeric',
-                        color_continuous_scale='RdYlGn',
-                        text='Tingkat Persetujuan'
-                    )
-                    fig.update_traces(textposition='outside', textfont_size=12)
-                    fig.update_layout(
-                        yaxis_title="Tingkat Persetujuan (%)",
-                        height=350,
-                        showlegend=False,
-                        plot_bgcolor='#ffffff',
-                        paper_bgcolor='#FFFFFF'
-                    )
-                    st.plotly_chart(fig, use_container_width=True)
-        
-        with col2:
-            st.markdown("### Keterlambatan Maksimum (Max OD)")
-            
-            if 'max_OD_clean' in df_distinct.columns:
-                df_distinct_copy2 = df_distinct.copy()
-                df_distinct_copy2['maxOD_Category'] = pd.cut(
-                    df_distinct_copy2['max_OD_clean'],
-                    bins=[-np.inf, 0, 15, 45, np.inf],
-                    labels=['Tidak Ada', '1-15 Hari', '16-45 Hari', 'Lebih dari 45 Hari']
-                )
-                
-                maxod_analysis = []
-                
-                for cat in ['Tidak Ada', '1-15 Hari', '16-45 Hari', 'Lebih dari 45 Hari']:
-                    df_od = df_distinct_copy2[df_distinct_copy2['maxOD_Category'] == cat]
-                    
-                    if len(df_od) > 0:
-                        approve = df_od['apps_status_clean'].isin(['RECOMMENDED CA', 'RECOMMENDED CA WITH COND']).sum()
-                        total = len(df_od)
-                        
-                        approval_pct = f"{approve/total*100:.1f}%" if total > 0 else "0%"
-                        
-                        maxod_analysis.append({
-                            'Kategori': cat,
-                            'Total Aplikasi': len(df_od),
-                            'Disetujui': approve,
-                            'Tingkat Persetujuan': approval_pct
-                        })
-                
-                maxod_df = pd.DataFrame(maxod_analysis)
-                st.dataframe(maxod_df, use_container_width=True, hide_index=True)
-                
-                if len(maxod_df) > 0:
-                    maxod_df['Approval_Numeric'] = maxod_df['Tingkat Persetujuan'].str.rstrip('%').astype(float)
-                    fig = px.bar(
-                        maxod_df,
-                        x='Kategori',
-                        y='Approval_Numeric',
-                        title="Tingkat Persetujuan Berdasarkan Max OD",
-                        color='Approval_Numeric',
-                        color_continuous_scale='RdYlGn',
-                        text='Tingkat Persetujuan'
+            st.markdown("### Tabel Silang: Status × Hasil Penilaian")
+
+            if 'apps_status_clean' in df_filtered.columns and 'Scoring_Detail' in df_filtered.columns:
+                cross_tab = cached_aggregate(dataset_version, filter_key, build_status_scoring_crosstab, filtered_cube('status_scoring'))
+
+                st.dataframe(cross_tab, use_container_width=True, height=400)
+
+                st.markdown("---")
+                st.markdown("### Visualisasi Heatmap")
+
+                cross_tab_no_total = cross_tab.drop('TOTAL', errors='ignore').drop('TOTAL', axis=1, errors='ignore')
+
+                if len(cross_tab_no_total) > 0:
+                    fig = px.imshow(
+                        cross_tab_no_total,
+                        text_auto=True,
+                        title="Distribusi Status × Hasil Penilaian",
+                        color_continuous_scale="Blues",
+                        aspect="auto"
                     )
-                    fig.update_traces(textposition='outside', textfont_size=12)
                     fig.update_layout(
-                        yaxis_title="Tingkat Persetujuan (%)",
-                        height=350,
-                        showlegend=False,
-                        plot_bgcolor='#ffffff',
-                        paper_bgcolor='#FFFFFF'
+                        height=550,
+                        xaxis_title="Hasil Penilaian",
+                        yaxis_title="Status Aplikasi",
+                        font=dict(family='Arial', size=13, color='#e0e0e0'),
+                        title_font_size=16,
+                        title_font_color='#ffffff'
                     )
+                    fig.update_xaxes(side="bottom")
                     st.plotly_chart(fig, use_container_width=True)
-    
-    # ====== TAB 7: INSIGHTS ======
-    with tab7:
-        st.markdown("## Insights")
-        
-        st.markdown("""
-        <div class="info-box">
-        <h4>Tentang Insights</h4>
-        <p>Bagian ini menyajikan analisis berdasarkan data aktual untuk membantu pengambilan keputusan bisnis.</p>
-        </div>
-        """, unsafe_allow_html=True)
-        
-        st.markdown("---")
-        
-        df_distinct = df_filtered.drop_duplicates('apps_id')
-        
-        # 1. SLA Performance Analysis
-        st.markdown("### 1. Analisis Performa Waktu Proses (SLA)")
-        
-        sla_data = df_filtered[df_filtered['SLA_Hours'].notna()]
-        if len(sla_data) > 0:
-            avg_sla = sla_data['SLA_Hours'].mean()
-            target_sla = 35
-            sla_above_target = (sla_data['SLA_Hours'] > target_sla).sum()
-            sla_pct_above = (sla_above_target / len(sla_data)) * 100
-            
-            col1, col2, col3 = st.columns(3)
-            
+
+    # ====== TAB 6: OD IMPACT ======
+    with tab6, tab_stage(tab6, "Dampak Keterlambatan", rows_in=len(df_filtered)):
+        if tab_is_open(tab6):
+            st.markdown("## Analisis Dampak Keterlambatan Pembayaran")
+
+            st.markdown("""
+            <div class="info-box">
+            <h4>Penjelasan Overdue Days (OD)</h4>
+            <p><strong>Overdue Days</strong> adalah jumlah hari keterlambatan pembayaran kredit sebelumnya.</p>
+            <ul>
+                <li><strong>Last OD</strong>: Keterlambatan terakhir yang tercatat</li>
+                <li><strong>Max OD</strong>: Keterlambatan terlama yang pernah terjadi</li>
+            </ul>
+            <p>Analisis ini menunjukkan bagaimana riwayat keterlambatan mempengaruhi persetujuan kredit baru.</p>
+            </div>
+            """, unsafe_allow_html=True)
+
+            total_apps_distinct = int(filtered_cube('status_scoring')['apps'].sum())
+            total_records = len(df_filtered)
+
+            col1, col2 = st.columns(2)
             with col1:
-                status = "Baik" if avg_sla <= target_sla else "Perlu Perbaikan"
-                color = "metric-box-success" if avg_sla <= target_sla else "metric-box-danger"
                 st.markdown(f"""
-                <div class="{color}" style="text-align: center; padding: 20px;">
-                <h4 style="color: #003d7a; margin-bottom: 10px;">Status SLA</h4>
-                <h3 style="margin: 0;">{status}</h3>
-                <p style="color: #90a4ae; font-size: 14px; margin-top: 5px;">Rata-rata: {avg_sla:.1f} jam (Target: 35 jam)</p>
+                <div class="metric-box-success" style="text-align: center; padding: 25px;">
+                <h3 style="color: #003d7a; margin-bottom: 10px;">Total AppID</h3>
+                <h1 style="color: #1e88e5; margin: 10px 0; font-size: 48px;">{total_apps_distinct:,}</h1>
                 </div>
                 """, unsafe_allow_html=True)
-            
+
             with col2:
                 st.markdown(f"""
-                <div class="metric-box-warning" style="text-align: center; padding: 20px;">
-                <h4 style="color: #003d7a; margin-bottom: 10px;">Melebihi Target</h4>
-                <h3 style="color: #d4af37; margin: 0;">{sla_pct_above:.1f}%</h3>
-                <p style="color: #90a4ae; font-size: 14px; margin-top: 5px;">{sla_above_target:,} dari {len(sla_data):,} aplikasi</p>
+                <div class="metric-box" style="text-align: center; padding: 25px;">
+                <h3 style="color: #003d7a; margin-bottom: 10px;">Total Catatan</h3>
+                <h1 style="color: #0066b3; margin: 10px 0; font-size: 48px;">{total_records:,}</h1>
                 </div>
                 """, unsafe_allow_html=True)
-            
-            with col3:
-                if avg_sla > target_sla:
-                    improvement = avg_sla - target_sla
+
+            st.markdown("---")
+
+            col1, col2 = st.columns(2)
+
+            with col1:
+                st.markdown("### Keterlambatan Terakhir (Last OD)")
+
+                if 'LastOD_clean' in df_filtered.columns:
+                    lastod_df = cached_aggregate(dataset_version, filter_key, build_od_approval, filtered_cube('od'), 'LastOD_clean')
+                    st.dataframe(lastod_df, use_container_width=True, hide_index=True)
+
+                    if len(lastod_df) > 0:
+                        lastod_df = lastod_df.assign(Approval_Numeric=lastod_df['Tingkat Persetujuan'].str.rstrip('%').astype(float))
+                        fig = px.bar(
+                            lastod_df,
+                            x='Kategori',
+                            y='Approval_Numeric',
+                            title="Tingkat Persetujuan Berdasarkan Last OD",
+                            color='Approval_Numeric',
+                            color_continuous_scale='RdYlGn',
+                            text='Tingkat Persetujuan'
+                        )
+                        fig.update_traces(textposition='outside', textfont_size=12)
+                        fig.update_layout(
+                            yaxis_title="Tingkat Persetujuan (%)",
+                            height=350,
+                            showlegend=False,
+                            plot_bgcolor='#ffffff',
+                            paper_bgcolor='#FFFFFF'
+                        )
+                        st.plotly_chart(fig, use_container_width=True)
+
+            with col2:
+                st.markdown("### Keterlambatan Maksimum (Max OD)")
+
+                if 'max_OD_clean' in df_filtered.columns:
+                    maxod_df = cached_aggregate(dataset_version, filter_key, build_od_approval, filtered_cube('od'), 'max_OD_clean')
+                    st.dataframe(maxod_df, use_container_width=True, hide_index=True)
+
+                    if len(maxod_df) > 0:
+                        maxod_df = maxod_df.assign(Approval_Numeric=maxod_df['Tingkat Persetujuan'].str.rstrip('%').astype(float))
+                        fig = px.bar(
+                            maxod_df,
+                            x='Kategori',
+                            y='Approval_Numeric',
+                            title="Tingkat Persetujuan Berdasarkan Max OD",
+                            color='Approval_Numeric',
+                            color_continuous_scale='RdYlGn',
+                            text='Tingkat Persetujuan'
+                        )
+                        fig.update_traces(textposition='outside', textfont_size=12)
+                        fig.update_layout(
+                            yaxis_title="Tingkat Persetujuan (%)",
+                            height=350,
+                            showlegend=False,
+                            plot_bgcolor='#ffffff',
+                            paper_bgcolor='#FFFFFF'
+                        )
+                        st.plotly_chart(fig, use_container_width=True)
+
+    # ====== TAB 7: INSIGHTS ======
+    with tab7, tab_stage(tab7, "Insights", rows_in=len(df_filtered)):
+        if tab_is_open(tab7):
+            st.markdown("## Insights")
+
+            st.markdown("""
+            <div class="info-box">
+            <h4>Tentang Insights</h4>
+            <p>Bagian ini menyajikan analisis berdasarkan data aktual untuk membantu pengambilan keputusan bisnis.</p>
+            </div>
+            """, unsafe_allow_html=True)
+
+            st.markdown("---")
+
+            # 1. SLA Performance Analysis
+            st.markdown("### 1. Analisis Performa Waktu Proses (SLA)")
+
+            sla_data = df_filtered[df_filtered['SLA_Hours'].notna()]
+            if len(sla_data) > 0:
+                avg_sla = sla_data['SLA_Hours'].mean()
+                target_sla = 35
+                sla_above_target = (sla_data['SLA_Hours'] > target_sla).sum()
+                sla_pct_above = (sla_above_target / len(sla_data)) * 100
+
+                col1, col2, col3 = st.columns(3)
+
+                with col1:
+                    status = "Baik" if avg_sla <= target_sla else "Perlu Perbaikan"
+                    color = "metric-box-success" if avg_sla <= target_sla else "metric-box-danger"
+                    st.markdown(f"""
+                    <div class="{color}" style="text-align: center; padding: 20px;">
+                    <h4 style="color: #003d7a; margin-bottom: 10px;">Status SLA</h4>
+                    <h3 style="margin: 0;">{status}</h3>
+                    <p style="color: #90a4ae; font-size: 14px; margin-top: 5px;">Rata-rata: {avg_sla:.1f} jam (Target: 35 jam)</p>
+                    </div>
+                    """, unsafe_allow_html=True)
+
+                with col2:
                     st.markdown(f"""
-                    <div class="metric-box" style="text-align: center; padding: 20px;">
-                    <h4 style="color: #003d7a; margin-bottom: 10px;">Potensi Peningkatan</h4>
-                    <h3 style="color: #0066b3; margin: 0;">{improvement:.1f} jam</h3>
-                    <p style="color: #90a4ae; font-size: 14px; margin-top: 5px;">Efisiensi yang bisa dicapai</p>
+                    <div class="metric-box-warning" style="text-align: center; padding: 20px;">
+                    <h4 style="color: #003d7a; margin-bottom: 10px;">Melebihi Target</h4>
+                    <h3 style="color: #d4af37; margin: 0;">{sla_pct_above:.1f}%</h3>
+                    <p style="color: #90a4ae; font-size: 14px; margin-top: 5px;">{sla_above_target:,} dari {len(sla_data):,} aplikasi</p>
                     </div>
                     """, unsafe_allow_html=True)
-                else:
+
+                with col3:
+                    if avg_sla > target_sla:
+                        improvement = avg_sla - target_sla
+                        st.markdown(f"""
+                        <div class="metric-box" style="text-align: center; padding: 20px;">
+                        <h4 style="color: #003d7a; margin-bottom: 10px;">Potensi Peningkatan</h4>
+                        <h3 style="color: #0066b3; margin: 0;">{improvement:.1f} jam</h3>
+                        <p style="color: #90a4ae; font-size: 14px; margin-top: 5px;">Efisiensi yang bisa dicapai</p>
+                        </div>
+                        """, unsafe_allow_html=True)
+                    else:
+                        st.markdown(f"""
+                        <div class="metric-box-success" style="text-align: center; padding: 20px;">
+                        <h4 style="color: #003d7a; margin-bottom: 10px;">Performa Optimal</h4>
+                        <h3 style="color: #1e88e5; margin: 0;">Target Tercapai</h3>
+                        <p style="color: #90a4ae; font-size: 14px; margin-top: 5px;">SLA dalam batas normal</p>
+                        </div>
+                        """, unsafe_allow_html=True)
+
+            st.markdown("---")
+
+            # 2. Approval Rate Analysis
+            st.markdown("### 2. Analisis Tingkat Persetujuan")
+
+            approve_count = int(filtered_cube('status_scoring')['approved'].sum())
+            total_scored = int(filtered_cube('status_scoring')['apps'].sum())
+            reject_count = total_scored - approve_count
+
+            if total_scored > 0:
+                approval_rate = (approve_count / total_scored) * 100
+
+                col1, col2, col3 = st.columns(3)
+
+                with col1:
                     st.markdown(f"""
                     <div class="metric-box-success" style="text-align: center; padding: 20px;">
-                    <h4 style="color: #003d7a; margin-bottom: 10px;">Performa Optimal</h4>
-                    <h3 style="color: #1e88e5; margin: 0;">Target Tercapai</h3>
-                    <p style="color: #90a4ae; font-size: 14px; margin-top: 5px;">SLA dalam batas normal</p>
+                    <h4 style="color: #003d7a; margin-bottom: 10px;">Tingkat Persetujuan</h4>
+                    <h3 style="color: #1e88e5; margin: 0;">{approval_rate:.1f}%</h3>
+                    <p style="color: #90a4ae; font-size: 14px; margin-top: 5px;">{approve_count:,} aplikasi disetujui</p>
                     </div>
                     """, unsafe_allow_html=True)
-        
-        st.markdown("---")
-        
-        # 2. Approval Rate Analysis
-        st.markdown("### 2. Analisis Tingkat Persetujuan")
 
-        approve_count = df_distinct['apps_status_clean'].isin(['RECOMMENDED CA', 'RECOMMENDED CA WITH COND']).sum()
-        total_scored = len(df_distinct)
-        
-        if total_scored > 0:
-            approval_rate = (approve_count / total_scored) * 100
-            
-            col1, col2, col3 = st.columns(3)
-            
+                with col2:
+                    st.markdown(f"""
+                    <div class="metric-box-danger" style="text-align: center; padding: 20px;">
+                    <h4 style="color: #003d7a; margin-bottom: 10px;">Ditolak</h4>
+                    <h3 style="color: #f44336; margin: 0;">{100-approval_rate:.1f}%</h3>
+                    <p style="color: #90a4ae; font-size: 14px; margin-top: 5px;">{reject_count:,} aplikasi ditolak</p>
+                    </div>
+                    """, unsafe_allow_html=True)
+
+
+    # ====== TAB 8: DATA EXPORT ======
+    with tab8, tab_stage(tab8, "Unduh Data", rows_in=len(df_filtered)):
+        if tab_is_open(tab8):
+            st.markdown("## Unduh Data & Laporan")
+
+            st.markdown("""
+            <div class="info-box">
+            <h4>Cara Mengunduh Data</h4>
+            <p>Anda dapat mengunduh data dalam format CSV, Parquet, atau Excel (XLSX) untuk analisis lebih lanjut:</p>
+            <ul>
+                <li><strong>Data Lengkap</strong>: Semua data yang sudah difilter dengan kolom penting (XLSX juga berisi sheet ringkasan per AppID & statistik)</li>
+                <li><strong>Ringkasan Statistik</strong>: Metrik utama dan ringkasan analisis</li>
+            </ul>
+            </div>
+            """, unsafe_allow_html=True)
+
+            st.markdown("---")
+            st.markdown("### Pratinjau Data")
+            st.caption("*Menampilkan 100 baris pertama dari data yang difilter*")
+
+            display_cols = [
+                'apps_id', 'apps_status_clean', 'action_on_parsed',
+                'Recommendation_parsed', 'SLA_Formatted', 'SLA_Hours',
+                'Scoring_Detail', 'OSPH_Category', 'Segmen_clean',
+                'JenisKendaraan_clean', 'Pekerjaan_clean', 'LastOD_clean',
+                'user_name_clean', 'branch_name_clean'
+            ]
+
+            col_rename = {
+                'apps_id': 'AppID',
+                'apps_status_clean': 'Status',
+                'action_on_parsed': 'Waktu Aksi',
+                'Recommendation_parsed': 'Waktu Rekomendasi',
+                'SLA_Formatted': 'SLA',
+                'SLA_Hours': 'SLA (Jam)',
+                'Scoring_Detail': 'Hasil Penilaian',
+                'OSPH_Category': 'Kategori Plafon',
+                'Segmen_clean': 'Segmen',
+                'JenisKendaraan_clean': 'Jenis Kendaraan',
+                'Pekerjaan_clean': 'Pekerjaan',
+                'LastOD_clean': 'Last OD (Hari)',
+                'user_name_clean': 'Credit Analyst',
+                'branch_name_clean': 'Cabang'
+            }
+
+            available_cols = [c for c in display_cols if c in df_filtered.columns]
+            display_df = df_filtered[available_cols].head(100).rename(columns=col_rename)
+
+            st.dataframe(
+                display_df,
+                use_container_width=True,
+                hide_index=True,
+                height=400
+            )
+
+            st.caption(f"Menampilkan 100 dari {len(df_filtered):,} baris data")
+
+            st.markdown("---")
+            st.markdown("### Unduh File")
+
+            col1, col2 = st.columns(2)
+
             with col1:
-                st.markdown(f"""
-                <div class="metric-box-success" style="text-align: center; padding: 20px;">
-                <h4 style="color: #003d7a; margin-bottom: 10px;">Tingkat Persetujuan</h4>
-                <h3 style="color: #1e88e5; margin: 0;">{approval_rate:.1f}%</h3>
-                <p style="color: #90a4ae; font-size: 14px; margin-top: 5px;">{approve_count:,} aplikasi disetujui</p>
+                st.markdown("""
+                <div class="metric-box-success" style="padding: 20px;">
+                <h4 style="color: #003d7a; margin-bottom: 10px;">Data Lengkap</h4>
+                <p style="color: #90a4ae;">Unduh semua data yang sudah difilter dalam format CSV, Parquet, atau XLSX</p>
                 </div>
                 """, unsafe_allow_html=True)
-            
+
+                # File dibuat saat tombol diklik (bukan setiap rerun), ditulis per potongan baris
+                st.download_button(
+                    "📥 Unduh Data Lengkap (CSV)",
+                    lambda: export_csv(df_filtered, available_cols),
+                    "data_analisis_kredit.csv",
+                    "text/csv",
+                    use_container_width=True
+                )
+                st.download_button(
+                    "📥 Unduh Data Lengkap (Parquet)",
+                    lambda: export_parquet(df_filtered, available_cols),
+                    "data_analisis_kredit.parquet",
+                    "application/vnd.apache.parquet",
+                    use_container_width=True
+                )
+                st.download_button(
+                    "📥 Unduh Data Lengkap (XLSX)",
+                    lambda: export_xlsx(df_filtered, available_cols, {
+                        'Ringkasan AppID': cached_aggregate(
+                            dataset_version, filter_key, build_apps_summary,
+                            get_filtered_facts(dataset_version, filter_key, selections, df, df_filtered, status_options)
+                        ),
+                        'Ringkasan Statistik': cached_aggregate(dataset_version, filter_key, build_export_summary, filtered_cube('status_scoring'))
+                    }),
+                    "data_analisis_kredit.xlsx",
+                    "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+                    use_container_width=True
+                )
+
             with col2:
-                st.markdown(f"""
-                <div class="metric-box-danger" style="text-align: center; padding: 20px;">
-                <h4 style="color: #003d7a; margin-bottom: 10px;">Ditolak</h4>
-                <h3 style="color: #f44336; margin: 0;">{100-approval_rate:.1f}%</h3>
-                <p style="color: #90a4ae; font-size: 14px; margin-top: 5px;">{reject_count:,} aplikasi ditolak</p>
+                st.markdown("""
+                <div class="metric-box" style="padding: 20px;">
+                <h4 style="color: #003d7a; margin-bottom: 10px;">Ringkasan Statistik</h4>
+                <p style="color: #90a4ae;">Unduh metrik utama dan ringkasan dalam format CSV</p>
                 </div>
                 """, unsafe_allow_html=True)
-            
-    
-    # ====== TAB 8: DATA EXPORT ======
-    with tab8:
-        st.markdown("## Unduh Data & Laporan")
-        
-        st.markdown("""
-        <div class="info-box">
-        <h4>Cara Mengunduh Data</h4>
-        <p>Anda dapat mengunduh data dalam format CSV untuk analisis lebih lanjut:</p>
-        <ul>
-            <li><strong>Data Lengkap</strong>: Semua data yang sudah difilter dengan kolom penting</li>
-            <li><strong>Ringkasan Statistik</strong>: Metrik utama dan ringkasan analisis</li>
-        </ul>
-        </div>
-        """, unsafe_allow_html=True)
-        
-        st.markdown("---")
-        st.markdown("### Pratinjau Data")
-        st.caption("*Menampilkan 100 baris pertama dari data yang difilter*")
-        
-        display_cols = [
-            'apps_id', 'apps_status_clean', 'action_on_parsed',
-            'Recommendation_parsed', 'SLA_Formatted', 'SLA_Hours',
-            'Scoring_Detail', 'OSPH_Category', 'Segmen_clean',
-            'JenisKendaraan_clean', 'Pekerjaan_clean', 'LastOD_clean',
-            'user_name_clean', 'branch_name_clean'
-        ]
-        
-        col_rename = {
-            'apps_id': 'AppID',
-            'apps_status_clean': 'Status',
-            'action_on_parsed': 'Waktu Aksi',
-            'Recommendation_parsed': 'Waktu Rekomendasi',
-            'SLA_Formatted': 'SLA',
-            'SLA_Hours': 'SLA (Jam)',
-            'Scoring_Detail': 'Hasil Penilaian',
-            'OSPH_Category': 'Kategori Plafon',
-            'Segmen_clean': 'Segmen',
-            'JenisKendaraan_clean': 'Jenis Kendaraan',
-            'Pekerjaan_clean': 'Pekerjaan',
-            'LastOD_clean': 'Last OD (Hari)',
-            'user_name_clean': 'Credit Analyst',
-            'branch_name_clean': 'Cabang'
-        }
-        
-        available_cols = [c for c in display_cols if c in df_filtered.columns]
-        display_df = df_filtered[available_cols].head(100).rename(columns=col_rename)
-        
-        st.dataframe(
-            display_df,
-            use_container_width=True,
-            hide_index=True,
-            height=400
-        )
-        
-        st.caption(f"Menampilkan 100 dari {len(df_filtered):,} baris data")
-        
-        st.markdown("---")
-        st.markdown("### Unduh File")
-        
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            st.markdown("""
-            <div class="metric-box-success" style="padding: 20px;">
-            <h4 style="color: #003d7a; margin-bottom: 10px;">Data Lengkap</h4>
-            <p style="color: #90a4ae;">Unduh semua data yang sudah difilter dalam format CSV</p>
-            </div>
-            """, unsafe_allow_html=True)
-            
-            csv_data = df_filtered[available_cols].to_csv(index=False)
-            st.download_button(
-                "📥 Unduh Data Lengkap (CSV)",
-                csv_data,
-                "data_analisis_kredit.csv",
-                "text/csv",
-                use_container_width=True
-            )
-        
-        with col2:
-            st.markdown("""
-            <div class="metric-box" style="padding: 20px;">
-            <h4 style="color: #003d7a; margin-bottom: 10px;">Ringkasan Statistik</h4>
-            <p style="color: #90a4ae;">Unduh metrik utama dan ringkasan dalam format CSV</p>
-            </div>
-            """, unsafe_allow_html=True)
-            
-            df_distinct_export = df_filtered.drop_duplicates('apps_id')
-            approve_count = df_distinct_export['Scoring_Detail'].isin(['APPROVE', 'APPROVE 1', 'APPROVE 2']).sum()
-            total_scored = len(df_distinct_export[df_distinct_export['Scoring_Detail'] != '(Semua)'])
-            
-            summary_data = {
-                'Metrik': [
-                    'Total Catatan',
-                    'Total AppID',
-                    'Data SLA Lengkap',
-                    'Rata-rata Waktu Proses (jam)',
-                    'Tingkat Persetujuan'
-                ],
-                'Nilai': [
-                    f"{len(df_filtered):,}",
-                    f"{df_filtered['apps_id'].nunique():,}",
-                    f"{df_filtered['SLA_Hours'].notna().sum():,}",
-                    f"{df_filtered['SLA_Hours'].mean():.2f}" if df_filtered['SLA_Hours'].notna().any() else "0",
-                    f"{approve_count / total_scored * 100:.1f}%" if total_scored > 0 else "0%"
-                ]
-            }
-            summary_df = pd.DataFrame(summary_data)
-            csv_summary = summary_df.to_csv(index=False)
-            st.download_button(
-                " Unduh Ringkasan (CSV)",
-                csv_summary,
-                "ringkasan_statistik.csv",
-                "text/csv",
-                use_container_width=True
+
+                summary_df = cached_aggregate(dataset_version, filter_key, build_export_summary, filtered_cube('status_scoring'))
+                st.download_button(
+                    " Unduh Ringkasan (CSV)",
+                    summary_df.to_csv(index=False),
+                    "ringkasan_statistik.csv",
+                    "text/csv",
+                    use_container_width=True
+                )
+
+    if PERF_INSTRUMENTATION:
+        # Statistik cache agregat (setelah semua tab, supaya hit/miss rerun ini ikut terhitung)
+        with st.sidebar.expander("Cache Agregat"):
+            st.dataframe(
+                pd.DataFrame(list(get_aggregate_cache().stats().items()), columns=['Metrik', 'Nilai']).astype(str),
+                use_container_width=True,
+                hide_index=True
             )
+        render_perf_panel(perf_run)
 
-    
     st.markdown("---")
     
     # Footer
@@ -0,0 +1,83 @@
+"""
+Cek kesetaraan engine SLA: calculate_sla_working_hours_bulk vs calculate_sla_working_hours per baris
+vs referensi per-hari _sla_day_walk (engine lama, tanpa WorkingTimeIndex).
+
+Pasangan timestamp acak dibuat dalam detik bulat (seperti export yang tidak menyimpan milidetik)
+ditambah pasangan dengan mikrodetik. Detik bulat penting: durasi kelipatan 18 detik ganjil
+menghasilkan jam tepat di .xx5 (mis. 2646 detik = 0.735 jam), kasus yang tidak muncul di
+workbook bawaan karena hampir semua timestamp-nya bermikrodetik. Exit code 1 jika ada beda.
+
+Contoh:
+    python benchmarks/check_sla_equivalence.py
+    python benchmarks/check_sla_equivalence.py --pairs 50000 --seed 3
+"""
+import argparse
+import logging
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import HistoricalCA as H  # noqa: E402
+
+
+def random_pairs(n, seed=0, whole_seconds=True, start='2024-01-01', end='2026-12-31'):
+    """(start, end) datetime64[us] acak; separuh durasi pendek (< 1 hari) supaya banyak kasus .xx5"""
+    rng = np.random.default_rng(seed)
+    span_us = int((np.datetime64(end) - np.datetime64(start)) / np.timedelta64(1, 'us'))
+    unit = 1_000_000 if whole_seconds else 1
+    starts = np.datetime64(start, 'us') + (rng.integers(0, span_us // unit, n) * unit).astype('timedelta64[us]')
+    durations = np.where(
+        rng.random(n) < 0.5,
+        rng.integers(1, 86_400 * 1_000_000 // unit, n),
+        rng.integers(1, 30 * 86_400 * 1_000_000 // unit, n)
+    ) * unit
+    return starts, starts + durations.astype('timedelta64[us]')
+
+
+EMPTY = {'total_hours': np.nan, 'formatted': None}
+
+
+def compare(starts, ends):
+    """DataFrame baris yang berbeda antara versi bulk, per baris dan per hari"""
+    bulk = H.calculate_sla_working_hours_bulk(pd.Series(starts), pd.Series(ends), H.get_shift_calendar())
+    rows = []
+    for i, (start, end) in enumerate(zip(pd.Series(starts), pd.Series(ends))):
+        results = {
+            'bulk': {'total_hours': bulk['total_hours'].iloc[i], 'formatted': bulk['formatted'].iloc[i]},
+            'scalar': H.calculate_sla_working_hours(start, end) or EMPTY,
+            'day_walk': H._sla_day_walk(start, end) or EMPTY
+        }
+        hours = [r['total_hours'] for r in results.values()]
+        same_hours = all(pd.isna(h) for h in hours) or len(set(hours)) == 1
+        if not same_hours or len({r['formatted'] for r in results.values()}) > 1:
+            row = {'start': start, 'end': end}
+            for name, result in results.items():
+                row[f'{name}_hours'], row[f'{name}_formatted'] = result['total_hours'], result['formatted']
+            rows.append(row)
+    return pd.DataFrame(rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--pairs', type=int, default=20_000, help='jumlah pasangan per jenis timestamp')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    H.get_perf_logger().setLevel(logging.WARNING)
+
+    failed = False
+    for label, whole_seconds in [('detik bulat', True), ('mikrodetik', False)]:
+        mismatches = compare(*random_pairs(args.pairs, args.seed, whole_seconds))
+        print(f"{label:>12}: {len(mismatches)} dari {args.pairs} pasangan berbeda")
+        if len(mismatches):
+            print(mismatches.head(10).to_string(index=False))
+            failed = True
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,216 @@
+"""
+Generator data sintetis Historical CA untuk benchmark.
+
+Kolom sama dengan export asli (semua kolom di required_cols load_data + position_code/user_code).
+Setiap apps_id punya urutan status multi-step (PENDING CA > Pending CA Completed > RECOMMENDED ...,
+termasuk duplikat RECOMMENDED CA), timestamp mengikuti jam kerja dan digeser melewati weekend &
+tanggal merah, dengan sebagian kecil aksi di luar jam kerja / hari libur seperti data asli.
+
+Contoh:
+    python benchmarks/generate_data.py --rows 10000 100000 1000000
+    python benchmarks/generate_data.py --rows 10000 --format xlsx
+"""
+import argparse
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from HistoricalCA import get_holiday_calendar  # noqa: E402
+
+DATA_DIR = Path(__file__).resolve().parent / "data"
+DEFAULT_SIZES = [10_000, 100_000, 1_000_000]
+
+# Urutan status per AppID dan bobotnya (proporsi mengikuti export asli)
+STATUS_PATHS = [
+    (['RECOMMENDED CA WITH COND'], 0.394),
+    (['RECOMMENDED CA'], 0.368),
+    (['PENDING CA', 'Pending CA Completed', 'RECOMMENDED CA WITH COND'], 0.098),
+    (['NOT RECOMMENDED CA'], 0.063),
+    (['PENDING CA', 'Pending CA Completed', 'RECOMMENDED CA'], 0.051),
+    (['PENDING CA', 'Pending CA Completed', 'NOT RECOMMENDED CA'], 0.019),
+    (['RECOMMENDED CA', 'RECOMMENDED CA'], 0.004),
+    (['RECOMMENDED CA WITH COND', 'RECOMMENDED CA WITH COND'], 0.001),
+    (['PENDING CA'], 0.001),
+    (['PENDING CA', 'Pending CA Completed', 'RECOMMENDED CA WITH COND', 'RECOMMENDED CA WITH COND'], 0.001),
+]
+
+SEGMEN = (['CS USED', 'KKB', 'CS NEW', '-'], [0.364, 0.353, 0.282, 0.001])
+PEKERJAAN = (
+    ['Wiraswasta', 'Karyawan', '-', 'Ibu Rumah Tangga', 'ABRI', 'Professional', 'Pengacara', 'Lainnya'],
+    [0.526, 0.329, 0.104, 0.023, 0.010, 0.005, 0.002, 0.001]
+)
+JABATAN = (
+    ['PEMILIK', '-', 'OWNER', 'GURU', 'DIREKTUR', 'STAFF', 'MANAGER', 'SUPERVISOR', 'KARYAWAN SWASTA'],
+    [0.455, 0.123, 0.064, 0.015, 0.013, 0.010, 0.007, 0.006, 0.307]
+)
+HASIL_SCORING = (
+    ['REGULER 2', 'REJECT', 'REJECT 1', '-', 'APPROVE 2', 'APPROVE 1', 'REGULER', 'REGULER 1', 'APPROVE', 'REJECT 2'],
+    [0.332, 0.237, 0.162, 0.104, 0.047, 0.041, 0.029, 0.028, 0.019, 0.001]
+)
+JENIS_KENDARAAN = (['Mb. Penumpang', 'Mb. Beban', '-'], [0.771, 0.227, 0.002])
+TUJUAN_KREDIT = (
+    ['konsumsi', 'KEPERLUAN KONSUMTIF', 'multiguna', 'modal kerja', 'Keperluan Konsumtif',
+     'MODAL KERJA', 'Modal Kerja', 'investasi'],
+    [0.565, 0.111, 0.096, 0.060, 0.056, 0.022, 0.018, 0.072]
+)
+DESC_STATUS = (
+    ['ok', 'Harga Unit sesuai MRP', 'DP MIN 40 ADDM', 'DP MIN 40 ADDM_x000D_\n', 'Oke',
+     'DP MIN 30 ADDM_x000D_\n', 'OK', 'DP MIN 30 ADDM', 'Data lengkap, kapasitas cukup'],
+    [0.26, 0.24, 0.09, 0.06, 0.06, 0.05, 0.05, 0.03, 0.16]
+)
+
+# Jam aksi CA (distribusi per jam dari export asli, termasuk lembur malam)
+ACTION_HOURS = np.arange(7, 22)
+ACTION_HOUR_WEIGHTS = np.array([7, 143, 618, 930, 1524, 212, 1036, 1300, 1342, 2032, 3200, 403, 50, 45, 3], dtype=float)
+
+# Sebagian kecil aksi memang terjadi di weekend / tanggal merah
+OFF_DAY_SHARE = 0.03
+
+
+def _choice(rng, options, size):
+    values, weights = options
+    weights = np.asarray(weights, dtype=float)
+    return np.asarray(values, dtype=object)[rng.choice(len(values), size=size, p=weights / weights.sum())]
+
+
+def _roll_to_workday(days, rng):
+    """Geser tanggal (datetime64[D]) yang jatuh di weekend / tanggal merah ke hari kerja berikutnya"""
+    rolled = np.busday_offset(days, 0, roll='forward', busdaycal=get_holiday_calendar().busdaycal)
+    keep_off_day = rng.random(len(days)) < OFF_DAY_SHARE
+    return np.where(keep_off_day, days, rolled)
+
+
+def _timestamps(days, rng):
+    """Tanggal + jam aksi (distribusi jam kerja) + menit/detik/milidetik acak"""
+    hours = rng.choice(ACTION_HOURS, size=len(days), p=ACTION_HOUR_WEIGHTS / ACTION_HOUR_WEIGHTS.sum())
+    offset_ms = hours * 3_600_000 + rng.integers(0, 3_600_000, size=len(days))
+    return days.astype('datetime64[ms]') + offset_ms.astype('timedelta64[ms]')
+
+
+def generate(rows, seed=0, start='2024-01-02', end='2025-12-31'):
+    """DataFrame export Historical CA sintetis dengan tepat `rows` baris"""
+    rng = np.random.default_rng(seed)
+
+    path_weights = np.array([w for _, w in STATUS_PATHS])
+    path_lengths = np.array([len(p) for p, _ in STATUS_PATHS])
+    # Kandidat AppID sedikit berlebih, dipotong setelah jumlah step diketahui
+    n_apps = int(rows / (path_weights / path_weights.sum() @ path_lengths) * 1.1) + 10
+
+    path_idx = rng.choice(len(STATUS_PATHS), size=n_apps, p=path_weights / path_weights.sum())
+    steps = path_lengths[path_idx]
+    # Potong AppID terakhir supaya jumlah baris tepat
+    cum_steps = np.cumsum(steps)
+    n_apps = int(np.searchsorted(cum_steps, rows) + 1)
+    path_idx, steps = path_idx[:n_apps], steps[:n_apps].copy()
+    steps[-1] -= cum_steps[n_apps - 1] - rows
+
+    app_ids = 4_700_000 + rng.choice(rows * 4, size=n_apps, replace=False)
+
+    # Atribut per AppID
+    n_branches = max(375, rows // 40)
+    n_cas = max(9, rows // 1500)
+    app_attrs = pd.DataFrame({
+        'apps_id': app_ids,
+        'Segmen': _choice(rng, SEGMEN, n_apps),
+        'Outstanding_PH': np.round(np.exp(rng.normal(np.log(215e6), 0.75, n_apps))).clip(3e7, 6e9).astype(np.int64),
+        'Pekerjaan': _choice(rng, PEKERJAAN, n_apps),
+        'Jabatan': _choice(rng, JABATAN, n_apps),
+        'Hasil_Scoring': _choice(rng, HASIL_SCORING, n_apps),
+        'JenisKendaraan': _choice(rng, JENIS_KENDARAAN, n_apps),
+        'branch_name': np.char.add('CABANG ', np.char.add(rng.integers(1, n_branches + 1, n_apps).astype(str), ' S2P')),
+        'Tujuan_Kredit': _choice(rng, TUJUAN_KREDIT, n_apps),
+    })
+
+    # Recommendation: hari kerja acak dalam rentang, jam kerja
+    span_days = (np.datetime64(end) - np.datetime64(start)).astype(int)
+    rec_days = _roll_to_workday(np.datetime64(start) + rng.integers(0, span_days, n_apps).astype('timedelta64[D]'), rng)
+    recommendation = _timestamps(rec_days, rng)
+
+    # Baris per step
+    app_pos = np.repeat(np.arange(n_apps), steps)
+    step_no = np.arange(len(app_pos)) - np.repeat(np.cumsum(steps) - steps, steps)
+    status = np.array([STATUS_PATHS[p][0][s] for p, s in zip(path_idx[app_pos], step_no)], dtype=object)
+
+    # Jeda: step pertama median ~1 hari kerja dari Recommendation, step berikutnya median ~1 jam (ekor panjang)
+    gap_hours = np.where(
+        step_no == 0,
+        np.exp(rng.normal(np.log(24), 0.9, len(app_pos))),
+        np.exp(rng.normal(np.log(1.3), 2.0, len(app_pos)))
+    ).clip(0.01, 2500)
+    gap_ms = pd.Series((gap_hours * 3_600_000).astype(np.int64)).groupby(app_pos).cumsum().to_numpy()
+    action = recommendation[app_pos] + gap_ms.astype('timedelta64[ms]')
+    # Aksi yang jatuh di hari libur dipindah ke hari kerja berikutnya (jam dipertahankan),
+    # aksi tengah malam diberi jam kerja baru pada hari yang sama
+    action_days = action.astype('datetime64[D]')
+    time_of_day = action - action_days
+    at_night = (time_of_day < np.timedelta64(ACTION_HOURS[0], 'h')) | (time_of_day >= np.timedelta64(ACTION_HOURS[-1] + 1, 'h'))
+    action_days = _roll_to_workday(action_days, rng)
+    action = np.where(at_night, _timestamps(action_days, rng), action_days.astype('datetime64[ms]') + time_of_day)
+    # Urutan (Recommendation < aksi pertama < aksi berikutnya) tetap naik setelah digeser
+    action = np.maximum(action, recommendation[app_pos] + np.timedelta64(10, 'm'))
+    action = pd.Series(action).groupby(app_pos).cummax().to_numpy()
+
+    cas = np.char.add('CA Sintetis ', rng.integers(1, n_cas + 1, len(app_pos)).astype(str))
+    last_od = np.where(rng.random(len(app_pos)) < 0.97, '-', rng.integers(0, 30, len(app_pos)).astype(object))
+    max_od = np.where(rng.random(len(app_pos)) < 0.5, '-', rng.geometric(0.6, len(app_pos)) - 1).astype(object)
+
+    df = pd.DataFrame({
+        'apps_id': app_ids[app_pos],
+        'position_code': 'CA',
+        'position_name': 'CREDIT ANALYST STAFF',
+        'user_code': 5000 + np.char.partition(cas, ' Sintetis ')[:, 2].astype(int),
+        'user_name': cas,
+        'apps_status': status,
+        'desc_status_apps': _choice(rng, DESC_STATUS, len(app_pos)),
+        'action_on': pd.to_datetime(action).as_unit('us'),
+        'Recommendation': pd.to_datetime(recommendation[app_pos]).as_unit('us'),
+        'LastOD': last_od,
+        'max_OD': max_od,
+    })
+    df = df.merge(app_attrs, on='apps_id', how='left')
+
+    # Export asli tidak terurut per AppID
+    return df.sample(frac=1, random_state=seed).reset_index(drop=True)
+
+
+def output_path(rows, fmt='parquet', data_dir=DATA_DIR):
+    """Lokasi file data sintetis untuk ukuran tertentu"""
+    return Path(data_dir) / f"historical_ca_synthetic_{rows}.{fmt}"
+
+
+def write(df, path):
+    """Simpan sebagai parquet (cepat, untuk benchmark stage) atau xlsx (untuk benchmark read_excel, lambat untuk 1M baris)"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if path.suffix == '.xlsx':
+        if len(df) > 1_048_575:
+            raise ValueError(f"{len(df):,} baris melebihi batas sheet Excel")
+        df.to_excel(path, index=False)
+    else:
+        # Parquet tidak bisa menyimpan kolom campuran '-' & angka; nilai OD disimpan sebagai teks
+        # (preprocess_data tetap mem-parse-nya dengan pd.to_numeric)
+        df.astype({'LastOD': str, 'max_OD': str}).to_parquet(path, index=False)
+    return path
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, nargs='+', default=DEFAULT_SIZES)
+    parser.add_argument('--format', choices=['parquet', 'xlsx'], default='parquet')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--out', type=Path, default=DATA_DIR)
+    args = parser.parse_args()
+
+    for rows in args.rows:
+        df = generate(rows, seed=args.seed)
+        path = write(df, output_path(rows, args.format, args.out))
+        print(f"{rows:>10,} baris, {df['apps_id'].nunique():,} AppID -> {path}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,253 @@
+"""
+Harness latency rerun end-to-end HistoricalCA.py dengan Streamlit AppTest (headless).
+
+Menjalankan sesi analis yang di-script: load pertama, kunjungan setiap tab, perubahan filter
+sidebar (status, scoring, segmen, cabang) dan pencarian AppID di tab Data Detail. Setiap rerun
+dicatat latency & memory-nya, lalu dilaporkan p50/p95 per interaksi. Dengan --budget, p95 yang
+melebihi budget membuat exit code 1 (untuk dipasang di CI). Rerun yang error tidak dihitung di
+p50/p95 (dilaporkan terpisah) dan juga membuat exit code 1.
+
+Workbook yang dipakai adalah FILE_NAME di root repo (sama seperti dashboard).
+
+Contoh:
+    python benchmarks/rerun_latency.py
+    python benchmarks/rerun_latency.py --rounds 3 --budget filter=1.0 --budget tab=2.5 --budget search=1.0
+    python benchmarks/rerun_latency.py --trace-memory --label sesudah
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from streamlit.testing.v1 import AppTest
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+ROOT = Path(__file__).resolve().parent.parent
+APP_PATH = ROOT / "HistoricalCA.py"
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+
+TAB_LABELS = [
+    " Waktu Proses", " Data Detail", " Analisis Plafon", " Kinerja Cabang & CA",
+    " Status & Penilaian", " Dampak Keterlambatan", " Insights", " Unduh Data"
+]
+TAB_KEY = "main_tab"
+SEARCH_TAB = " Data Detail"
+
+
+def _rss_mb():
+    """RSS proses saat ini (MB) dari /proc, None jika tidak tersedia"""
+    try:
+        with open('/proc/self/statm') as f:
+            return round(int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / 1e6, 1)
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def _max_rss_mb():
+    if resource is None:
+        return None
+    return round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / (1024 * 1024 if sys.platform == 'darwin' else 1024), 1)
+
+
+class Session:
+    """Satu sesi AppTest; setiap interaksi = satu rerun yang diukur"""
+
+    def __init__(self, timeout):
+        self.at = AppTest.from_file(str(APP_PATH), default_timeout=timeout)
+        self.tab = TAB_LABELS[0]
+        self.samples = []
+
+    def _widget(self, kind, label):
+        return next(w for w in getattr(self.at, kind) if w.label == label)
+
+    def run(self, interaction, detail=''):
+        # AppTest tidak mempertahankan state st.tabs saat widget lain berubah; set ulang tab aktif
+        self.at.session_state[TAB_KEY] = self.tab
+        if tracemalloc.is_tracing():
+            tracemalloc.reset_peak()
+            traced_start = tracemalloc.get_traced_memory()[0]
+
+        start = time.perf_counter()
+        self.at.run()
+        seconds = time.perf_counter() - start
+
+        sample = {
+            'interaction': interaction,
+            'detail': detail,
+            'tab': self.tab.strip(),
+            'seconds': round(seconds, 4),
+            'peak_mb': round((tracemalloc.get_traced_memory()[1] - traced_start) / 1e6, 2) if tracemalloc.is_tracing() else None,
+            'rss_mb': _rss_mb(),
+            'max_rss_mb': _max_rss_mb(),
+            'errors': [e.value[:200] for e in self.at.exception]
+        }
+        self.samples.append(sample)
+        return sample
+
+    def visit(self, tab):
+        self.tab = tab
+        return self.run('tab', tab.strip())
+
+    def multiselect(self, label, values, detail):
+        self._widget('multiselect', label).set_value(values)
+        return self.run('filter', detail)
+
+    def selectbox(self, label, value):
+        self._widget('selectbox', label).select(value)
+        return self.run('filter', f"{label}={value}")
+
+    def search(self, apps_id):
+        if self.tab != SEARCH_TAB:
+            self.visit(SEARCH_TAB)
+        self._widget('text_input', "Masukkan AppID:").input(str(apps_id))
+        return self.run('search', str(apps_id))
+
+
+def scripted_session(rounds, seed, timeout, apps_ids):
+    """Sesi analis tipikal; return list sample per rerun"""
+    rng = random.Random(seed)
+    session = Session(timeout)
+    session.run('first_load')
+    if session.at.exception:
+        raise RuntimeError(f"App gagal dijalankan: {session.at.exception[0].value}")
+
+    status = session._widget('multiselect', "Status Aplikasi")
+    scoring = session._widget('multiselect', "Hasil Penilaian")
+    all_status, all_scoring = list(status.options), list(scoring.options)
+    segmen_options = list(session._widget('selectbox', "Segmen Kredit").options)
+    branch_options = list(session._widget('selectbox', "Cabang").options)
+
+    for _ in range(rounds):
+        for tab in TAB_LABELS:
+            session.visit(tab)
+
+        # Perubahan filter dilakukan dari tab yang sedang dibuka analis
+        session.visit(rng.choice(TAB_LABELS))
+        dropped = rng.choice(all_status)
+        session.multiselect("Status Aplikasi", [s for s in all_status if s != dropped], f"Status Aplikasi-{dropped}")
+        session.multiselect("Status Aplikasi", all_status, "Status Aplikasi=semua")
+        dropped = rng.choice(all_scoring)
+        session.multiselect("Hasil Penilaian", [s for s in all_scoring if s != dropped], f"Hasil Penilaian-{dropped}")
+        session.multiselect("Hasil Penilaian", all_scoring, "Hasil Penilaian=semua")
+        for segmen in segmen_options[1:] + segmen_options[:1]:
+            session.selectbox("Segmen Kredit", segmen)
+        for branch in rng.sample(branch_options[1:], min(3, len(branch_options) - 1)) + branch_options[:1]:
+            session.selectbox("Cabang", branch)
+
+        for apps_id in rng.sample(apps_ids, min(3, len(apps_ids))) + [1]:
+            session.search(apps_id)
+        session._widget('text_input', "Masukkan AppID:").input("")
+        session.run('search', 'kosong')
+
+    return session.samples
+
+
+def summarize(samples):
+    """
+    p50/p95/max latency dan memory per jenis interaksi.
+    Rerun yang error (script berhenti di tengah) tidak ikut dihitung, jumlahnya dilaporkan di kolom errors.
+    """
+    table = pd.DataFrame(samples)
+    rows = []
+    for interaction, group in table.groupby('interaction', sort=False):
+        failed = group['errors'].map(len) > 0
+        clean = group[~failed]
+        seconds = clean['seconds'].to_numpy()
+        row = {
+            'interaction': interaction,
+            'n': len(clean),
+            'p50_s': round(float(np.percentile(seconds, 50)), 3) if len(seconds) else None,
+            'p95_s': round(float(np.percentile(seconds, 95)), 3) if len(seconds) else None,
+            'max_s': round(float(seconds.max()), 3) if len(seconds) else None,
+            'errors': int(failed.sum())
+        }
+        if clean['peak_mb'].notna().any():
+            row['p95_peak_mb'] = round(float(np.percentile(clean['peak_mb'].dropna(), 95)), 2)
+        if clean['rss_mb'].notna().any():
+            row['max_rss_mb'] = round(float(clean['rss_mb'].max()), 1)
+        rows.append(row)
+    return pd.DataFrame(rows)
+
+
+def check_budgets(summary, budgets):
+    """List pelanggaran budget p95 (detik) per interaksi"""
+    violations = []
+    for interaction, budget in budgets.items():
+        match = summary[summary['interaction'] == interaction]
+        if len(match) and pd.notna(match['p95_s'].iloc[0]) and match['p95_s'].iloc[0] > budget:
+            violations.append(f"{interaction}: p95 {match['p95_s'].iloc[0]:.3f}s > budget {budget:.3f}s")
+    return violations
+
+
+def _parse_budget(value):
+    interaction, _, seconds = value.partition('=')
+    return interaction, float(seconds)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rounds', type=int, default=2, help='jumlah putaran skenario (tab, filter, pencarian)')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--timeout', type=float, default=300, help='timeout per rerun (detik)')
+    parser.add_argument('--budget', type=_parse_budget, action='append', default=[],
+                        help='budget p95 per interaksi, mis. filter=1.0 (boleh diulang)')
+    parser.add_argument('--trace-memory', action='store_true', help='peak memory per rerun lewat tracemalloc (latency ikut naik)')
+    parser.add_argument('--label', default=datetime.now().strftime('%Y%m%d-%H%M%S'))
+    args = parser.parse_args()
+
+    # FILE_NAME di app relatif terhadap working directory
+    os.chdir(ROOT)
+    sys.path.insert(0, str(ROOT))
+    from HistoricalCA import FILE_NAME
+
+    apps_ids = pd.read_excel(FILE_NAME, usecols=['apps_id'])['apps_id'].drop_duplicates().tolist()
+
+    if args.trace_memory:
+        tracemalloc.start()
+
+    samples = scripted_session(args.rounds, args.seed, args.timeout, apps_ids)
+    summary = summarize(samples)
+    errors = [s for s in samples if s['errors']]
+
+    RESULTS_DIR.mkdir(parents=True, exist_ok=True)
+    path = RESULTS_DIR / f"latency-{args.label}.json"
+    path.write_text(json.dumps({
+        'meta': {
+            'label': args.label,
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'rounds': args.rounds,
+            'seed': args.seed,
+            'trace_memory': args.trace_memory,
+            # Hasil dengan rerun error bukan baseline yang valid
+            'clean': not errors
+        },
+        'summary': summary.to_dict(orient='records'),
+        'samples': samples
+    }, indent=2, default=str))
+
+    print(summary.to_string(index=False))
+    print(f"\nHasil disimpan: {path}")
+
+    violations = check_budgets(summary, dict(args.budget))
+    for violation in violations:
+        print(f"BUDGET TERLAMPAUI  {violation}")
+    for sample in errors:
+        print(f"ERROR  {sample['interaction']} {sample['detail']}: {sample['errors'][0]}")
+    if errors:
+        print(f"\n{len(errors)} rerun error (tidak dihitung di p50/p95); hasil ini bukan baseline yang valid")
+    sys.exit(1 if violations or errors else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,223 @@
+"""
+Benchmark per stage pipeline load dan compute tab HistoricalCA pada data sintetis.
+
+Setiap ukuran data (lihat generate_data.py) dijalankan --repeat kali: stage load
+(read_excel jika ada file xlsx, preprocess_data + remove_duplicate_status, calculate_sla_per_status,
+compact_dtypes, normalisasi), turunan per rerun (filter index, cube agregat, fact table) dan builder
+setiap tab (termasuk roll-up cube keluarganya). Waktu & memory diukur dengan perf_stage dari
+HistoricalCA, median per stage disimpan ke benchmarks/results/<label>.json untuk dibandingkan antar versi.
+
+Contoh:
+    python benchmarks/run_benchmarks.py --rows 10000 100000 1000000 --label sebelum
+    python benchmarks/run_benchmarks.py --rows 10000 100000 --label sesudah --compare benchmarks/results/sebelum.json
+    python benchmarks/run_benchmarks.py --rows 10000 --trace-memory
+    python benchmarks/run_benchmarks.py --rows 1000000 --sla-workers 1 --label serial
+"""
+import argparse
+import json
+import logging
+import platform
+import statistics
+import subprocess
+import sys
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+import generate_data
+
+sys.path.insert(0, str(generate_data.ROOT))
+
+import HistoricalCA as H  # noqa: E402
+
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+
+# Kolom export Tab 8 yang dipakai benchmark export
+EXPORT_COLUMNS = [
+    'apps_id', 'user_name_clean', 'apps_status_clean', 'action_on_parsed', 'Recommendation_parsed',
+    'SLA_Hours', 'SLA_Formatted', 'Segmen_clean', 'branch_name_clean', 'OSPH_clean', 'Scoring_Detail'
+]
+
+# Builder yang dijalankan tiap tab (sama dengan cached_aggregate di main); cube(family) = roll-up
+# cube keluarga tab untuk filter benchmark, dihitung di dalam stage tab seperti di main
+TAB_BUILDERS = {
+    'Waktu Proses': lambda df, facts, cube: [H.build_monthly_rollup(cube('monthly')), H.build_status_sla(df)],
+    'Data Detail': lambda df, facts, cube: [H.build_apps_summary(facts)],
+    'Analisis Plafon': lambda df, facts, cube: [
+        H.build_osph_pivots(cube('osph'), dim_col, label) for dim_col, label in [
+            ('Pekerjaan_clean', 'Pekerjaan'), ('apps_status_clean', 'Status'),
+            ('JenisKendaraan_clean', 'Jenis Kendaraan'), ('Scoring_Detail', 'Hasil Scoring')
+        ]
+    ],
+    'Kinerja Cabang & CA': lambda df, facts, cube: [
+        H.build_branch_performance(cube('branch')), H.build_ca_performance(cube('ca'))
+    ],
+    'Status & Penilaian': lambda df, facts, cube: [H.build_status_scoring_crosstab(cube('status_scoring'))],
+    'Dampak Keterlambatan': lambda df, facts, cube: [
+        H.build_od_approval(cube('od'), 'LastOD_clean'), H.build_od_approval(cube('od'), 'max_OD_clean')
+    ],
+    'Unduh Data': lambda df, facts, cube: [
+        H.build_export_summary(cube('status_scoring')),
+        H.export_csv(df, [c for c in EXPORT_COLUMNS if c in df.columns]),
+        H.export_parquet(df, [c for c in EXPORT_COLUMNS if c in df.columns])
+    ],
+}
+
+
+def _run_once(raw, xlsx_path):
+    """Satu putaran semua stage; return run id perf log"""
+    run_id = H.start_perf_run()
+
+    if xlsx_path is not None:
+        with H.perf_stage('read_excel') as record:
+            record['rows_out'] = len(pd.read_excel(xlsx_path))
+
+    df = H.preprocess_data(raw)
+    df = H.calculate_sla_per_status(df)
+    if H.COMPACT_DTYPES:
+        df = H.compact_dtypes(df)
+    with H.perf_stage('normalize_mixed_columns', rows_in=len(df)):
+        df = H._normalize_mixed_columns(df)
+
+    with H.perf_stage('filter_index', scope='rerun', rows_in=len(df)):
+        filter_index = H.FilterIndex(df)
+    with H.perf_stage('aggregate_cube', scope='rerun', rows_in=len(df)) as record:
+        cube = H.AggregateCube(df)
+        record['rows_out'] = sum(len(family) for family in cube.cubes.values())
+    # Filter tipikal: satu segmen, status & scoring bawaan sidebar
+    segmen = df['Segmen_clean'].value_counts().index[0]
+    selections = {'Segmen_clean': [segmen]}
+    with H.perf_stage('filter', scope='rerun', rows_in=len(df)) as record:
+        positions = filter_index.select(selections)
+        df_filtered = df if positions is None else df.iloc[positions]
+        record['rows_out'] = len(df_filtered)
+    with H.perf_stage('build_app_facts', scope='rerun', rows_in=len(df_filtered)) as record:
+        facts = H.build_app_facts(df_filtered)
+        record['rows_out'] = len(facts)
+
+    for tab, build in TAB_BUILDERS.items():
+        with H.perf_stage(tab, scope='tab', rows_in=len(df_filtered)):
+            build(df_filtered, facts, lambda family: cube.rollup(selections, family))
+
+    return run_id
+
+
+def run(sizes, repeat=3, data_dir=generate_data.DATA_DIR, with_xlsx=False):
+    """Jalankan benchmark untuk setiap ukuran; return list hasil median per stage"""
+    results = []
+    for rows in sizes:
+        parquet_path = generate_data.output_path(rows, 'parquet', data_dir)
+        if not parquet_path.exists():
+            generate_data.write(generate_data.generate(rows), parquet_path)
+        raw = pd.read_parquet(parquet_path)
+
+        xlsx_path = generate_data.output_path(rows, 'xlsx', data_dir)
+        if with_xlsx and not xlsx_path.exists() and rows <= 1_048_575:
+            generate_data.write(generate_data.generate(rows), xlsx_path)
+        xlsx_path = xlsx_path if xlsx_path.exists() else None
+
+        run_ids = [_run_once(raw, xlsx_path) for _ in range(repeat)]
+        records = [r for r in H.get_perf_log().records() if r['run'] in run_ids]
+
+        stages = {}
+        for record in records:
+            stages.setdefault((record['scope'], record['stage'], record['depth']), []).append(record)
+        for (scope, stage, depth), stage_records in stages.items():
+            peaks = [r['peak_mb'] for r in stage_records if r['peak_mb'] is not None]
+            results.append({
+                'rows': rows,
+                'scope': scope,
+                'stage': stage,
+                'depth': depth,
+                'rows_in': stage_records[-1]['rows_in'],
+                'rows_out': stage_records[-1]['rows_out'],
+                'seconds': round(statistics.median(r['seconds'] for r in stage_records), 4),
+                'best_seconds': min(r['seconds'] for r in stage_records),
+                'peak_mb': max(peaks) if peaks else None,
+                'repeat': len(stage_records)
+            })
+        print(f"{rows:>10,} baris selesai ({repeat}x)", file=sys.stderr)
+    return results
+
+
+def _git_commit():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=generate_data.ROOT,
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def save(results, label, repeat):
+    """Simpan hasil + metadata environment ke results/<label>.json"""
+    RESULTS_DIR.mkdir(parents=True, exist_ok=True)
+    path = RESULTS_DIR / f"{label}.json"
+    path.write_text(json.dumps({
+        'meta': {
+            'label': label,
+            'git_commit': _git_commit(),
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'pandas': pd.__version__,
+            'numpy': np.__version__,
+            'platform': platform.platform(),
+            'repeat': repeat,
+            'trace_memory': H.PERF_TRACE_MEMORY,
+            'sla_workers': H.resolve_workers(H.SLA_WORKERS)
+        },
+        'results': results
+    }, indent=2))
+    return path
+
+
+def report(results, baseline=None):
+    """Tabel hasil; jika ada baseline, tambahkan kolom waktu baseline & rasio"""
+    table = pd.DataFrame(results).astype({'rows_in': 'Int64', 'rows_out': 'Int64'})
+    table['stage'] = ['  ' * depth + stage for depth, stage in zip(table['depth'], table['stage'])]
+    columns = ['rows', 'scope', 'stage', 'rows_in', 'rows_out', 'seconds', 'peak_mb']
+    if baseline is not None:
+        base = pd.DataFrame(baseline)[['rows', 'scope', 'stage', 'depth', 'seconds']]
+        base['stage'] = ['  ' * depth + stage for depth, stage in zip(base['depth'], base['stage'])]
+        table = table.merge(
+            base.drop(columns='depth').rename(columns={'seconds': 'baseline_seconds'}),
+            on=['rows', 'scope', 'stage'], how='left'
+        )
+        table['ratio'] = (table['seconds'] / table['baseline_seconds']).round(2)
+        columns += ['baseline_seconds', 'ratio']
+    width = table['stage'].str.len().max()
+    return table[columns].to_string(index=False, formatters={'stage': lambda v: v.ljust(width)})
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, nargs='+', default=generate_data.DEFAULT_SIZES)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--label', default=datetime.now().strftime('%Y%m%d-%H%M%S'))
+    parser.add_argument('--compare', type=Path, help='hasil JSON sebelumnya sebagai baseline')
+    parser.add_argument('--xlsx', action='store_true', help='ukur juga read_excel (membuat file xlsx jika belum ada)')
+    parser.add_argument('--trace-memory', action='store_true', help='peak memory per stage lewat tracemalloc (lebih lambat)')
+    parser.add_argument('--data-dir', type=Path, default=generate_data.DATA_DIR)
+    parser.add_argument('--sla-workers', type=int, default=H.SLA_WORKERS,
+                        help='jumlah proses SLA (default SLA_WORKERS, 1 = serial)')
+    args = parser.parse_args()
+
+    H.PERF_INSTRUMENTATION = True
+    H.PERF_TRACE_MEMORY = args.trace_memory
+    H.PERF_LOG_MAX_ENTRIES = 100_000
+    H.get_perf_logger().setLevel(logging.WARNING)
+    H.SLA_WORKERS = args.sla_workers
+
+    results = run(args.rows, args.repeat, args.data_dir, args.xlsx)
+    path = save(results, args.label, args.repeat)
+
+    baseline = json.loads(args.compare.read_text())['results'] if args.compare else None
+    print(report(results, baseline))
+    print(f"\nHasil disimpan: {path}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,105 @@
+"""
+Kernel perhitungan SLA jam kerja (vectorized) untuk kolom SLA_Hours/SLA_Formatted/SLA_From/SLA_To.
+
+Berada di module tersendiri (bukan di script Streamlit) supaya worker process pool sla_parallel
+(forkserver/spawn) bisa meng-import function ini: script Streamlit dijalankan sebagai __main__ dan
+tidak bisa di-import ulang oleh worker.
+"""
+import numpy as np
+import pandas as pd
+
+# Kolom yang dibaca sla_columns (yang dikirim ke worker hanya kolom ini)
+SLA_INPUT_COLUMNS = [
+    'apps_id', 'action_on_parsed', 'Recommendation_parsed', 'apps_status_clean',
+    'branch_name_clean', 'Segmen_clean'
+]
+
+
+def round_sla_hours(total_hours):
+    """
+    Pembulatan 2 desimal yang sama dengan round(x, 2) Python, untuk array jam SLA.
+    np.round mengalikan x*100 lebih dulu sehingga bisa berbeda di nilai .xx5 (mis. 0.735 jam);
+    nilai di dekat titik tengah dibulatkan satu per satu dengan round().
+    """
+    total_hours = np.array(total_hours, dtype=float, ndmin=1)
+    rounded = np.round(total_hours, 2)
+    scaled = total_hours * 100
+    near_half = np.abs(scaled - np.floor(scaled) - 0.5) < 1e-6
+    rounded[near_half] = [round(float(value), 2) for value in total_hours[near_half]]
+    return rounded
+
+
+def to_datetime64(values):
+    """Convert array-like timestamps ke numpy datetime64[us] (NaT jika tidak valid)"""
+    parsed = pd.to_datetime(pd.Series(values), errors='coerce')
+    return parsed.to_numpy(dtype='datetime64[us]')
+
+
+def shift_rule_ids(df, shift_calendar):
+    """Id rule jam kerja per baris dari branch_name_clean / Segmen_clean (None jika hanya rule default)"""
+    if len(shift_calendar.rules) == 1:
+        return None
+    return shift_calendar.rule_ids(df.get('branch_name_clean'), df.get('Segmen_clean'), len(df))
+
+
+def calculate_sla_working_hours_bulk(start_values, end_values, shift_calendar, rule_ids=None):
+    """
+    Vectorized calculate_sla_working_hours untuk seluruh kolom sekaligus.
+    Hasil identik dengan versi per-baris: kolom 'total_hours' (NaN jika start/end
+    kosong atau end <= start) dan 'formatted' (None untuk baris yang sama).
+    rule_ids (array id rule per baris, lihat shift_rule_ids) memilih jam kerja tiap baris.
+    """
+    index = start_values.index if isinstance(start_values, pd.Series) else None
+    start = to_datetime64(start_values)
+    end = to_datetime64(end_values)
+
+    valid = ~np.isnat(start) & ~np.isnat(end)
+    valid[valid] = end[valid] > start[valid]
+
+    total_us = np.zeros(len(start), dtype=np.int64)
+    if valid.any():
+        total_us[valid] = shift_calendar.working_us_between(
+            start[valid], end[valid], None if rule_ids is None else rule_ids[valid]
+        )
+
+    total_hours = np.where(valid, total_us / 1_000_000 / 3600, np.nan)
+
+    # Format "X jam Y menit" dari jam sebelum dibulatkan (sama seperti convert_hours_to_hm)
+    whole_hours = np.floor(total_hours[valid]).astype(np.int64)
+    minutes = ((total_hours[valid] - whole_hours) * 60).astype(np.int64)
+    formatted = np.full(len(start), None, dtype=object)
+    formatted[valid] = (
+        pd.Series(whole_hours).astype(str) + ' jam ' + pd.Series(minutes).astype(str) + ' menit'
+    ).to_numpy(dtype=object)
+
+    return pd.DataFrame({
+        'total_hours': round_sla_hours(total_hours),
+        'formatted': pd.Series(formatted, dtype=object, index=index)
+    }, index=index)
+
+
+def sla_columns(df, shift_calendar):
+    """Kolom SLA untuk frame yang sudah urut per apps_id/action (seluruh frame atau satu partisi)"""
+    grouped = df.groupby('apps_id', sort=False)
+    is_first = grouped.cumcount().to_numpy() == 0
+    prev_action = grouped['action_on_parsed'].shift()
+    prev_status = grouped['apps_status_clean'].shift()
+
+    # Baris pertama: Recommendation -> action_on, berikutnya: action sebelumnya -> action_on
+    sla_start = df['Recommendation_parsed'].where(is_first, prev_action)
+    sla_result = calculate_sla_working_hours_bulk(
+        sla_start, df['action_on_parsed'], shift_calendar, shift_rule_ids(df, shift_calendar)
+    )
+
+    return pd.DataFrame({
+        'SLA_Hours': sla_result['total_hours'].astype(float),
+        'SLA_Formatted': sla_result['formatted'],
+        'SLA_From': pd.Series(
+            np.where(is_first, 'Recommendation', prev_status.astype(str).to_numpy(dtype=object)),
+            dtype=object, index=df.index
+        ),
+        'SLA_To': pd.Series(
+            np.where(is_first, 'Action', df['apps_status_clean'].astype(str).to_numpy(dtype=object)),
+            dtype=object, index=df.index
+        )
+    }, index=df.index)
@@ -0,0 +1,88 @@
+"""
+Eksekusi paralel per partisi apps_id untuk perhitungan SLA.
+
+Frame yang sudah urut per apps_id dipotong menjadi rentang baris kontigu yang tidak membelah
+satu apps_id pun, lalu setiap rentang diproses di process pool. Pool memakai start method
+'forkserver' ('spawn' jika tidak tersedia, mis. Windows), bukan 'fork': server Streamlit
+multithreaded, dan fork dari proses multithreaded bisa deadlock pada lock yang sedang dipegang
+thread lain. Karena itu function harus bisa di-import oleh worker (module biasa, bukan script
+Streamlit, lihat sla_engine) dan setiap worker menerima function, potongan frame dan argumennya
+secara eksplisit (di-pickle); yang dikirim balik hanya hasilnya.
+
+Satu pool per waktu per proses, supaya session yang load bersamaan tidak saling menambah proses.
+"""
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+# Pool dipakai satu task per waktu (session lain menunggu, bukan membuat pool tambahan)
+_pool_lock = threading.Lock()
+
+
+def resolve_workers(workers):
+    """None/0 = jumlah core yang boleh dipakai proses ini, selain itu minimal 1"""
+    if not workers:
+        if hasattr(os, 'sched_getaffinity'):
+            return len(os.sched_getaffinity(0))
+        return os.cpu_count() or 1
+    return max(1, int(workers))
+
+
+def start_method():
+    """'forkserver' jika tersedia, selain itu 'spawn' (keduanya aman dari proses multithreaded)"""
+    return 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+
+
+def apps_id_partitions(keys, n_partitions):
+    """
+    Batas (start, stop) rentang baris yang kira-kira sama besar untuk keys yang sudah urut,
+    digeser ke awal grup supaya satu apps_id selalu berada di satu partisi.
+    """
+    n_rows = len(keys)
+    if n_partitions <= 1 or n_rows == 0:
+        return [(0, n_rows)]
+    keys = np.asarray(keys)
+    group_starts = np.flatnonzero(np.concatenate(([True], keys[1:] != keys[:-1])))
+    targets = np.arange(1, n_partitions) * n_rows // n_partitions
+    cuts = np.unique(group_starts[np.searchsorted(group_starts, targets).clip(max=len(group_starts) - 1)])
+    bounds = [0, *cuts[cuts > 0].tolist(), n_rows]
+    return [(start, stop) for start, stop in zip(bounds[:-1], bounds[1:]) if stop > start]
+
+
+def _encode(result):
+    """Kolom object -> categorical: hasil yang dikirim balik ke induk jauh lebih kecil & cepat di-pickle"""
+    objects = [col for col in result.columns if result[col].dtype == object]
+    return result.astype({col: 'category' for col in objects}), objects
+
+
+def _decode(encoded):
+    result, objects = encoded
+    for col in objects:
+        result[col] = result[col].astype(object).where(result[col].notna(), None)
+    return result
+
+
+def _run_partition(func, frame, args):
+    """Dijalankan di worker: semua input diterima lewat argumen (tidak ada state global)"""
+    return _encode(func(frame, *args))
+
+
+def map_partitions(func, frame, partitions, workers, *args):
+    """
+    func(frame.iloc[start:stop], *args) untuk setiap partisi, hasil (DataFrame) dalam urutan partisi.
+    func dan args harus bisa di-pickle (function module-level dari module yang bisa di-import).
+    Serial jika hanya satu partisi/worker.
+    """
+    workers = min(resolve_workers(workers), len(partitions))
+    if workers <= 1:
+        return [func(frame.iloc[start:stop], *args) for start, stop in partitions]
+
+    context = multiprocessing.get_context(start_method())
+    with _pool_lock, ProcessPoolExecutor(workers, mp_context=context) as pool:
+        futures = [
+            pool.submit(_run_partition, func, frame.iloc[start:stop], args) for start, stop in partitions
+        ]
+        return [_decode(future.result()) for future in futures]
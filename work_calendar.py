@@ -0,0 +1,332 @@
+"""
+Kalender hari kerja untuk perhitungan SLA.
+
+Tanggal merah dibaca dari file data (satu atau lebih, mis. tanggal_merah.csv dan file
+'tgl merah 2024-2025'), digabung dan di-dedup, lalu dikompilasi sekali menjadi
+numpy busdaycalendar (untuk operasi vectorized) dan set tanggal (lookup O(1) per tanggal).
+
+Jam kerja per cabang/segmen (ShiftRule) dikompilasi menjadi WorkingTimeIndex per rule,
+sehingga SLA untuk campuran cabang tetap dihitung bulk.
+"""
+import re
+import threading
+from datetime import date, datetime
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Tanggal di file data: DD-MM-YYYY (format yang dipakai tim) atau YYYY-MM-DD
+_DATE_PATTERN = re.compile(r'\b(\d{2})-(\d{2})-(\d{4})\b|\b(\d{4})-(\d{2})-(\d{2})\b')
+
+WEEKMASK = '1111100'
+
+
+def parse_dates_in_text(text):
+    """Semua tanggal 'DD-MM-YYYY' / 'YYYY-MM-DD' di dalam teks, sebagai list datetime.date"""
+    days = []
+    for match in _DATE_PATTERN.finditer(text):
+        day, month, year, iso_year, iso_month, iso_day = match.groups()
+        if iso_year:
+            year, month, day = iso_year, iso_month, iso_day
+        days.append(date(int(year), int(month), int(day)))
+    return days
+
+
+def read_holiday_file(path):
+    """
+    Semua tanggal di satu file teks (CSV satu tanggal per baris, daftar Python seperti
+    'tgl merah 2024-2025', dsb). Return list datetime.date.
+    """
+    return parse_dates_in_text(Path(path).read_text(encoding='utf-8'))
+
+
+class HolidayCalendar:
+    """
+    Kalender tanggal merah terkompilasi: array terurut & unik, numpy busdaycalendar
+    (Senin-Jumat minus tanggal merah) dan frozenset untuk lookup per tanggal.
+    """
+
+    def __init__(self, holidays, weekmask=WEEKMASK):
+        self.holidays = np.unique(np.array(list(holidays), dtype='datetime64[D]'))
+        self.weekmask = weekmask
+        self.busdaycal = np.busdaycalendar(weekmask=weekmask, holidays=self.holidays)
+        self.holiday_set = frozenset(self.holidays.astype(object))
+
+    @classmethod
+    def from_files(cls, paths, weekmask=WEEKMASK):
+        """Gabungan tanggal dari semua file yang ada (file yang tidak ada dilewati)"""
+        holidays = []
+        for path in paths:
+            if Path(path).exists():
+                holidays.extend(read_holiday_file(path))
+        return cls(holidays, weekmask)
+
+    def __len__(self):
+        return len(self.holidays)
+
+    @property
+    def year_range(self):
+        """(tahun pertama, tahun terakhir) yang dicakup file tanggal merah"""
+        if len(self.holidays) == 0:
+            this_year = date.today().year
+            return this_year, this_year
+        years = self.holidays[[0, -1]].astype('datetime64[Y]').astype(int) + 1970
+        return int(years[0]), int(years[1])
+
+    def is_holiday(self, day):
+        """True jika tanggal termasuk tanggal merah (O(1))"""
+        if isinstance(day, datetime):
+            day = day.date()
+        return day in self.holiday_set
+
+    def is_working_day(self, day):
+        """True jika hari kerja: bukan weekend dan bukan tanggal merah"""
+        if pd.isna(day):
+            return False
+        if not isinstance(day, (date, datetime)):
+            day = pd.to_datetime(day)
+        if isinstance(day, datetime):
+            day = day.date()
+        return self.weekmask[day.weekday()] == '1' and day not in self.holiday_set
+
+    def busdaycalendar(self, weekmask=None, extra_holidays=()):
+        """
+        busdaycalendar dengan tanggal merah kalender ini: self.busdaycal untuk weekmask standar,
+        selain itu (weekmask shift / libur tambahan) diturunkan dari tanggal merah yang sama
+        """
+        weekmask = weekmask or self.weekmask
+        if weekmask == self.weekmask and len(extra_holidays) == 0:
+            return self.busdaycal
+        return np.busdaycalendar(weekmask=weekmask, holidays=np.union1d(self.holidays, extra_holidays))
+
+    def is_busday(self, days):
+        """Versi vectorized is_working_day untuk array datetime64[D]"""
+        return np.is_busday(days, busdaycal=self.busdaycal)
+
+    def fingerprint(self):
+        """Representasi stabil isi kalender (untuk invalidasi cache/snapshot)"""
+        return (self.weekmask, tuple(self.holidays.astype(str)))
+
+
+# ============================================================================
+# SHIFT RULES & WORKING TIME INDEX
+# ============================================================================
+WEEKDAYS = ['mon', 'tue', 'wed', 'thu', 'fri', 'sat', 'sun']
+
+_US_PER_MINUTE = 60 * 1_000_000
+
+
+def _time_us(value):
+    """'HH:MM' atau timedelta -> mikrodetik sejak 00:00"""
+    if hasattr(value, 'total_seconds'):
+        return int(round(value.total_seconds() * 1_000_000))
+    hours, minutes = str(value).split(':')
+    return (int(hours) * 60 + int(minutes)) * _US_PER_MINUTE
+
+
+def _weekdays(key):
+    """'mon-fri', 'sat', 'mon,wed,fri' -> list indeks hari (0=Senin)"""
+    days = []
+    for part in key.lower().replace(' ', '').split(','):
+        first, _, last = part.partition('-')
+        start, end = WEEKDAYS.index(first[:3]), WEEKDAYS.index((last or first)[:3])
+        days.extend(range(start, end + 1))
+    return days
+
+
+def _parse_dates(values):
+    """List tanggal 'DD-MM-YYYY' / 'YYYY-MM-DD' -> array datetime64[D]"""
+    days = parse_dates_in_text('\n'.join(str(v) for v in values))
+    return np.unique(np.array(days, dtype='datetime64[D]'))
+
+
+class ShiftRule:
+    """
+    Aturan jam kerja: window per hari (boleh lebih dari satu per hari), istirahat yang
+    dipotong dari semua window, tanggal libur tambahan, serta cabang/segmen yang memakainya.
+    
+    hours: {'mon-fri': ('08:30', '15:30'), 'sat': ('08:30', '12:00')} atau list pasangan per hari.
+    """
+
+    def __init__(self, name, hours, breaks=(), extra_holidays=(), branches=(), segments=()):
+        self.name = name
+        self.branches = frozenset(branches)
+        self.segments = frozenset(segments)
+        self.extra_holidays = _parse_dates(extra_holidays)
+
+        windows = [[] for _ in WEEKDAYS]
+        for key, spans in hours.items():
+            if spans and not isinstance(spans[0], (list, tuple)):
+                spans = [spans]
+            for weekday in _weekdays(key):
+                windows[weekday].extend((_time_us(start), _time_us(end)) for start, end in spans)
+
+        break_spans = [(_time_us(start), _time_us(end)) for start, end in breaks]
+        intervals = [self._subtract(sorted(day), break_spans) for day in windows]
+        for day, day_intervals in zip(WEEKDAYS, intervals):
+            if any(start >= end for start, end in day_intervals):
+                raise ValueError(f"Rule jam kerja '{name}': window {day} tidak valid")
+
+        # Interval per hari dipad ke jumlah yang sama: starts/ends shape (7, K)
+        width = max(1, max(len(day) for day in intervals))
+        self.starts = np.zeros((7, width), dtype=np.int64)
+        self.ends = np.zeros((7, width), dtype=np.int64)
+        for weekday, day_intervals in enumerate(intervals):
+            for k, (start, end) in enumerate(day_intervals):
+                self.starts[weekday, k], self.ends[weekday, k] = start, end
+        self.weekmask = ''.join('1' if day else '0' for day in intervals)
+
+    @staticmethod
+    def _subtract(spans, breaks):
+        """Window dikurangi jam istirahat"""
+        for break_start, break_end in breaks:
+            remaining = []
+            for start, end in spans:
+                if break_end <= start or break_start >= end:
+                    remaining.append((start, end))
+                    continue
+                if start < break_start:
+                    remaining.append((start, break_start))
+                if break_end < end:
+                    remaining.append((break_end, end))
+            spans = remaining
+        return spans
+
+    @classmethod
+    def from_config(cls, spec):
+        """Rule dari dict konfigurasi (keys: name, hours, breaks, extra_holidays, branch, segmen)"""
+        if not spec.get('branch') and not spec.get('segmen'):
+            raise ValueError(f"Rule jam kerja '{spec.get('name')}' harus punya 'branch' atau 'segmen'")
+        return cls(
+            spec.get('name', 'rule'),
+            spec['hours'],
+            breaks=spec.get('breaks', ()),
+            extra_holidays=spec.get('extra_holidays', ()),
+            branches=spec.get('branch', ()),
+            segments=spec.get('segmen', ())
+        )
+
+    def fingerprint(self):
+        return (
+            self.name, self.weekmask, self.starts.tolist(), self.ends.tolist(),
+            tuple(self.extra_holidays.astype(str)), tuple(sorted(self.branches)), tuple(sorted(self.segments))
+        )
+
+
+class WorkingTimeIndex:
+    """
+    Index kumulatif jam kerja per hari untuk satu ShiftRule (exclude hari tanpa window,
+    tanggal merah & libur tambahan rule).
+    
+    cumulative[i] = total mikrodetik kerja dari origin sampai awal hari ke-i, sehingga
+    SLA antara dua timestamp cukup dua lookup dan satu pengurangan.
+    Range diperluas otomatis jika ada timestamp di luar range yang sudah dihitung.
+    """
+
+    def __init__(self, first_day, last_day, calendar, rule):
+        self.rule = rule
+        self.holidays = np.union1d(calendar.holidays, rule.extra_holidays)
+        self.busdaycal = calendar.busdaycalendar(rule.weekmask, rule.extra_holidays)
+        self._lock = threading.Lock()
+        self._build(np.datetime64(first_day, 'D'), np.datetime64(last_day, 'D'))
+
+    def __getstate__(self):
+        # Lock & busdaycalendar tidak bisa di-pickle (index dikirim ke worker process pool SLA)
+        state = self.__dict__.copy()
+        del state['_lock']
+        state['busdaycal'] = (self.busdaycal.weekmask, self.busdaycal.holidays)
+        return state
+
+    def __setstate__(self, state):
+        weekmask, holidays = state.pop('busdaycal')
+        self.__dict__.update(state)
+        self.busdaycal = np.busdaycalendar(weekmask=weekmask, holidays=holidays)
+        self._lock = threading.Lock()
+
+    def _build(self, first_day, last_day):
+        days = np.arange(first_day, last_day + 1, dtype='datetime64[D]')
+        is_workday = np.is_busday(days, busdaycal=self.busdaycal)
+        # 1970-01-01 = Kamis (indeks 3, Senin = 0)
+        weekday = (days.astype(np.int64) + 3) % 7
+        starts = np.where(is_workday[:, None], self.rule.starts[weekday], 0)
+        ends = np.where(is_workday[:, None], self.rule.ends[weekday], 0)
+        cumulative = np.concatenate(([0], np.cumsum((ends - starts).sum(axis=1))))
+        # Diganti sekaligus supaya pembaca di thread lain selalu melihat state yang konsisten
+        self._state = (first_day, last_day, starts, ends, cumulative)
+
+    def _ensure_range(self, days):
+        if len(days) == 0:
+            return self._state
+        state = self._state
+        min_day, max_day = days.min(), days.max()
+        if min_day >= state[0] and max_day <= state[1]:
+            return state
+        with self._lock:
+            first_day, last_day = self._state[:2]
+            # Perluas sampai batas tahun supaya tidak rebuild terus-menerus
+            first_day = min(first_day, min_day.astype('datetime64[Y]').astype('datetime64[D]'))
+            last_day = max(last_day, (max_day.astype('datetime64[Y]') + 1).astype('datetime64[D]') - 1)
+            if (first_day, last_day) != self._state[:2]:
+                self._build(first_day, last_day)
+            return self._state
+
+    def working_us(self, timestamps, state=None):
+        """Akumulasi mikrodetik jam kerja dari origin index sampai setiap timestamp"""
+        days = timestamps.astype('datetime64[D]')
+        first_day, _, starts, ends, cumulative = state or self._ensure_range(days)
+
+        day_pos = (days - first_day).astype(np.int64)
+        time_of_day = (timestamps - days).astype(np.int64)
+        day_starts, day_ends = starts[day_pos], ends[day_pos]
+        elapsed_today = (np.clip(time_of_day[:, None], day_starts, day_ends) - day_starts).sum(axis=1)
+
+        return cumulative[day_pos] + elapsed_today
+
+    def working_us_between(self, start, end):
+        """Mikrodetik jam kerja antara dua array timestamp datetime64[us]"""
+        # Range dipastikan sekali untuk kedua sisi: rebuild di antara dua lookup menggeser origin
+        state = self._ensure_range(np.concatenate((start, end)).astype('datetime64[D]'))
+        return self.working_us(end, state) - self.working_us(start, state)
+
+
+class ShiftCalendar:
+    """
+    Rule default + rule per cabang/segmen, masing-masing dengan WorkingTimeIndex sendiri.
+    Baris dengan rule berbeda dihitung per rule (vectorized), bukan per baris.
+    """
+
+    def __init__(self, default_rule, rules, calendar, first_day, last_day):
+        self.rules = [default_rule, *rules]
+        self.indexes = [WorkingTimeIndex(first_day, last_day, calendar, rule) for rule in self.rules]
+
+    def rule_ids(self, branches=None, segments=None, n_rows=None):
+        """
+        Id rule per baris (0 = default). Rule cabang didahulukan dari rule segmen,
+        dalam satu jenis rule yang lebih awal di konfigurasi menang.
+        """
+        if n_rows is None:
+            n_rows = len(branches) if branches is not None else len(segments)
+        rule_ids = np.zeros(n_rows, dtype=np.int16)
+        for attr, values in (('segments', segments), ('branches', branches)):
+            if values is None:
+                continue
+            values = pd.Series(values).reset_index(drop=True)
+            for rule_id in range(len(self.rules) - 1, 0, -1):
+                keys = getattr(self.rules[rule_id], attr)
+                if keys:
+                    rule_ids[values.isin(keys).to_numpy()] = rule_id
+        return rule_ids
+
+    def working_us_between(self, start, end, rule_ids=None):
+        """Mikrodetik jam kerja per baris sesuai rule baris tersebut"""
+        if rule_ids is None or not rule_ids.any():
+            return self.indexes[0].working_us_between(start, end)
+        total_us = np.empty(len(start), dtype=np.int64)
+        for rule_id in np.unique(rule_ids):
+            rows = rule_ids == rule_id
+            total_us[rows] = self.indexes[rule_id].working_us_between(start[rows], end[rows])
+        return total_us
+
+    def fingerprint(self):
+        return tuple(rule.fingerprint() for rule in self.rules)